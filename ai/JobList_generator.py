@@ -1,9 +1,8 @@
-from openai import OpenAI
-from django.conf import settings
+from ai.llm_gateway import chat_completion, stream_chat_completion
 import json
 
 
-def generate_job_listing(
+def build_job_listing_messages(
     description,
     job_title=None,
     company=None,
@@ -32,22 +31,29 @@ def generate_job_listing(
     - preferred_qualifications: Array of preferred skills and qualifications
     - benefits: Array of benefits and reasons to join
     """
+    return [
+        {
+            "role": "system",
+            "content": "You are a professional HR assistant who creates structured job listings in JSON format.",
+        },
+        {"role": "user", "content": prompt},
+    ]
 
-    client = OpenAI(
-        base_url=settings.OPENAI_ENDPOINT,
-        api_key=settings.OPENAI_TOKEN,
-    )
 
-    completion = client.chat.completions.create(
-        model=settings.OPENAI_MODEL,
+def generate_job_listing(
+    description,
+    job_title=None,
+    company=None,
+    location=None,
+    experience_required=None,
+    salary_range=None,
+):
+    completion = chat_completion(
+        generator="job_listing",
         store=True,
-        messages=[
-            {
-                "role": "system",
-                "content": "You are a professional HR assistant who creates structured job listings in JSON format.",
-            },
-            {"role": "user", "content": prompt},
-        ],
+        messages=build_job_listing_messages(
+            description, job_title, company, location, experience_required, salary_range
+        ),
         temperature=0.7,
         response_format={"type": "json_object"},
     )
@@ -55,3 +61,23 @@ def generate_job_listing(
     response_content = completion.choices[0].message.content
     job_lising = json.loads(response_content)
     return job_lising
+
+
+def stream_job_listing(
+    description,
+    job_title=None,
+    company=None,
+    location=None,
+    experience_required=None,
+    salary_range=None,
+):
+    """Yield the raw JSON text of the job listing as it is generated."""
+    return stream_chat_completion(
+        generator="job_listing",
+        store=True,
+        messages=build_job_listing_messages(
+            description, job_title, company, location, experience_required, salary_range
+        ),
+        temperature=0.7,
+        response_format={"type": "json_object"},
+    )
@@ -1,3 +0,0 @@
-import ai.nltk_setup
-
-ai.nltk_setup.download_nltk_data()
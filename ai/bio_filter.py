@@ -1,5 +1,4 @@
-from django.conf import settings
-from openai import OpenAI
+from ai.llm_gateway import chat_completion
 import re
 
 
@@ -43,13 +42,8 @@ def filter_bio(bio):
     {bio}  
     """
 
-    client = OpenAI(
-        base_url=settings.OPENAI_ENDPOINT,
-        api_key=settings.OPENAI_TOKEN,
-    )
-
-    completion = client.chat.completions.create(
-        model=settings.OPENAI_MODEL,
+    completion = chat_completion(
+        generator="bio_filter",
         store=True,
         messages=[
             {
@@ -2,33 +2,22 @@ import os
 import json
 from io import BytesIO
 import requests
-from openai import OpenAI
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.corpus import stopwords
+from ai.llm_gateway import chat_completion
+from ai.resume_compactor import compact_resume
+from ai.nltk_setup import ensure_nltk_resources
 from django.conf import settings
 from users.models import CandidateProfile
-import PyPDF2
-import docx
-
-
-def parse_pdf_resume(file_stream):
-    """Extract text from a PDF resume."""
-    reader = PyPDF2.PdfReader(file_stream)
-    text = "\n".join(
-        [page.extract_text() for page in reader.pages if page.extract_text()]
-    )
-    return text
-
-
-def parse_docx_resume(file_stream):
-    """Extract text from a DOCX resume."""
-    doc = docx.Document(file_stream)
-    text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-    return text
+from users.resume_parsing import stored_sections
+from core.text_extraction import extract_text, UnsupportedFormat
 
 
 def extract_info_using_nltk(text):
     """Extract structured information from the resume text using NLTK."""
+    # NLTK is imported on first use so it stays out of worker boot time
+    ensure_nltk_resources("punkt", "punkt_tab", "stopwords")
+    from nltk.tokenize import word_tokenize, sent_tokenize
+    from nltk.corpus import stopwords
+
     sentences = sent_tokenize(text)
     words = word_tokenize(text)
     stop_words = set(stopwords.words("english"))
@@ -69,23 +58,38 @@ def parse_resume(resume_url):
         with open(file_path, "rb") as f:
             file_bytes = f.read()
         file_stream = BytesIO(file_bytes)
-        extension_check = file_path
     else:
         # Remote file handling
         if not resume_url.startswith("http"):
             resume_url = settings.BASE_URL.rstrip("/") + resume_url
         response = requests.get(resume_url)
         file_stream = BytesIO(response.content)
-        extension_check = resume_url
 
-    if extension_check.endswith(".pdf"):
-        text = parse_pdf_resume(file_stream)
-    elif extension_check.endswith(".docx"):
-        text = parse_docx_resume(file_stream)
-    else:
+    # The format is detected from the file content, not the URL
+    try:
+        text = extract_text(file_stream)
+    except UnsupportedFormat:
         raise ValueError("Unsupported file format")
 
-    return extract_info_using_nltk(text)
+    return extract_resume_details(text)
+
+
+def extract_resume_details(text, sections=None):
+    """
+    Compact resume text and pull out education, experience and skills.
+    `sections` are the ones stored when the resume was uploaded, if any.
+    """
+    compacted = compact_resume(text, source="candidate_bio", sections=sections)
+    data = extract_info_using_nltk(compacted["text"])
+
+    # Detected resume sections beat keyword-matched sentences
+    sections = compacted["sections"]
+    for field in ("education", "experience"):
+        if sections.get(field):
+            data[field] = sections[field]
+    if sections.get("skills"):
+        data["skills"] = sections["skills"]
+    return data
 
 
 def generate_candidate_bio(candidate):
@@ -110,10 +114,8 @@ def generate_candidate_bio(candidate):
 
     # Get the latest resume
     resume = None
-    if candidate_profile.resumes:
-        latest_resume = max(
-            candidate_profile.resumes.values(), key=lambda x: x["created_at"]
-        )
+    latest_resume = candidate_profile.latest_resume()
+    if latest_resume:
         resume = latest_resume.get("resume")
 
     # Check if we have either skills or a resume
@@ -124,7 +126,13 @@ def generate_candidate_bio(candidate):
 
     # Only parse resume if it exists
     if resume:
-        parsed = parse_resume(resume)
+        # Text is extracted once at upload; the file is only downloaded
+        # again if it couldn't be fetched for an older entry
+        entry = candidate_profile.parsed_resume(resume)
+        if entry:
+            parsed = extract_resume_details(entry["text"], stored_sections(entry))
+        else:
+            parsed = parse_resume(resume)
         # Resume exists, so prioritize data from it
         resume_education = parsed.get("education", "Not provided")
         resume_experience = parsed.get("experience", "Not provided")
@@ -179,13 +187,8 @@ def generate_candidate_bio(candidate):
     "I am a dedicated and results-oriented [Job Title] with [X] years of experience in [Industry]. Skilled in [Key Skills], I have successfully contributed to [mention impact, projects, or achievements]. I am passionate about [mention career focus] and thrive in [work environment, e.g., collaborative teams, fast-paced settings]. I am seeking opportunities to leverage my expertise in [mention job role or industry] and make a meaningful impact in [specific field]."
     """
 
-    client = OpenAI(
-        base_url=settings.OPENAI_ENDPOINT,
-        api_key=settings.OPENAI_TOKEN,
-    )
-
-    completion = client.chat.completions.create(
-        model=settings.OPENAI_MODEL,
+    completion = chat_completion(
+        generator="candidate_bio",
         store=True,
         messages=[
             {
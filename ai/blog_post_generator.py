@@ -1,8 +1,7 @@
-from openai import OpenAI
-from django.conf import settings
+from ai.llm_gateway import chat_completion, stream_chat_completion
 
 
-def generate_blog_post(
+def build_blog_messages(
     blog_title,
     blog_description,
     focus_keywords,
@@ -57,20 +56,45 @@ def generate_blog_post(
     - **Authoritative but easy to understand**
     - **Optimized for search engines and user engagement**
     """
-    client = OpenAI(
-        base_url=settings.OPENAI_ENDPOINT,
-        api_key=settings.OPENAI_TOKEN,
-    )
-    completion = client.chat.completions.create(
-        model=settings.OPENAI_MODEL,
+    return [
+        {
+            "role": "system",
+            "content": "You are a professional content writer who creates SEO-optimized blog posts.",
+        },
+        {"role": "user", "content": prompt},
+    ]
+
+
+def generate_blog_post(
+    blog_title,
+    blog_description,
+    focus_keywords,
+    blog_length="600 words",
+):
+    completion = chat_completion(
+        generator="blog_post",
+        cache=False,
         store=True,
-        messages=[
-            {
-                "role": "system",
-                "content": "You are a professional content writer who creates SEO-optimized blog posts.",
-            },
-            {"role": "user", "content": prompt},
-        ],
+        messages=build_blog_messages(
+            blog_title, blog_description, focus_keywords, blog_length
+        ),
         temperature=0.7,
     )
     return completion.choices[0].message.content
+
+
+def stream_blog_post(
+    blog_title,
+    blog_description,
+    focus_keywords,
+    blog_length="600 words",
+):
+    """Yield the blog post markdown as it is generated."""
+    return stream_chat_completion(
+        generator="blog_post",
+        store=True,
+        messages=build_blog_messages(
+            blog_title, blog_description, focus_keywords, blog_length
+        ),
+        temperature=0.7,
+    )
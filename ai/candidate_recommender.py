@@ -1,15 +1,20 @@
-from openai import OpenAI
+from ai.llm_gateway import chat_completion
 from django.conf import settings
 from core.utils import extract_text_from_pdf, download_pdf_from_url
+from ai.resume_compactor import compact_resume, count_tokens
+from concurrent.futures import ThreadPoolExecutor
 import json
+import time
 
 
 def parse_applications(applications):
     parsed_applications = []
     for app in applications:
         try:
-            # First check if we already have extracted resume text
+            # First check if we already have extracted resume text, and the
+            # sections split from it at upload
             resume_content = app.get("extracted_resume")
+            sections = app.get("resume_sections") if resume_content else None
 
             # If no extracted text is available, try to extract it (fallback method)
             if not resume_content:
@@ -22,6 +27,12 @@ def parse_applications(applications):
                 else:
                     resume_content = "No resume text available"
 
+            # Strip extraction noise and trim to the per-resume token budget
+            compacted = compact_resume(
+                resume_content, source="candidate_recommender", sections=sections or None
+            )
+            resume_content = compacted["text"]
+
             # Format the application data
             app_text = f"""
             Application ID: {app.get('id')}
@@ -42,6 +53,7 @@ def parse_applications(applications):
                         "candidate_name", app.get("candidate_username", "Unknown")
                     ),
                     "resume_text": resume_content,
+                    "resume_tokens_saved": compacted["tokens_saved"],
                 }
             )
         except Exception as e:
@@ -60,33 +72,38 @@ def parse_applications(applications):
     return parsed_applications
 
 
-def recommend_best_candidate(
-    applications,
-    job_description,
-    preferred_qualifications="",
-    required_qualifications="",
-    responsibilities="",
-    limit=5,
-    minimum_score=70,
-):
-    # Parse applications into a format suitable for AI analysis
-    parsed_applications = parse_applications(applications)
-
-    # Parse applications into a format suitable for AI analysis
-    parsed_applications = parse_applications(applications)
-
-    # Add candidate username and status from original applications
+def chunk_applications(parsed_applications, token_budget):
+    """
+    Split parsed applications into batches whose serialized size stays
+    within `token_budget`. An application larger than the budget gets a
+    batch of its own.
+    """
+    batches = []
+    current = []
+    current_tokens = 0
     for parsed_app in parsed_applications:
-        # Find matching original application
-        for app in applications:
-            if str(app.get("id")) == str(parsed_app["application_id"]):
-                parsed_app["candidate_username"] = app.get(
-                    "candidate_username", "Unknown"
-                )
-                parsed_app["application_status"] = app.get("status", "Unknown")
-                break
+        app_tokens = count_tokens(json.dumps(parsed_app, indent=2))
+        if current and current_tokens + app_tokens > token_budget:
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(parsed_app)
+        current_tokens += app_tokens
+    if current:
+        batches.append(current)
+    return batches
 
-    prompt = f"""
+
+def build_recommendation_prompt(
+    parsed_applications,
+    job_description,
+    preferred_qualifications,
+    required_qualifications,
+    responsibilities,
+    limit,
+    minimum_score,
+):
+    return f"""
     You are a professional HR assistant specializing in candidate evaluation.
     
     Job Description:
@@ -143,14 +160,16 @@ def recommend_best_candidate(
     6. Consider both technical skills and soft skills in your evaluation
     """
 
-    client = OpenAI(
-        base_url=settings.OPENAI_ENDPOINT,
-        api_key=settings.OPENAI_TOKEN,
-    )
 
+def score_batch(batch, job_context, limit, minimum_score):
+    """Score one batch of applications. Returns (response, elapsed_ms, error)."""
+    started = time.perf_counter()
+    prompt = build_recommendation_prompt(
+        batch, limit=limit, minimum_score=minimum_score, **job_context
+    )
     try:
-        completion = client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
+        completion = chat_completion(
+            generator="candidate_recommender",
             response_format={"type": "json_object"},
             messages=[
                 {
@@ -161,19 +180,162 @@ def recommend_best_candidate(
             ],
             temperature=0.3,
         )
+        response = json.loads(completion.choices[0].message.content)
+        error = None
+    except Exception as e:
+        response = {}
+        error = str(e)
+    elapsed_ms = round((time.perf_counter() - started) * 1000)
+    return response, elapsed_ms, error
 
-        # Parse the response to ensure it's valid JSON
-        response_content = completion.choices[0].message.content
-        recommendations = json.loads(response_content)
-        return recommendations
 
-    except Exception as e:
+def merge_recommendations(batch_results, limit, minimum_score):
+    """Merge per-batch rankings into a single global top-k."""
+    merged = {}
+    for response in batch_results:
+        for recommendation in response.get("recommendations", []):
+            try:
+                score = float(recommendation.get("match_score", 0))
+            except (TypeError, ValueError):
+                continue
+            if score < minimum_score:
+                continue
+            key = str(recommendation.get("application_id"))
+            if key not in merged or score > float(merged[key]["match_score"]):
+                recommendation["match_score"] = score
+                merged[key] = recommendation
+
+    ranked = sorted(merged.values(), key=lambda r: r["match_score"], reverse=True)
+    ranked = ranked[:limit]
+    for rank, recommendation in enumerate(ranked, start=1):
+        recommendation["rank"] = rank
+    return ranked
+
+
+def recommend_best_candidate(
+    applications,
+    job_description,
+    preferred_qualifications="",
+    required_qualifications="",
+    responsibilities="",
+    limit=5,
+    minimum_score=70,
+    batched=None,
+):
+    """
+    Rank applications against a job with the LLM.
+
+    Applications are split into token-budgeted batches that are scored
+    concurrently (map), then merged into a global top `limit` of candidates
+    scoring at least `minimum_score` (reduce). With `batched=None` batching
+    only kicks in when the applications don't fit a single batch;
+    `batched=False` forces the old single-prompt behaviour.
+    """
+    started = time.perf_counter()
+
+    # Parse applications into a format suitable for AI analysis
+    parsed_applications = parse_applications(applications)
+    tokens_saved = sum(
+        parsed_app.pop("resume_tokens_saved", 0) for parsed_app in parsed_applications
+    )
+
+    # Add candidate username and status from original applications
+    for parsed_app in parsed_applications:
+        # Find matching original application
+        for app in applications:
+            if str(app.get("id")) == str(parsed_app["application_id"]):
+                parsed_app["candidate_username"] = app.get(
+                    "candidate_username", "Unknown"
+                )
+                parsed_app["application_status"] = app.get("status", "Unknown")
+                break
+
+    if batched is False:
+        batches = [parsed_applications]
+    else:
+        batches = chunk_applications(
+            parsed_applications, settings.RECOMMENDER_BATCH_TOKEN_BUDGET
+        )
+
+    job_context = {
+        "job_description": job_description,
+        "preferred_qualifications": preferred_qualifications,
+        "required_qualifications": required_qualifications,
+        "responsibilities": responsibilities,
+    }
+
+    max_workers = max(1, min(len(batches), settings.RECOMMENDER_MAX_PARALLEL_BATCHES))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(
+            executor.map(
+                lambda batch: score_batch(batch, job_context, limit, minimum_score),
+                batches,
+            )
+        )
+
+    batch_timings = []
+    errors = []
+    responses = []
+    for index, ((response, elapsed_ms, error), batch) in enumerate(
+        zip(results, batches)
+    ):
+        batch_timings.append(
+            {
+                "batch": index + 1,
+                "candidates": len(batch),
+                "processing_time_ms": elapsed_ms,
+            }
+        )
+        if error:
+            errors.append(error)
+        else:
+            responses.append(response)
+
+    if not responses:
         # Handle API errors gracefully
+        error = errors[0] if errors else "No applications to evaluate"
         return {
-            "error": str(e),
+            "error": error,
             "recommendations": [],
             "metadata": {
                 "total_candidates_evaluated": len(applications),
-                "error_details": str(e),
+                "error_details": error,
             },
         }
+
+    summary = next(
+        (
+            r.get("metadata", {}).get("job_description_summary")
+            for r in responses
+            if r.get("metadata", {}).get("job_description_summary")
+        ),
+        "",
+    )
+
+    metadata = {
+        "total_candidates_evaluated": len(applications),
+        "job_description_summary": summary,
+        "processing_time_ms": round((time.perf_counter() - started) * 1000),
+        "batches": batch_timings,
+        "resume_tokens_saved": tokens_saved,
+    }
+    if errors:
+        metadata["error_details"] = errors
+
+    recommendations = merge_recommendations(responses, limit, minimum_score)
+
+    # Surface the local pre-ranking score alongside the model's score
+    lexical_scores = {
+        str(app.get("id")): app["lexical_score"]
+        for app in applications
+        if "lexical_score" in app
+    }
+    for recommendation in recommendations:
+        lexical_score = lexical_scores.get(str(recommendation.get("application_id")))
+        if lexical_score is not None:
+            recommendation["lexical_score"] = lexical_score
+
+    return {
+        "recommendations": recommendations,
+        "metadata": metadata,
+    }
@@ -4,32 +4,69 @@ from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 from docx.enum.style import WD_STYLE_TYPE
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
+import hashlib
+import json
 import os
 import re
 import io
+import weakref
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
-from openai import OpenAI
+from ai.llm_gateway import chat_completion
+from ai.models import ContractTemplate
 from django.conf import settings
 from datetime import datetime
-from core.b2_storage import BackblazeB2Storage
-from django.core.files import File
+from core.b2_storage import get_b2_storage
+from django.core.files.base import ContentFile
+
+
+# Per-employee details left as {{PLACEHOLDERS}} in contract templates, with
+# the contract data key that fills each one and a default when it is missing.
+TEMPLATE_PLACEHOLDERS = {
+    "EMPLOYEE_NAME": ("employee_name", None),
+    "EMPLOYEE_ADDRESS": ("employee_address", "Address to be provided"),
+    "START_DATE": ("start_date", None),
+    "END_DATE": ("end_date", "Not specified - employment at will"),
+}
+
+# Contract data the template body depends on; a change to any of these
+# produces a new template version.
+TEMPLATE_FIELDS = [
+    "employer_name",
+    "employer_address",
+    "company_name",
+    "job_title",
+    "salary",
+    "responsibilities",
+    "benefits",
+    "terms",
+]
+
+PLACEHOLDER_RE = re.compile(r"\{\{\s*([A-Z_]+)\s*\}\}")
+
+
+def contract_template_version(data):
+    """Hash the job and employer fields a contract template depends on."""
+    payload = json.dumps(
+        [data.get(field) for field in TEMPLATE_FIELDS], sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
-def generate_contract(data):
+def generate_contract_template(data):
     """
-    Generate a professional employment contract using AI in markdown format,
-    then convert it to a formatted Word document with pre-filled employer signature
-    and save it to B2 storage.
+    Ask the model for a contract body in markdown with the employee's name,
+    address and dates left as placeholders.
 
     Args:
-        data (dict): Dictionary containing all contract details
+        data (dict): Contract details; employee fields are not sent
 
     Returns:
-        str: URL to the generated contract in B2 storage
+        str: Markdown contract template
     """
     # Create a prompt that explicitly requests markdown formatting
     prompt = f"""
-    Generate a professional employment contract in markdown format with the following details:
+    Generate a professional employment contract template in markdown format with the following details:
 
     EMPLOYER INFORMATION:
     - Employer: {data['employer_name']}
@@ -37,18 +74,18 @@ def generate_contract(data):
     - Company name: {data['company_name']}
 
     EMPLOYEE INFORMATION:
-    - Employee: {data['employee_name']}
-    - Employee address: {data['employee_address']}
+    - Employee: {{{{EMPLOYEE_NAME}}}}
+    - Employee address: {{{{EMPLOYEE_ADDRESS}}}}
 
     EMPLOYMENT DETAILS:
     - Job Title: {data['job_title']}
-    - Start Date: {data['start_date']}
-    - End Date: {data.get('end_date', 'Not specified - employment at will')}
+    - Start Date: {{{{START_DATE}}}}
+    - End Date: {{{{END_DATE}}}}
     - Salary: {data['salary']}
     
     JOB DETAILS:
     - Responsibilities: {data['responsibilities']}
-    - Benefits: {data.get('benefits', 'Standard benefits package as per company policy')}
+    - Benefits: {data.get('benefits') or 'Standard benefits package as per company policy'}
     
     ADDITIONAL TERMS:
     {data['terms']}
@@ -72,40 +109,117 @@ def generate_contract(data):
     - --- for horizontal dividers between sections
     - Proper numbered lists for sections like 1.1, 1.2, etc.
     - don't add a signature section i will add it manually
+
+    The same template is reused for every employee hired for this job:
+    - write {{{{EMPLOYEE_NAME}}}}, {{{{EMPLOYEE_ADDRESS}}}}, {{{{START_DATE}}}} and {{{{END_DATE}}}} exactly as shown wherever those details appear
+    - don't invent any other employee details
     """
 
-    try:
-        client = OpenAI(
-            base_url=settings.OPENAI_ENDPOINT,
-            api_key=settings.OPENAI_TOKEN,
-        )
+    completion = chat_completion(
+        generator="contract",
+        messages=[
+            {
+                "role": "system",
+                "content": "You are a legal expert specialized in employment contracts. Generate a complete employment contract template in markdown format with proper structure and formatting.",
+            },
+            {"role": "user", "content": prompt},
+        ],
+        temperature=0.3,
+    )
+
+    # Get the markdown content
+    markdown_content = completion.choices[0].message.content.strip()
+
+    # Remove code block markers if present
+    if markdown_content.startswith("```markdown"):
+        markdown_content = "\n".join(markdown_content.split("\n")[1:])
+    if markdown_content.startswith("```"):
+        markdown_content = "\n".join(markdown_content.split("\n")[1:])
+    if markdown_content.endswith("```"):
+        markdown_content = "\n".join(markdown_content.split("\n")[:-1])
+
+    return markdown_content
 
-        completion = client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a legal expert specialized in employment contracts. Generate a complete employment contract in markdown format with proper structure and formatting.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.3,
-        )
 
-        # Get the markdown content
-        markdown_content = completion.choices[0].message.content.strip()
+def missing_placeholders(template):
+    """Employee placeholders that a contract template never uses."""
+    return sorted(set(TEMPLATE_PLACEHOLDERS) - set(PLACEHOLDER_RE.findall(template)))
 
-        # Remove code block markers if present
-        if markdown_content.startswith("```markdown"):
-            markdown_content = "\n".join(markdown_content.split("\n")[1:])
-        if markdown_content.startswith("```"):
-            markdown_content = "\n".join(markdown_content.split("\n")[1:])
-        if markdown_content.endswith("```"):
-            markdown_content = "\n".join(markdown_content.split("\n")[:-1])
 
-        # Ensure the contracts directory exists
-        contracts_dir = os.path.join(settings.MEDIA_ROOT, "contracts")
-        os.makedirs(contracts_dir, exist_ok=True)
+def generate_checked_contract_template(data):
+    """
+    Generate a contract template that contains every employee placeholder,
+    asking the model once more if the first template leaves any out.
+
+    Raises:
+        ValueError: If neither template contains all the placeholders
+    """
+    for _ in range(2):
+        markdown_content = generate_contract_template(data)
+        missing = missing_placeholders(markdown_content)
+        if not missing:
+            return markdown_content
+    raise ValueError(
+        f"Generated contract template is missing placeholders: {', '.join(missing)}"
+    )
+
+
+def get_contract_template(data, job=None):
+    """
+    Return the contract template for the job's current version, generating
+    and storing it on first use. Without a job the template is generated
+    for this contract only. A template missing employee placeholders is
+    never stored.
+    """
+    if job is None:
+        return generate_checked_contract_template(data)
+
+    version = contract_template_version(data)
+    template = ContractTemplate.objects.filter(job=job, version=version).first()
+    if template is not None:
+        return template.markdown
+
+    markdown_content = generate_checked_contract_template(data)
+    # Concurrent hires for a new version may both generate; keep the first
+    template, _ = ContractTemplate.objects.get_or_create(
+        job=job, version=version, defaults={"markdown": markdown_content}
+    )
+    return template.markdown
+
+
+def render_contract_template(template, data):
+    """Fill the employee placeholders in a contract template."""
+
+    def replace(match):
+        name = match.group(1)
+        if name not in TEMPLATE_PLACEHOLDERS:
+            return match.group(0)
+        key, default = TEMPLATE_PLACEHOLDERS[name]
+        return str(data.get(key) or default or "")
+
+    return PLACEHOLDER_RE.sub(replace, template)
+
+
+def generate_contract(data, on_progress=None, job=None):
+    """
+    Generate a professional employment contract in markdown format, then
+    convert it to a formatted Word document with pre-filled employer
+    signature and save it to B2 storage.
+
+    The contract body comes from a template generated once per job and
+    terms version; only the employee's details are filled in per contract.
+
+    Args:
+        data (dict): Dictionary containing all contract details
+        on_progress (callable): Optional callback receiving (stage, percent)
+        job (JobListing): Job the template is stored against
+
+    Returns:
+        str: URL to the generated contract in B2 storage
+    """
+    try:
+        template = get_contract_template(data, job)
+        markdown_content = render_contract_template(template, data)
 
         # Create a unique filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -113,23 +227,29 @@ def generate_contract(data):
             c if c.isalnum() else "_" for c in data["employee_name"]
         )
 
+        if on_progress:
+            on_progress("rendering", 50)
+
         # Create the Word document from markdown with pre-filled employer signature
         document = markdown_to_docx(markdown_content, data)
 
         contract_filename = f"{safe_employee_name}_{timestamp}_contract.docx"
-        contract_path = os.path.join(contracts_dir, contract_filename)
 
-        # Save locally first
-        document.save(contract_path)
+        # Serialise in memory; nothing is written to the web node's disk
+        buffer = io.BytesIO()
+        document.save(buffer)
+        contract_bytes = buffer.getvalue()
 
-        # Now save to B2 storage
-        storage = BackblazeB2Storage(location="contracts")
-        b2_path = f"contracts/{contract_filename}"
+        if settings.CONTRACT_LOCAL_COPY:
+            save_local_copy(contract_filename, contract_bytes)
+
+        if on_progress:
+            on_progress("uploading", 65)
 
-        # Upload to B2 using Django File
-        with open(contract_path, "rb") as file:
-            django_file = File(file)
-            saved_path = storage._save(b2_path, django_file)
+        # Upload the bytes straight to B2 storage
+        storage = get_b2_storage()
+        b2_path = f"contracts/{contract_filename}"
+        saved_path = storage._save(b2_path, ContentFile(contract_bytes))
 
         # Get the B2 URL
         b2_url = storage.url(saved_path)
@@ -141,6 +261,14 @@ def generate_contract(data):
         raise
 
 
+def save_local_copy(contract_filename, contract_bytes):
+    """Keep a copy of the contract under MEDIA_ROOT/contracts (DEBUG only)."""
+    contracts_dir = os.path.join(settings.MEDIA_ROOT, "contracts")
+    os.makedirs(contracts_dir, exist_ok=True)
+    with open(os.path.join(contracts_dir, contract_filename), "wb") as f:
+        f.write(contract_bytes)
+
+
 def markdown_to_docx(markdown_text, data):
     """
     Convert markdown text to a formatted Word document
@@ -152,18 +280,11 @@ def markdown_to_docx(markdown_text, data):
     Returns:
         Document: A python-docx Document object
     """
-    # Create document with basic styles
-    document = Document()
-    setup_document_styles(document)
-
-    # Set margins
-    for section in document.sections:
-        section.top_margin = Inches(1)
-        section.bottom_margin = Inches(1)
-        section.left_margin = Inches(1.2)
-        section.right_margin = Inches(1.2)
+    # Clone the prebuilt skeleton (styles, margins, page-number footer)
+    document = Document(io.BytesIO(build_document_skeleton()))
 
     # Add header with the current date
+    section = document.sections[-1]
     header = section.header
     header_para = header.paragraphs[0] if header.paragraphs else header.add_paragraph()
     header_para.alignment = WD_PARAGRAPH_ALIGNMENT.RIGHT
@@ -171,12 +292,6 @@ def markdown_to_docx(markdown_text, data):
         9
     )
 
-    # Add footer with page numbers (fixed implementation)
-    footer = section.footer
-    footer_para = footer.paragraphs[0] if footer.paragraphs else footer.add_paragraph()
-    footer_para.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    add_page_number(footer_para)
-
     # Split the markdown content into lines
     lines = markdown_text.split("\n")
     i = 0
@@ -194,18 +309,18 @@ def markdown_to_docx(markdown_text, data):
         if line.startswith("# "):
             # Main title (h1)
             text = line[2:].strip()
-            heading = document.add_heading(text, 0)
+            heading = add_heading(document, text, 0)
             heading.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
             i += 1
         elif line.startswith("## "):
             # Article heading (h2)
             text = line[3:].strip()
-            heading = document.add_heading(text, 1)
+            heading = add_heading(document, text, 1)
             i += 1
         elif line.startswith("### "):
             # Sub-section heading (h3)
             text = line[4:].strip()
-            heading = document.add_heading(text, 2)
+            heading = add_heading(document, text, 2)
             i += 1
         elif line.startswith("---"):
             # Horizontal line
@@ -215,7 +330,7 @@ def markdown_to_docx(markdown_text, data):
             i += 1
         elif re.match(r"^\d+\.\d+", line):
             # Section number (like 1.1)
-            p = document.add_paragraph(style="ListNumber")
+            p = add_styled_paragraph(document, "ListNumber")
             process_markdown_text(p, line)
             i += 1
         else:
@@ -240,6 +355,63 @@ def markdown_to_docx(markdown_text, data):
     return document
 
 
+@lru_cache(maxsize=1)
+def build_document_skeleton():
+    """
+    Build the parts of a contract document that never change (styles,
+    margins and the page-number footer) once per process and return it as
+    .docx bytes. Each contract opens a copy of these bytes.
+    """
+    document = Document()
+    setup_document_styles(document)
+
+    # Set margins
+    for section in document.sections:
+        section.top_margin = Inches(1)
+        section.bottom_margin = Inches(1)
+        section.left_margin = Inches(1.2)
+        section.right_margin = Inches(1.2)
+
+    # Add footer with page numbers (fixed implementation)
+    footer = section.footer
+    footer_para = footer.paragraphs[0] if footer.paragraphs else footer.add_paragraph()
+    footer_para.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+    add_page_number(footer_para)
+
+    skeleton = io.BytesIO()
+    document.save(skeleton)
+    return skeleton.getvalue()
+
+
+# Style objects by name, per document part being rendered (Document itself
+# isn't hashable)
+_document_styles = weakref.WeakKeyDictionary()
+
+
+def add_styled_paragraph(document, style_name, text=""):
+    """
+    Add a paragraph with a named style.
+
+    python-docx resolves style names by scanning every style in the document
+    on each call, which dominated contract rendering. Style objects are
+    looked up once per document and assigned to the paragraph instead.
+    """
+    styles = _document_styles.setdefault(document.part, {})
+    if style_name not in styles:
+        styles[style_name] = document.styles[style_name]
+
+    paragraph = document.add_paragraph(text)
+    paragraph.style = styles[style_name]
+    return paragraph
+
+
+def add_heading(document, text, level):
+    """Same as Document.add_heading, using add_styled_paragraph."""
+    return add_styled_paragraph(
+        document, "Title" if level == 0 else f"Heading {level}", text
+    )
+
+
 def process_markdown_text(paragraph, text):
     """Process markdown text with bold formatting"""
     # Handle bold text: **text**
@@ -304,7 +476,7 @@ def add_signature_section(document, data):
     p.paragraph_format.space_after = Pt(12)
 
     # Add signature heading - left aligned instead of centered
-    heading = document.add_heading("SIGNATURES", 1)
+    heading = add_heading(document, "SIGNATURES", 1)
     heading.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
 
     # Generate employer signature image with transparent background
@@ -314,7 +486,7 @@ def add_signature_section(document, data):
     current_date = datetime.now().strftime("%B %d, %Y")
 
     # Employer section - as heading 4
-    employer_heading = document.add_heading("Employer:", 4)
+    employer_heading = add_heading(document, "Employer:", 4)
 
     # Employer details
     p = document.add_paragraph()
@@ -337,7 +509,7 @@ def add_signature_section(document, data):
     document.add_paragraph()
 
     # Employee section - as heading 4
-    employee_heading = document.add_heading("Employee:", 4)
+    employee_heading = add_heading(document, "Employee:", 4)
 
     # Employee details
     p = document.add_paragraph()
@@ -358,6 +530,59 @@ def generate_signature_image(name, enhanced=False):
     Returns:
         BytesIO: Image file-like object containing the signature
     """
+    # Rendered PNGs are cached; each caller gets its own stream
+    return io.BytesIO(render_signature_png(name, enhanced))
+
+
+@lru_cache(maxsize=None)
+def get_signature_font(font_size=50):
+    """
+    Find a script-like font once per process. Returns None when no font
+    can be loaded, in which case Pillow's default is used.
+    """
+    # List of possible script/cursive fonts that might be available on the system
+    possible_fonts = [
+        os.path.join(settings.BASE_DIR, "ai/fonts/signature.ttf"),
+        "Segoe Script",
+        "Lucida Handwriting",
+        "Brush Script MT",
+        "Comic Sans MS",
+        "Ink Free",
+        "Mistral",
+        "Bradley Hand ITC",
+        "Freestyle Script",
+    ]
+
+    # Try each font until one works
+    for font_name in possible_fonts:
+        try:
+            return ImageFont.truetype(font_name, font_size)
+        except Exception:
+            continue
+
+    # Try default system font
+    default_font_paths = [
+        "/usr/share/fonts/truetype/dejavu/DejaVuSerif.ttf",  # Linux
+        "/System/Library/Fonts/Times.ttc",  # macOS
+        "C:/Windows/Fonts/times.ttf",  # Windows
+        "arial.ttf",  # Generic
+    ]
+    for font_path in default_font_paths:
+        try:
+            if os.path.exists(font_path):
+                return ImageFont.truetype(font_path, font_size)
+        except Exception:
+            continue
+
+    try:
+        return ImageFont.load_default()
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=256)
+def render_signature_png(name, enhanced=False):
+    """Render the signature for a name as PNG bytes (cached per name)."""
     # Create an image with transparent background (RGBA mode)
     width, height = 500, 150
     image = Image.new("RGBA", (width, height), (255, 255, 255, 0))  # Fully transparent
@@ -365,53 +590,7 @@ def generate_signature_image(name, enhanced=False):
 
     # Create a signature style text
     try:
-        # Try various fallback fonts
-        font = None
-        font_size = 50
-
-        # List of possible script/cursive fonts that might be available on the system
-        possible_fonts = [
-            os.path.join(settings.BASE_DIR, "ai/fonts/signature.ttf"),
-            "Segoe Script",
-            "Lucida Handwriting",
-            "Brush Script MT",
-            "Comic Sans MS",
-            "Ink Free",
-            "Mistral",
-            "Bradley Hand ITC",
-            "Freestyle Script",
-        ]
-
-        # Try each font until one works
-        for font_name in possible_fonts:
-            try:
-                if font_name.endswith(".ttf") and os.path.exists(font_name):
-                    font = ImageFont.truetype(font_name, font_size)
-                    break
-                else:
-                    font = ImageFont.truetype(font_name, font_size)
-                    break
-            except Exception:
-                continue
-
-        # If no font worked, fallback to default
-        if font is None:
-            # Try default system font
-            try:
-                default_font_paths = [
-                    "/usr/share/fonts/truetype/dejavu/DejaVuSerif.ttf",  # Linux
-                    "/System/Library/Fonts/Times.ttc",  # macOS
-                    "C:/Windows/Fonts/times.ttf",  # Windows
-                    "arial.ttf",  # Generic
-                ]
-
-                for font_path in default_font_paths:
-                    if os.path.exists(font_path):
-                        font = ImageFont.truetype(font_path, font_size)
-                        break
-            except Exception:
-                font = ImageFont.load_default()
-                font_size = 30  # Default font is smaller
+        font = get_signature_font()
 
         # Draw a signature-like appearance
         # Use darker colors for better visibility (with full opacity)
@@ -451,12 +630,10 @@ def generate_signature_image(name, enhanced=False):
         draw.text((50, 50), f"{name}", fill=(0, 0, 0, 255))
         draw.line([(50, 85), (350, 85)], fill=(0, 0, 0, 255), width=2)
 
-    # Save the signature to a BytesIO object with transparency (PNG supports transparency)
+    # Save the signature as PNG bytes (PNG supports transparency)
     signature_io = io.BytesIO()
     image.save(signature_io, format="PNG")
-    signature_io.seek(0)
-
-    return signature_io
+    return signature_io.getvalue()
 
 
 def add_page_number(paragraph):
@@ -0,0 +1,258 @@
+import fcntl
+import hashlib
+import os
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+import numpy as np
+from django.conf import settings
+
+from ai.lexical_ranker import tokenize
+
+
+def _as_text(value):
+    if isinstance(value, (list, tuple)):
+        return "\n".join(str(item) for item in value)
+    return str(value or "")
+
+
+def _features(text):
+    """Word unigrams and bigrams, so short phrases like "machine learning" count."""
+    tokens = tokenize(text)
+    features = Counter(tokens)
+    features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return features
+
+
+def embed_text(text, dim=None):
+    """
+    Embed text into a dense float32 vector without any model or network call.
+
+    Features are hashed into `dim` buckets with a hash-derived sign (a sparse
+    random projection of the bag of words), weighted with sublinear term
+    frequency and L2-normalised, so a dot product is the cosine similarity.
+    """
+    dim = dim or settings.EMBEDDING_DIM
+    vector = np.zeros(dim, dtype=np.float32)
+    for feature, count in _features(text).items():
+        digest = int.from_bytes(
+            hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little"
+        )
+        sign = 1.0 if digest & 1 else -1.0
+        vector[(digest >> 1) % dim] += sign * (1.0 + np.log(count))
+
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+    return vector
+
+
+def job_text(job):
+    return "\n".join(
+        [
+            job.title or "",
+            job.company or "",
+            job.location or "",
+            _as_text(job.description),
+            _as_text(job.responsibilities),
+            _as_text(job.required_qualifications),
+            _as_text(job.preferred_qualifications),
+        ]
+    )
+
+
+class EmbeddingIndex:
+    """
+    A flat vector index backed by two memory-mapped .npy files: a float32
+    (capacity x dim) vector matrix and an int64 id column where -1 marks a
+    free row.
+
+    Updates are written in place through the memory map, so other processes
+    see them immediately. When the index runs out of free rows it is copied
+    into a file twice the size and swapped in with an atomic rename; readers
+    notice the new inode and remap.
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, name, directory=None, dim=None):
+        self.name = name
+        self.directory = str(directory or settings.EMBEDDING_INDEX_DIR)
+        self.dim = dim or settings.EMBEDDING_DIM
+        self.vectors_path = os.path.join(self.directory, f"{name}.vectors.npy")
+        self.ids_path = os.path.join(self.directory, f"{name}.ids.npy")
+        self._lock = threading.Lock()
+        self._vectors = None
+        self._ids = None
+        self._inode = None
+
+    @contextmanager
+    def _file_lock(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, f"{self.name}.lock"), "w") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _create(self, capacity):
+        vectors = np.lib.format.open_memmap(
+            self.vectors_path + ".tmp",
+            mode="w+",
+            dtype=np.float32,
+            shape=(capacity, self.dim),
+        )
+        ids = np.lib.format.open_memmap(
+            self.ids_path + ".tmp", mode="w+", dtype=np.int64, shape=(capacity,)
+        )
+        ids[:] = -1
+        return vectors, ids
+
+    def _swap_in(self, vectors, ids):
+        vectors.flush()
+        ids.flush()
+        # The id file is the one readers check, so it is renamed last.
+        os.replace(self.vectors_path + ".tmp", self.vectors_path)
+        os.replace(self.ids_path + ".tmp", self.ids_path)
+
+    def _open(self):
+        """(Re)map the index files if they are missing or have been replaced."""
+        try:
+            inode = os.stat(self.ids_path).st_ino
+        except FileNotFoundError:
+            self._vectors = self._ids = self._inode = None
+            return False
+        if inode != self._inode:
+            self._ids = np.load(self.ids_path, mmap_mode="r+")
+            self._vectors = np.load(self.vectors_path, mmap_mode="r+")
+            self._inode = inode
+        return True
+
+    def _grow(self):
+        capacity = max(self.INITIAL_CAPACITY, len(self._ids) * 2 if self._open() else 0)
+        vectors, ids = self._create(capacity)
+        if self._ids is not None:
+            used = len(self._ids)
+            vectors[:used] = self._vectors
+            ids[:used] = self._ids
+        self._swap_in(vectors, ids)
+        self._open()
+
+    def upsert(self, item_id, vector):
+        with self._lock, self._file_lock():
+            if not self._open():
+                self._grow()
+            rows = np.flatnonzero(self._ids == item_id)
+            if len(rows) == 0:
+                rows = np.flatnonzero(self._ids == -1)
+                if len(rows) == 0:
+                    self._grow()
+                    rows = np.flatnonzero(self._ids == -1)
+            row = rows[0]
+            self._vectors[row] = vector
+            self._ids[row] = item_id
+
+    def remove(self, item_id):
+        with self._lock, self._file_lock():
+            if not self._open():
+                return
+            rows = np.flatnonzero(self._ids == item_id)
+            self._vectors[rows] = 0
+            self._ids[rows] = -1
+
+    def rebuild(self, items):
+        """Replace the whole index with `items`, an iterable of (id, vector)."""
+        items = list(items)
+        capacity = max(self.INITIAL_CAPACITY, 1 << (len(items) - 1).bit_length())
+        with self._lock, self._file_lock():
+            vectors, ids = self._create(capacity)
+            for row, (item_id, vector) in enumerate(items):
+                vectors[row] = vector
+                ids[row] = item_id
+            self._swap_in(vectors, ids)
+            self._open()
+        return len(items)
+
+    def search(self, vector, k=10, candidate_ids=None):
+        """
+        Return up to `k` (id, cosine similarity) pairs, best first.
+
+        Args:
+            vector (numpy.ndarray): Normalised query vector
+            k (int): Number of results
+            candidate_ids (iterable): Optionally restrict results to these ids
+
+        Returns:
+            list: (id, score) tuples
+        """
+        with self._lock:
+            if not self._open():
+                return []
+            ids = np.array(self._ids)
+            scores = np.asarray(self._vectors) @ vector
+
+        mask = ids != -1
+        if candidate_ids is not None:
+            mask &= np.isin(ids, np.fromiter(candidate_ids, dtype=np.int64))
+        rows = np.flatnonzero(mask)
+        if len(rows) == 0:
+            return []
+
+        k = min(k, len(rows))
+        # argpartition finds the top k in linear time; only those get sorted.
+        top = rows[np.argpartition(-scores[rows], k - 1)[:k]]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(ids[row]), float(scores[row])) for row in top]
+
+    def __len__(self):
+        with self._lock:
+            if not self._open():
+                return 0
+            return int(np.count_nonzero(np.asarray(self._ids) != -1))
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(name):
+    """Process-wide index instances ("jobs" and "resumes")."""
+    with _indexes_lock:
+        if name not in _indexes:
+            _indexes[name] = EmbeddingIndex(name)
+        return _indexes[name]
+
+
+def index_job(job):
+    get_index("jobs").upsert(job.id, embed_text(job_text(job)))
+
+
+def index_application(application):
+    if application.extracted_resume:
+        get_index("resumes").upsert(
+            application.id, embed_text(application.extracted_resume)
+        )
+    else:
+        get_index("resumes").remove(application.id)
+
+
+def semantic_job_ids(query, k=None, candidate_ids=None):
+    """
+    Ids of the jobs most similar to `query`, best first. Pass the ids the
+    results may come from as `candidate_ids` so the top k is taken among
+    them rather than across the whole index.
+    """
+    k = k or settings.EMBEDDING_SEARCH_TOP_K
+    results = get_index("jobs").search(embed_text(query), k, candidate_ids)
+    return [item_id for item_id, score in results if score >= settings.EMBEDDING_MIN_SCORE]
+
+
+def semantic_application_ids(job, candidate_ids, k):
+    """
+    Ids of the applications among `candidate_ids` whose extracted resume is
+    most similar to the job, best first.
+    """
+    results = get_index("resumes").search(embed_text(job_text(job)), k, candidate_ids)
+    return [item_id for item_id, score in results if score >= settings.EMBEDDING_MIN_SCORE]
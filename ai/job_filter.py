@@ -1,4 +1,5 @@
-from openai import OpenAI
+from ai.llm_gateway import chat_completion
+from ai.job_prescreen import prescreen_job
 from django.conf import settings
 import json
 
@@ -12,11 +13,31 @@ def job_filtering(job_details):
             # Handle as a text block if not valid JSON
             pass
 
+    screen = None
+    review_details = job_details
+    if settings.JOB_PRESCREEN_ENABLED and isinstance(job_details, dict):
+        screen = prescreen_job(job_details)
+        # Clean postings are approved locally without a model round trip
+        if screen["clean"]:
+            return {
+                "approved": True,
+                "policy_violations": [],
+                "modified_job": {},
+                "prescreen": screen,
+            }
+        # Only the flagged fields go to the model, with the title for context
+        review_details = {
+            field: job_details.get(field)
+            for field in ["title", *screen["flagged_fields"]]
+        }
+        if "experience" in screen["flagged_fields"]:
+            review_details["experience_level"] = job_details.get("experience_level")
+
     prompt = f"""
         I need you to analyze this job posting and filter it based on our standard policies. 
         Please analyze each field and only modify those that violate our policies.
 
-        Job posting: {job_details}
+        Job posting: {review_details}
 
         Please evaluate according to these policies:
         1. No discriminatory language or requirements based on age, gender, race, religion, or disability
@@ -34,14 +55,14 @@ def job_filtering(job_details):
         The modified_job should have the SAME structure as the input job posting, with changes ONLY to fields that violate policies.
         Do not modify fields that do not violate policies.
     """
+    if screen:
+        prompt += f"""
+        An automated pre-screen flagged these phrases; confirm or dismiss each one:
+        {json.dumps(screen["flags"], indent=2)}
+    """
 
-    client = OpenAI(
-        base_url=settings.OPENAI_ENDPOINT,
-        api_key=settings.OPENAI_TOKEN,
-    )
-
-    completion = client.chat.completions.create(
-        model=settings.OPENAI_MODEL,
+    completion = chat_completion(
+        generator="job_filter",
         store=True,
         messages=[
             {
@@ -56,5 +77,7 @@ def job_filtering(job_details):
 
     response_content = completion.choices[0].message.content
     result = json.loads(response_content)
+    if screen:
+        result["prescreen"] = screen
 
     return result
@@ -0,0 +1,203 @@
+import re
+import threading
+
+from jobs.parsers import parse_years
+
+# Phrases that usually signal discriminatory requirements, by category. Each
+# category becomes a named group of one compiled alternation, so a field is
+# scanned once for every term.
+DISCRIMINATORY_TERMS = {
+    "age": [
+        r"young",
+        r"youthful",
+        r"digital natives?",
+        r"recent graduates? only",
+        r"(?:aged?|ages) (?:between )?\d{2}\s*(?:-|to|and)\s*\d{2}",
+        r"(?:under|below|not older than|no older than|over) (?:the age of )?\d{2}(?: years old)?",
+        r"maximum age",
+        r"age limit",
+    ],
+    "gender": [
+        r"(?:male|female|men|women|man|woman|boys?|girls?|ladies|gentlemen) only",
+        r"only (?:male|female|men|women|ladies|gentlemen)",
+        r"must be (?:a )?(?:male|female|man|woman)",
+        r"(?:salesman|waitress|chairman)",
+        r"not pregnant|no pregnan\w*",
+    ],
+    "race_or_nationality": [
+        r"(?:white|black|asian|caucasian|hispanic|latino) (?:only|candidates|applicants)",
+        r"native (?:english )?speakers? only",
+        r"must be (?:a )?native",
+        r"citizens only",
+    ],
+    "religion": [
+        r"(?:christian|muslim|hindu|jewish|catholic|sikh|buddhist)s? only",
+        r"must be (?:a )?(?:christian|muslim|hindu|jewish|catholic|sikh|buddhist)",
+    ],
+    "disability": [
+        r"able[- ]bodied",
+        r"no disabilit\w*",
+        r"(?:perfect|good) health (?:required|only)",
+    ],
+    "marital_or_family_status": [
+        r"must be (?:single|unmarried|married)",
+        r"(?:single|unmarried) candidates",
+        r"no (?:kids|children)",
+    ],
+    "appearance": [
+        r"good[- ]looking",
+        r"attractive (?:appearance|candidates|applicants|women|men|girls?|boys?)",
+        r"pleasant appearance",
+    ],
+}
+
+SUSPICIOUS_TERMS = {
+    "upfront_payment": [
+        r"(?:registration|training|application|processing|starter kit) fees?",
+        r"pay (?:a|the) (?:small )?fee",
+        r"(?:deposit|payment) (?:is )?required",
+    ],
+    "payment_channel": [
+        r"western union",
+        r"money ?gram",
+        r"wire transfer",
+        r"gift cards?",
+        r"bitcoin|crypto(?:currency)? payment",
+    ],
+    "personal_data": [
+        r"social security number|ssn",
+        r"bank (?:account|details)",
+        r"(?:passport|id card) (?:copy|scan)",
+    ],
+    "off_platform_contact": [
+        r"whats ?app",
+        r"telegram",
+        r"text (?:me|us) at",
+    ],
+    "unrealistic_promise": [
+        r"guaranteed (?:income|salary|earnings)",
+        r"earn \$?\d[\d,]* (?:per|a|every) (?:day|week)",
+        r"get rich",
+        r"no experience (?:needed|required),? (?:earn|make)",
+        r"unlimited earning",
+    ],
+    "unpaid_work": [
+        r"unpaid (?:overtime|trial|work)",
+        r"work for free",
+        r"(?:24/7|24 hours a day) availability",
+    ],
+}
+
+
+def _compile(categories):
+    groups = []
+    for category, terms in categories.items():
+        groups.append(f"(?P<{category}>{'|'.join(terms)})")
+    return re.compile(r"\b(?:" + "|".join(groups) + r")\b", re.IGNORECASE)
+
+
+DISCRIMINATORY_PATTERN = _compile(DISCRIMINATORY_TERMS)
+SUSPICIOUS_PATTERN = _compile(SUSPICIOUS_TERMS)
+
+# Plausible (min, max) years of experience for each level.
+LEVEL_YEAR_RANGES = {
+    "entry": (0, 2),
+    "mid": (1, 7),
+    "senior": (3, None),
+    "executive": (5, None),
+}
+
+# Fields that are scanned; everything else in the job dict is structural.
+TEXT_FIELDS = [
+    "title",
+    "company",
+    "location",
+    "experience",
+    "salary",
+    "description",
+    "responsibilities",
+    "required_qualifications",
+    "preferred_qualifications",
+    "benefits",
+]
+
+_stats = {"screened": 0, "auto_approved": 0, "escalated": 0}
+_stats_lock = threading.Lock()
+
+
+def _field_text(value):
+    if isinstance(value, (list, tuple)):
+        return "\n".join(str(item) for item in value)
+    return str(value or "")
+
+
+def check_experience_consistency(experience_level, experience_required):
+    """Return a flag dict if the level and the required years contradict."""
+    if experience_level not in LEVEL_YEAR_RANGES:
+        return None
+    years = parse_years(_field_text(experience_required))
+    if years is None:
+        return None
+
+    min_years, max_years = years
+    level_min, level_max = LEVEL_YEAR_RANGES[experience_level]
+    if (level_max is not None and min_years > level_max) or (
+        max_years is not None and max_years < level_min
+    ):
+        return {
+            "field": "experience",
+            "category": "experience_level_mismatch",
+            "match": f"{experience_level} level requires {experience_required}",
+        }
+    return None
+
+
+def prescreen_job(job_details):
+    """
+    Screen a job dict with local rules before any model call.
+
+    Args:
+        job_details (dict): The job as built by PublishJobListingView
+
+    Returns:
+        dict: "clean" (bool), "flags" (list of field/category/match dicts)
+            and "flagged_fields" (fields that need model review)
+    """
+    flags = []
+    for field in TEXT_FIELDS:
+        text = _field_text(job_details.get(field))
+        if not text:
+            continue
+        for pattern in (DISCRIMINATORY_PATTERN, SUSPICIOUS_PATTERN):
+            for match in pattern.finditer(text):
+                flags.append(
+                    {
+                        "field": field,
+                        "category": match.lastgroup,
+                        "match": match.group(0),
+                    }
+                )
+
+    mismatch = check_experience_consistency(
+        job_details.get("experience_level"), job_details.get("experience")
+    )
+    if mismatch:
+        flags.append(mismatch)
+
+    flagged_fields = sorted({flag["field"] for flag in flags})
+    clean = not flags
+
+    with _stats_lock:
+        _stats["screened"] += 1
+        _stats["auto_approved" if clean else "escalated"] += 1
+
+    return {"clean": clean, "flags": flags, "flagged_fields": flagged_fields}
+
+
+def get_stats():
+    """
+    Pre-screen counts since process start. Every auto-approved posting is
+    one `job_filter` model call skipped.
+    """
+    with _stats_lock:
+        return {**_stats, "llm_calls_skipped": _stats["auto_approved"]}
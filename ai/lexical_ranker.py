@@ -0,0 +1,117 @@
+import re
+from collections import Counter
+
+import numpy as np
+
+
+# Keeps tokens like "c++", "c#" and "node.js" intact.
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+STOP_WORDS = frozenset(
+    """
+    a about above after again all also am an and any are as at be been being
+    both but by can could did do does doing during each etc for from further had
+    has have having he her here hers him his how i if in into is it its itself
+    just me more most my no nor not of off on once only or other our ours out
+    over own same she should so some such than that the their them then there
+    these they this those through to too under until up very was we were what
+    when where which while who whom why will with within would you your yours
+    able ability candidate candidates job role position team work working
+    experience years year strong excellent good knowledge skills skill
+    """.split()
+)
+
+
+def tokenize(text):
+    """Lowercase, split into word tokens and drop stop words."""
+    return [
+        token
+        for token in TOKEN_PATTERN.findall(str(text).lower())
+        if token not in STOP_WORDS
+    ]
+
+
+def _as_text(value):
+    if isinstance(value, (list, tuple)):
+        return "\n".join(str(item) for item in value)
+    return str(value or "")
+
+
+def job_query_terms(job):
+    """
+    Build the weighted BM25 query for a job. Required qualifications count
+    twice since they are the strongest signal of fit.
+    """
+    terms = Counter()
+    terms.update(tokenize(_as_text(job.description)))
+    terms.update(tokenize(_as_text(job.responsibilities)))
+    terms.update(tokenize(_as_text(job.preferred_qualifications)))
+    for token in tokenize(_as_text(job.required_qualifications)):
+        terms[token] += 2
+    return terms
+
+
+def bm25_scores(documents, query_terms, k1=1.5, b=0.75):
+    """
+    Score documents against weighted query terms with Okapi BM25.
+
+    Only query terms matter to BM25, so the term-frequency matrix is built
+    over the query vocabulary alone (documents x query terms) and scored in
+    a single vectorised pass.
+
+    Args:
+        documents (list): Raw document strings
+        query_terms (Counter): Query term -> weight
+
+    Returns:
+        numpy.ndarray: One float score per document
+    """
+    if not documents or not query_terms:
+        return np.zeros(len(documents), dtype=np.float32)
+
+    vocabulary = {term: index for index, term in enumerate(query_terms)}
+    tf = np.zeros((len(documents), len(vocabulary)), dtype=np.float32)
+    doc_lengths = np.zeros(len(documents), dtype=np.float32)
+
+    for row, document in enumerate(documents):
+        tokens = tokenize(document)
+        doc_lengths[row] = len(tokens)
+        for token, count in Counter(tokens).items():
+            column = vocabulary.get(token)
+            if column is not None:
+                tf[row, column] = count
+
+    n_docs = len(documents)
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+    weights = np.array(list(query_terms.values()), dtype=np.float32)
+
+    avg_length = doc_lengths.mean() or 1.0
+    length_norm = k1 * (1 - b + b * doc_lengths / avg_length)
+    saturated = tf * (k1 + 1) / (tf + length_norm[:, None])
+    return saturated @ (idf * weights)
+
+
+def prerank_applications(applications, job, top_n):
+    """
+    Rank applications by BM25 relevance of their extracted resume text to
+    the job and keep the best `top_n`.
+
+    Every application in the pool gets a `lexical_score` between 0 and 100,
+    relative to the best match in the pool, and its raw `bm25_score`.
+    """
+    if not applications:
+        return []
+
+    documents = [app.get("extracted_resume") or "" for app in applications]
+    scores = bm25_scores(documents, job_query_terms(job))
+
+    best = float(scores.max()) if len(scores) else 0.0
+    normalised = scores / best * 100 if best > 0 else scores
+
+    for app, score, lexical_score in zip(applications, scores, normalised):
+        app["lexical_score"] = round(float(lexical_score), 1)
+        app["bm25_score"] = float(score)
+
+    order = np.argsort(-scores, kind="stable")[:top_n]
+    return [applications[index] for index in order]
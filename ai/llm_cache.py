@@ -0,0 +1,140 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class LRUCache:
+    """A small thread-safe LRU cache with per-entry expiry."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+_local_cache = None
+_local_cache_lock = threading.Lock()
+_stats = defaultdict(lambda: {"hits": 0, "shared_hits": 0, "misses": 0})
+_stats_lock = threading.Lock()
+
+
+def _get_local_cache():
+    global _local_cache
+    if _local_cache is None:
+        with _local_cache_lock:
+            if _local_cache is None:
+                _local_cache = LRUCache(settings.LLM_CACHE_MAX_ENTRIES)
+    return _local_cache
+
+
+def _get_shared_cache():
+    alias = settings.LLM_CACHE_SHARED_ALIAS
+    return caches[alias] if alias else None
+
+
+def get_ttl(generator):
+    """Return the cache TTL in seconds for a generator; 0 disables caching."""
+    if not settings.LLM_CACHE_ENABLED or not generator:
+        return 0
+    return settings.LLM_CACHE_TTLS.get(generator, settings.LLM_CACHE_DEFAULT_TTL)
+
+
+def make_key(model, messages, temperature, response_format, extra=None):
+    """
+    Build a content-addressed key from the inputs that determine the response:
+    model, system message, prompt, temperature and response format.
+    """
+    system = [m["content"] for m in messages if m.get("role") == "system"]
+    prompt = [
+        (m.get("role"), m["content"]) for m in messages if m.get("role") != "system"
+    ]
+    payload = json.dumps(
+        {
+            "model": model,
+            "system": system,
+            "prompt": prompt,
+            "temperature": temperature,
+            "response_format": response_format,
+            "extra": extra or {},
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return "llm:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _record(generator, outcome):
+    with _stats_lock:
+        _stats[generator or "unknown"][outcome] += 1
+
+
+def lookup(key, generator=None):
+    """Look a key up in the local tier, then the shared tier."""
+    value = _get_local_cache().get(key)
+    if value is not None:
+        _record(generator, "hits")
+        return value
+
+    shared = _get_shared_cache()
+    if shared is not None:
+        value = shared.get(key)
+        if value is not None:
+            # Promote to the local tier so repeat lookups stay in-process.
+            _get_local_cache().set(key, value, get_ttl(generator))
+            _record(generator, "shared_hits")
+            return value
+
+    _record(generator, "misses")
+    return None
+
+
+def store(key, value, ttl):
+    _get_local_cache().set(key, value, ttl)
+    shared = _get_shared_cache()
+    if shared is not None:
+        shared.set(key, value, ttl)
+
+
+def get_stats():
+    """Return hit/miss counters per generator plus the local tier size."""
+    with _stats_lock:
+        generators = {name: dict(counts) for name, counts in _stats.items()}
+    return {"local_entries": len(_get_local_cache()), "generators": generators}
+
+
+def clear():
+    """Empty the local tier and reset counters (the shared tier is left alone)."""
+    _get_local_cache().clear()
+    with _stats_lock:
+        _stats.clear()
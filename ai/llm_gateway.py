@@ -0,0 +1,272 @@
+import random
+import threading
+import time
+
+import httpx
+import openai
+from openai import OpenAI
+from openai.types.chat import ChatCompletion
+from django.conf import settings
+
+from ai import llm_cache, llm_replay, telemetry
+
+
+# Errors worth retrying: dropped/timed out connections, throttling and 5xx.
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+_client = None
+_client_lock = threading.Lock()
+_semaphore = None
+_semaphore_lock = threading.Lock()
+
+
+class LLMBusyError(RuntimeError):
+    """Raised when no concurrency slot frees up within the queue timeout."""
+
+
+def get_client():
+    """
+    Return the process-wide OpenAI client.
+
+    The client owns a keep-alive connection pool to OPENAI_ENDPOINT, so the
+    TLS handshake is paid once per connection instead of once per call.
+    Retries are handled by the gateway, not by the SDK.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                        max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY,
+                    ),
+                    timeout=httpx.Timeout(
+                        settings.OPENAI_TIMEOUT,
+                        connect=settings.OPENAI_CONNECT_TIMEOUT,
+                    ),
+                )
+                _client = OpenAI(
+                    base_url=settings.OPENAI_ENDPOINT,
+                    api_key=settings.OPENAI_TOKEN,
+                    http_client=http_client,
+                    max_retries=0,
+                )
+    return _client
+
+
+def _get_semaphore():
+    global _semaphore
+    if _semaphore is None:
+        with _semaphore_lock:
+            if _semaphore is None:
+                _semaphore = threading.BoundedSemaphore(
+                    settings.OPENAI_MAX_CONCURRENCY
+                )
+    return _semaphore
+
+
+def _backoff_delay(attempt):
+    """Exponential backoff with full jitter, capped at OPENAI_RETRY_MAX_DELAY."""
+    delay = min(
+        settings.OPENAI_RETRY_MAX_DELAY,
+        settings.OPENAI_RETRY_BASE_DELAY * (2**attempt),
+    )
+    return random.uniform(0, delay)
+
+
+def _create_with_retries(request, attempts=None):
+    """
+    Run a chat completion request with bounded retries. `attempts` is a
+    list that receives the number of retries made, for telemetry.
+    """
+    if settings.LLM_REPLAY_MODE == "replay":
+        return llm_replay.replay(request)
+
+    client = get_client()
+    attempt = 0
+    while True:
+        try:
+            result = client.chat.completions.create(**request)
+            if settings.LLM_REPLAY_MODE == "record":
+                return llm_replay.record(request, result)
+            return result
+        except RETRYABLE_ERRORS:
+            if attempt >= settings.OPENAI_MAX_RETRIES:
+                raise
+            time.sleep(_backoff_delay(attempt))
+            attempt += 1
+            if attempts is not None:
+                attempts.append(attempt)
+
+
+def chat_completion(
+    messages,
+    temperature=0.7,
+    response_format=None,
+    model=None,
+    generator=None,
+    cache=True,
+    **kwargs,
+):
+    """
+    Send a chat completion request through the shared gateway.
+
+    Args:
+        messages (list): Chat messages in OpenAI format
+        temperature (float): Sampling temperature
+        response_format (dict): Optional response format, e.g. json_object
+        model (str): Model name, defaults to settings.OPENAI_MODEL
+        generator (str): Name of the calling generator, used to pick a cache
+            TTL and to group telemetry
+        cache (bool): Set to False to always call the model
+        **kwargs: Extra arguments passed to chat.completions.create
+
+    Returns:
+        ChatCompletion: The raw completion object
+    """
+    model = model or settings.OPENAI_MODEL
+    started = time.perf_counter()
+
+    ttl = llm_cache.get_ttl(generator) if cache else 0
+    cache_key = None
+    if ttl > 0:
+        extra = {k: v for k, v in kwargs.items() if k != "store"}
+        cache_key = llm_cache.make_key(
+            model, messages, temperature, response_format, extra
+        )
+        cached = llm_cache.lookup(cache_key, generator)
+        if cached is not None:
+            # No tokens were spent, so usage is not recorded
+            telemetry.record_call(
+                generator,
+                model,
+                latency_ms=(time.perf_counter() - started) * 1000,
+                cache_state="hit",
+            )
+            return ChatCompletion.model_validate(cached)
+
+    request = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        **kwargs,
+    }
+    if response_format is not None:
+        request["response_format"] = response_format
+
+    cache_state = "miss" if cache_key is not None else "off"
+    attempts = []
+    queue_wait_ms = None
+    try:
+        semaphore = _get_semaphore()
+        if not semaphore.acquire(timeout=settings.OPENAI_QUEUE_TIMEOUT):
+            raise LLMBusyError("Too many concurrent AI requests, please try again.")
+        queue_wait_ms = (time.perf_counter() - started) * 1000
+        try:
+            completion = _create_with_retries(request, attempts)
+        finally:
+            semaphore.release()
+    except Exception:
+        telemetry.record_call(
+            generator,
+            model,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            cache_state=cache_state,
+            retries=len(attempts),
+            queue_wait_ms=queue_wait_ms,
+            error=True,
+        )
+        raise
+
+    telemetry.record_completion(
+        generator,
+        model,
+        completion,
+        latency_ms=(time.perf_counter() - started) * 1000,
+        cache_state=cache_state,
+        retries=len(attempts),
+        queue_wait_ms=queue_wait_ms,
+    )
+
+    if cache_key is not None:
+        llm_cache.store(cache_key, completion.model_dump(mode="json"), ttl)
+    return completion
+
+
+def stream_chat_completion(
+    messages,
+    temperature=0.7,
+    response_format=None,
+    model=None,
+    generator=None,
+    **kwargs,
+):
+    """
+    Stream a chat completion through the shared gateway, yielding text deltas.
+
+    Only opening the stream is retried; once tokens have been forwarded to
+    the caller a failure is raised as-is. Streamed responses bypass the
+    response cache. Telemetry is recorded when the stream ends or is closed.
+    """
+    model = model or settings.OPENAI_MODEL
+    started = time.perf_counter()
+    request = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "stream": True,
+        **kwargs,
+    }
+    if response_format is not None:
+        request["response_format"] = response_format
+    if settings.OPENAI_STREAM_USAGE:
+        # The final chunk then carries usage (with an empty choices list)
+        request.setdefault("stream_options", {"include_usage": True})
+
+    attempts = []
+    queue_wait_ms = None
+    first_token_ms = None
+    usage = None
+    error = False
+    try:
+        semaphore = _get_semaphore()
+        if not semaphore.acquire(timeout=settings.OPENAI_QUEUE_TIMEOUT):
+            raise LLMBusyError("Too many concurrent AI requests, please try again.")
+        queue_wait_ms = (time.perf_counter() - started) * 1000
+        try:
+            stream = _create_with_retries(request, attempts)
+            for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    if first_token_ms is None:
+                        first_token_ms = (time.perf_counter() - started) * 1000
+                    yield delta
+        finally:
+            semaphore.release()
+    except Exception:
+        error = True
+        raise
+    finally:
+        telemetry.record_call(
+            generator,
+            model,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            cache_state="off",
+            prompt_tokens=getattr(usage, "prompt_tokens", None),
+            completion_tokens=getattr(usage, "completion_tokens", None),
+            retries=len(attempts),
+            queue_wait_ms=queue_wait_ms,
+            first_token_ms=first_token_ms,
+            error=error,
+            streamed=True,
+        )
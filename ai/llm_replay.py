@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import re
+import time
+import uuid
+
+from django.conf import settings
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+# Request arguments that don't change the response content
+IGNORED_REQUEST_KEYS = {"stream", "stream_options", "store", "user"}
+
+STREAM_PIECE_RE = re.compile(r"\S+\s*|\s+")
+
+
+class LLMReplayMissing(RuntimeError):
+    """Raised in replay mode when a request has no recorded response."""
+
+
+def request_key(request):
+    """
+    Key a chat completion request by everything that determines its
+    response. The stand-in server computes the same key from the JSON body.
+    """
+    payload = json.dumps(
+        {k: v for k, v in request.items() if k not in IGNORED_REQUEST_KEYS},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _recording_path(key, directory=None):
+    return os.path.join(directory or settings.LLM_REPLAY_DIR, f"{key}.json")
+
+
+def save_recording(request, response, directory=None):
+    """Store a response (ChatCompletion dict) for a request."""
+    directory = directory or settings.LLM_REPLAY_DIR
+    os.makedirs(directory, exist_ok=True)
+    path = _recording_path(request_key(request), directory)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(
+            {
+                "request": {
+                    k: v for k, v in request.items() if k not in IGNORED_REQUEST_KEYS
+                },
+                "response": response,
+            },
+            f,
+            indent=2,
+            default=str,
+        )
+    os.replace(tmp_path, path)
+
+
+def load_recording(request, directory=None):
+    """Return the recorded response dict for a request, or None."""
+    try:
+        with open(_recording_path(request_key(request), directory)) as f:
+            return json.load(f)["response"]
+    except FileNotFoundError:
+        return None
+
+
+def completion_dict(model, content, usage=None):
+    """Build a ChatCompletion dict around a piece of content."""
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content},
+            }
+        ],
+        "usage": usage,
+    }
+
+
+def stream_chunks(response, include_usage=False):
+    """
+    Split a recorded completion into ChatCompletionChunk dicts of roughly
+    one word each, ending with a usage chunk when requested.
+    """
+    content = response["choices"][0]["message"]["content"] or ""
+    base = {
+        "id": response.get("id") or f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion.chunk",
+        "created": response.get("created") or int(time.time()),
+        "model": response.get("model", ""),
+    }
+
+    yield {
+        **base,
+        "choices": [{"index": 0, "delta": {"role": "assistant"}, "finish_reason": None}],
+    }
+    for piece in STREAM_PIECE_RE.findall(content):
+        yield {
+            **base,
+            "choices": [
+                {"index": 0, "delta": {"content": piece}, "finish_reason": None}
+            ],
+        }
+    yield {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+    if include_usage and response.get("usage"):
+        yield {**base, "choices": [], "usage": response["usage"]}
+
+
+def replay(request):
+    """Serve a request from the recordings, in the shape the SDK returns."""
+    response = load_recording(request)
+    if response is None:
+        raise LLMReplayMissing(
+            f"No recorded response for request {request_key(request)[:12]} "
+            f"in {settings.LLM_REPLAY_DIR}"
+        )
+    if not request.get("stream"):
+        return ChatCompletion.model_validate(response)
+
+    include_usage = bool((request.get("stream_options") or {}).get("include_usage"))
+    return (
+        ChatCompletionChunk.model_validate(chunk)
+        for chunk in stream_chunks(response, include_usage)
+    )
+
+
+def record(request, result):
+    """
+    Save the response for a live request. Streams are passed through and
+    saved as one completion once they are fully consumed.
+    """
+    if not request.get("stream"):
+        save_recording(request, result.model_dump(mode="json"))
+        return result
+    return _record_stream(request, result)
+
+
+def _record_stream(request, stream):
+    parts = []
+    usage = None
+    for chunk in stream:
+        if getattr(chunk, "usage", None) is not None:
+            usage = chunk.usage.model_dump(mode="json")
+        if chunk.choices and chunk.choices[0].delta.content:
+            parts.append(chunk.choices[0].delta.content)
+        yield chunk
+    save_recording(
+        request, completion_dict(request.get("model", ""), "".join(parts), usage)
+    )
@@ -0,0 +1,71 @@
+import random
+import statistics
+import time
+
+import markdown
+from bs4 import BeautifulSoup
+from django.core.management.base import BaseCommand
+
+from ai.markdown_render import clear, markdown_to_html, render_markdown
+
+PARAGRAPHS = [
+    "I am a **backend engineer** with seven years of experience building APIs.",
+    "My work focuses on *reliability*, observability and clear code review.",
+    "I enjoy mentoring junior developers and improving team processes.",
+    "Recently I led a migration to [Django 5](https://www.djangoproject.com/).",
+]
+
+
+def legacy_markdown_to_html(text):
+    """The previous view code: markdown, then a BeautifulSoup prettify pass."""
+    if text.startswith("```markdown"):
+        text = text.strip("```markdown").strip("```")
+    html = markdown.markdown(text)
+    soup = BeautifulSoup(html, "html.parser")
+    return soup.prettify(formatter="html").replace("\n", " ")
+
+
+def sample_documents(count, rng):
+    documents = []
+    for index in range(count):
+        lines = [f"# Post {index}", ""]
+        for section in range(rng.randint(2, 6)):
+            lines.extend([f"## Section {section}", ""])
+            lines.extend(rng.sample(PARAGRAPHS, len(PARAGRAPHS)))
+            lines.extend(["", "- first point", "- second point", ""])
+        documents.append("```markdown\n" + "\n".join(lines) + "\n```")
+    return documents
+
+
+class Command(BaseCommand):
+    help = "Compare markdown rendering against the previous prettify-based path."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--documents", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        documents = sample_documents(options["documents"], random.Random(42))
+        clear()
+
+        paths = [
+            ("legacy (prettify)", legacy_markdown_to_html),
+            ("render uncached", markdown_to_html),
+            ("render cold cache", render_markdown),
+            ("render warm cache", render_markdown),
+        ]
+        for label, render in paths:
+            # The cold pass fills the cache for the warm one
+            repeat = 1 if label == "render cold cache" else options["repeat"]
+            timings = []
+            for _ in range(repeat):
+                for text in documents:
+                    started = time.perf_counter()
+                    render(text)
+                    timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            self.stdout.write(
+                f"{label:18} renders={len(timings):5} "
+                f"mean={statistics.mean(timings):7.3f}ms p95={p95:7.3f}ms"
+            )
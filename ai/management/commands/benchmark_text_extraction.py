@@ -0,0 +1,206 @@
+import io
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import docx
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from core.text_extraction import BACKENDS, extract_text, sniff_format
+
+SECTIONS = {
+    "Summary": [
+        "Backend engineer focused on reliable, well-tested services",
+        "Product-minded developer who enjoys mentoring and code review",
+    ],
+    "Skills": [
+        "Python, Django, Django REST Framework, PostgreSQL, Redis",
+        "JavaScript, TypeScript, React, Next.js, Tailwind CSS",
+        "Docker, Kubernetes, AWS, Terraform, GitHub Actions",
+    ],
+    "Experience": [
+        "Senior Software Engineer, Acme Corp, 2020 - present",
+        "Designed a payments API handling two million requests per day",
+        "Cut p95 latency of the search service from 900 ms to 120 ms",
+        "Software Engineer, Initech, 2016 - 2020",
+        "Migrated a monolith to services behind an API gateway",
+    ],
+    "Education": [
+        "BSc Computer Science, State University, 2016",
+    ],
+    "Certifications": [
+        "AWS Certified Solutions Architect - Associate",
+    ],
+}
+
+
+def sample_resume_lines(rng, pages):
+    lines = [f"Candidate {rng.randint(1000, 9999)}", "candidate@example.com"]
+    for _ in range(pages):
+        for heading, items in SECTIONS.items():
+            lines.append(heading.upper())
+            lines.extend(rng.sample(items, len(items)))
+    return lines
+
+
+def build_pdf(lines, lines_per_page=45):
+    """A minimal text-only PDF, so the benchmark needs no PDF writer library."""
+    pages = [
+        lines[i : i + lines_per_page] for i in range(0, len(lines), lines_per_page)
+    ]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in below
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for page_lines in pages:
+        text = "".join(
+            "({}) '\n".format(
+                line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            )
+            for line in page_lines
+        )
+        stream = f"BT /F1 11 Tf 14 TL 50 780 Td\n{text}ET".encode("latin-1", "replace")
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        )
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids),
+        len(kids),
+    )
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        output.write(b"%010d 00000 n \n" % offset)
+    output.write(
+        b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(objects) + 1, xref)
+    )
+    return output.getvalue()
+
+
+def build_docx(lines):
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    output = io.BytesIO()
+    document.save(output)
+    return output.getvalue()
+
+
+class Command(BaseCommand):
+    help = "Benchmark resume text extraction backends over a corpus of documents."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "corpus",
+            nargs="?",
+            help="Directory of sample resumes. A synthetic corpus is generated if omitted.",
+        )
+        parser.add_argument("--samples", type=int, default=40)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.TEXT_EXTRACTION_WORKERS,
+            help="Process pool size; 0 extracts inline.",
+        )
+        parser.add_argument(
+            "--backend",
+            action="append",
+            help="Only benchmark these backends (repeatable).",
+        )
+
+    def load_corpus(self, options):
+        if options["corpus"]:
+            documents = []
+            for name in sorted(os.listdir(options["corpus"])):
+                with open(os.path.join(options["corpus"], name), "rb") as f:
+                    documents.append((name, f.read()))
+            if not documents:
+                raise CommandError("The corpus directory is empty")
+            return documents
+
+        rng = random.Random(42)
+        documents = []
+        for index in range(options["samples"]):
+            lines = sample_resume_lines(rng, pages=rng.randint(1, 4))
+            if index % 2:
+                documents.append((f"sample-{index}.docx", build_docx(lines)))
+            else:
+                documents.append((f"sample-{index}.pdf", build_pdf(lines)))
+        return documents
+
+    def handle(self, *args, **options):
+        documents = self.load_corpus(options)
+        by_format = {}
+        for name, content in documents:
+            by_format.setdefault(sniff_format(content), []).append(content)
+        self.stdout.write(
+            "Corpus: "
+            + ", ".join(f"{len(docs)} {fmt}" for fmt, docs in by_format.items())
+            + f"; workers={options['workers']}"
+        )
+
+        with override_settings(TEXT_EXTRACTION_WORKERS=options["workers"]):
+            for file_format, docs in by_format.items():
+                if file_format is None:
+                    self.stderr.write(f"Skipping {len(docs)} unsupported documents")
+                    continue
+                for backend in BACKENDS.get(file_format, {}):
+                    if options["backend"] and backend not in options["backend"]:
+                        continue
+                    self.run_backend(
+                        file_format, backend, docs, options["repeat"], options["workers"]
+                    )
+
+    def run_backend(self, file_format, backend, docs, repeat, workers):
+        # One warm-up pass so pool start-up and imports aren't measured
+        extract_text(docs[0], backend=backend)
+
+        def extract(content):
+            doc_started = time.perf_counter()
+            try:
+                characters = len(extract_text(content, backend=backend))
+                error = False
+            except Exception:
+                characters = 0
+                error = True
+            return (time.perf_counter() - doc_started) * 1000, characters, error
+
+        # Submit concurrently so a process pool can use all its workers
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            results = list(executor.map(extract, docs * repeat))
+        elapsed = time.perf_counter() - started
+
+        timings = [timing for timing, _, _ in results]
+        characters = sum(count for _, count, _ in results)
+        errors = sum(1 for _, _, error in results if error)
+
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(
+            f"{file_format:5} {backend:12} docs={len(timings):4} "
+            f"mean={statistics.mean(timings):7.2f}ms p95={p95:7.2f}ms "
+            f"throughput={len(timings) / elapsed:7.1f} docs/s "
+            f"chars={characters} errors={errors}"
+        )
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ai.nltk_setup import download_nltk_data
+
+
+class Command(BaseCommand):
+    help = "Download the NLTK resources the app uses into NLTK_DATA_DIR."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dir",
+            help="Target directory (defaults to settings.NLTK_DATA_DIR).",
+        )
+
+    def handle(self, *args, **options):
+        target = options["dir"] or settings.NLTK_DATA_DIR
+        results = download_nltk_data(target)
+        failed = [name for name, ok in results.items() if not ok]
+        if failed:
+            raise CommandError(f"Failed to download: {', '.join(failed)}")
+        self.stdout.write(f"Bundled {', '.join(results)} into {target}")
@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Run in a fresh interpreter so nothing is already imported. The URLconf is
+# imported too since that is where the views and their dependencies load.
+BOOT_SCRIPT = """
+import time
+started = time.perf_counter()
+import core.wsgi
+from django.conf import settings
+from django.urls import get_resolver
+get_resolver(settings.ROOT_URLCONF).url_patterns
+print(time.perf_counter() - started)
+"""
+
+
+class Command(BaseCommand):
+    help = "Fail if importing core.wsgi and the URLconf exceeds the boot time budget."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--budget",
+            type=float,
+            default=settings.BOOT_TIME_BUDGET,
+            help="Maximum allowed boot time in seconds.",
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=3,
+            help="Number of cold boots; the fastest one is compared to the budget.",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=10,
+            help="Slowest imports to list when the budget is exceeded.",
+        )
+
+    def boot(self, importtime=False):
+        command = [sys.executable]
+        if importtime:
+            command += ["-X", "importtime"]
+        result = subprocess.run(
+            command + ["-c", BOOT_SCRIPT],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": "core.settings"},
+            cwd=settings.BASE_DIR,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Boot failed:\n{result.stderr}")
+        return float(result.stdout.strip().splitlines()[-1]), result.stderr
+
+    def slowest_imports(self, report, top):
+        # -X importtime lines: "import time: self [us] | cumulative | package"
+        imports = []
+        for line in report.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, package = line.split("|")
+            imports.append((int(cumulative), package.strip()))
+        return sorted(imports, reverse=True)[:top]
+
+    def handle(self, *args, **options):
+        timings = [self.boot()[0] for _ in range(max(1, options["runs"]))]
+        best = min(timings)
+        self.stdout.write(
+            f"Boot time: {best:.3f}s (runs: {', '.join(f'{t:.3f}' for t in timings)}), "
+            f"budget {options['budget']:.3f}s"
+        )
+        if best <= options["budget"]:
+            return
+
+        _, report = self.boot(importtime=True)
+        for cumulative, package in self.slowest_imports(report, options["top"]):
+            self.stdout.write(f"  {cumulative / 1e6:8.3f}s  {package}")
+        raise CommandError("Boot time budget exceeded")
@@ -0,0 +1,68 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ai.telemetry import get_metrics
+
+
+def _value(summary, histogram, field):
+    value = summary.get(histogram, {}).get(field)
+    return "-" if value is None else f"{value:.0f}"
+
+
+class Command(BaseCommand):
+    help = "Show per-generator LLM latency, token and cache telemetry."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--json", action="store_true", help="Print raw JSON.")
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Delete the worker snapshots in LLM_TELEMETRY_DIR.",
+        )
+
+    def handle(self, *args, **options):
+        if options["reset"]:
+            if not settings.LLM_TELEMETRY_DIR:
+                raise CommandError("LLM_TELEMETRY_DIR is not set")
+            for name in os.listdir(settings.LLM_TELEMETRY_DIR):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(settings.LLM_TELEMETRY_DIR, name))
+            self.stdout.write("Telemetry snapshots deleted")
+            return
+
+        if not settings.LLM_TELEMETRY_DIR:
+            self.stderr.write(
+                "LLM_TELEMETRY_DIR is not set, so only this process is reported."
+            )
+
+        metrics = get_metrics()
+        if options["json"]:
+            self.stdout.write(json.dumps(metrics, indent=2))
+            return
+        if not metrics:
+            self.stdout.write("No LLM calls recorded")
+            return
+
+        self.stdout.write(
+            f"{'generator':22} {'model':14} {'calls':>6} {'errors':>6} "
+            f"{'hit rate':>8} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} "
+            f"{'wait p95':>8} {'prompt tok':>10} {'compl tok':>10} {'retries':>7}"
+        )
+        for generator, models in metrics.items():
+            for model, summary in models.items():
+                hit_rate = summary["cache_hit_rate"]
+                self.stdout.write(
+                    f"{generator:22} {model:14} {summary['calls']:>6} "
+                    f"{summary['errors']:>6} "
+                    f"{'-' if hit_rate is None else f'{hit_rate:.0%}':>8} "
+                    f"{_value(summary, 'latency_ms', 'p50'):>7} "
+                    f"{_value(summary, 'latency_ms', 'p95'):>7} "
+                    f"{_value(summary, 'latency_ms', 'p99'):>7} "
+                    f"{_value(summary, 'queue_wait_ms', 'p95'):>8} "
+                    f"{_value(summary, 'prompt_tokens', 'total'):>10} "
+                    f"{_value(summary, 'completion_tokens', 'total'):>10} "
+                    f"{_value(summary, 'retries', 'total'):>7}"
+                )
@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ai.embeddings import embed_text, get_index, job_text
+from applications.models import Application
+from jobs.models import JobListing
+
+
+class Command(BaseCommand):
+    help = "Rebuild the local job and resume embedding indexes from the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only",
+            choices=["jobs", "resumes"],
+            help="Rebuild a single index instead of both.",
+        )
+
+    def handle(self, *args, **options):
+        if options["only"] in (None, "jobs"):
+            started = time.perf_counter()
+            count = get_index("jobs").rebuild(
+                (job.id, embed_text(job_text(job)))
+                for job in JobListing.objects.all().iterator()
+            )
+            self.stdout.write(
+                f"Indexed {count} jobs in {time.perf_counter() - started:.2f}s"
+            )
+
+        if options["only"] in (None, "resumes"):
+            started = time.perf_counter()
+            applications = (
+                Application.objects.exclude(extracted_resume="")
+                .only("id", "extracted_resume")
+                .iterator()
+            )
+            count = get_index("resumes").rebuild(
+                (application.id, embed_text(application.extracted_resume))
+                for application in applications
+            )
+            self.stdout.write(
+                f"Indexed {count} resumes in {time.perf_counter() - started:.2f}s"
+            )
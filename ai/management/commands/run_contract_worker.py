@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ai.tasks import claim_next_contract_task, run_contract_task
+
+
+class Command(BaseCommand):
+    help = "Process queued contract generation tasks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue once and exit instead of polling forever.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Seconds to sleep between polls when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            task_id = claim_next_contract_task()
+            if task_id is None:
+                if options["once"]:
+                    return
+                time.sleep(options["interval"])
+                continue
+
+            self.stdout.write(f"Running contract task {task_id}")
+            try:
+                run_contract_task(task_id, claimed=True)
+            except Exception as e:
+                self.stderr.write(f"Contract task {task_id} failed: {str(e)}")
@@ -0,0 +1,146 @@
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ai.llm_replay import completion_dict, load_recording, request_key, stream_chunks
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """
+    OpenAI-compatible /chat/completions endpoint that serves recorded
+    responses, with artificial latency and token-by-token streaming.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    # Set by the command
+    options = {}
+
+    def log_message(self, format, *args):
+        if self.options.get("verbosity", 1) > 1:
+            super().log_message(format, *args)
+
+    def do_POST(self):
+        if self.path.rstrip("/") not in ("/chat/completions", "/v1/chat/completions"):
+            self.send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self.send_json(400, {"error": {"message": "Invalid JSON body"}})
+            return
+
+        response = load_recording(request, self.options["recordings"])
+        if response is None:
+            if not self.options["fallback"]:
+                self.send_json(
+                    404,
+                    {
+                        "error": {
+                            "message": f"No recording for request {request_key(request)[:12]}"
+                        }
+                    },
+                )
+                return
+            response = self.fallback_response(request)
+
+        time.sleep(self.options["latency_ms"] / 1000)
+        if request.get("stream"):
+            include_usage = bool(
+                (request.get("stream_options") or {}).get("include_usage")
+            )
+            self.send_stream(stream_chunks(response, include_usage))
+        else:
+            self.send_json(200, response)
+
+    def fallback_response(self, request):
+        is_json = (request.get("response_format") or {}).get("type") == "json_object"
+        return completion_dict(
+            request.get("model", ""),
+            "{}" if is_json else "Stand-in response.",
+            {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        )
+
+    def send_json(self, status_code, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_stream(self, chunks):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        delay = 1 / self.options["tokens_per_second"]
+        for chunk in chunks:
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            if chunk["choices"] and chunk["choices"][0]["delta"].get("content"):
+                time.sleep(delay)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a local OpenAI-compatible server that replays recorded LLM "
+        "responses (record them with LLM_REPLAY_MODE=record)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--recordings",
+            default=settings.LLM_REPLAY_DIR,
+            help="Directory of recorded responses (defaults to LLM_REPLAY_DIR).",
+        )
+        parser.add_argument(
+            "--latency-ms",
+            type=float,
+            default=300,
+            help="Delay before each response starts.",
+        )
+        parser.add_argument(
+            "--tokens-per-second",
+            type=float,
+            default=50,
+            help="Pace of streamed responses.",
+        )
+        parser.add_argument(
+            "--fallback",
+            action="store_true",
+            help="Answer unrecorded requests with a placeholder instead of a 404.",
+        )
+
+    def handle(self, *args, **options):
+        StandinHandler.options = {
+            "recordings": options["recordings"],
+            "latency_ms": options["latency_ms"],
+            "tokens_per_second": max(options["tokens_per_second"], 0.001),
+            "fallback": options["fallback"],
+            "verbosity": options["verbosity"],
+        }
+        server = ThreadingHTTPServer((options["host"], options["port"]), StandinHandler)
+        server.daemon_threads = True
+        self.stdout.write(
+            f"LLM stand-in on http://{options['host']}:{options['port']} "
+            f"serving {options['recordings']}; set "
+            f"OPENAI_ENDPOINT=http://{options['host']}:{options['port']}"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ai.tasks import claim_next_job_moderation, run_job_moderation
+
+
+class Command(BaseCommand):
+    help = "Moderate job listings published in async moderation mode."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue once and exit instead of polling forever.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Seconds to sleep between polls when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            job_id = claim_next_job_moderation()
+            if job_id is None:
+                if options["once"]:
+                    return
+                time.sleep(options["interval"])
+                continue
+
+            self.stdout.write(f"Moderating job listing {job_id}")
+            try:
+                run_job_moderation(job_id, claimed=True)
+            except Exception as e:
+                self.stderr.write(f"Moderation of job {job_id} failed: {str(e)}")
+                # The listing went back to the queue; don't spin on it
+                time.sleep(options["interval"])
@@ -0,0 +1,198 @@
+import hashlib
+import threading
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+import markdown
+from django.conf import settings
+
+from ai.llm_cache import LRUCache
+
+ALLOWED_TAGS = {
+    "a",
+    "b",
+    "blockquote",
+    "br",
+    "code",
+    "em",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "hr",
+    "i",
+    "li",
+    "ol",
+    "p",
+    "pre",
+    "strong",
+    "ul",
+}
+VOID_TAGS = {"br", "hr"}
+ALLOWED_ATTRIBUTES = {"a": {"href", "title"}}
+SAFE_URL_SCHEMES = {"", "http", "https", "mailto"}
+# Tags dropped together with everything inside them
+DROPPED_CONTENT_TAGS = {"script", "style", "iframe", "object", "embed", "template"}
+
+
+class _Sanitizer(HTMLParser):
+    """
+    Single-pass allowlist sanitiser. Disallowed tags are removed but their
+    text is kept, attributes outside the allowlist are dropped, and any
+    tags left open are closed at the end.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.output = []
+        self.open_tags = []
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROPPED_CONTENT_TAGS:
+            self.skip_depth += 1
+            return
+        if self.skip_depth or tag not in ALLOWED_TAGS:
+            return
+
+        allowed = ALLOWED_ATTRIBUTES.get(tag, set())
+        rendered = ""
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name == "href" and not _is_safe_url(value):
+                continue
+            rendered += f' {name}="{escape(value)}"'
+
+        if tag in VOID_TAGS:
+            self.output.append(f"<{tag}{rendered} />")
+        else:
+            self.output.append(f"<{tag}{rendered}>")
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self.open_tags and self.open_tags[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROPPED_CONTENT_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+            return
+        if self.skip_depth or tag not in self.open_tags:
+            return
+        # Close anything left open inside this tag first
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.output.append(f"</{open_tag}>")
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.output.append(escape(data, quote=False))
+
+    def result(self):
+        self.close()
+        while self.open_tags:
+            self.output.append(f"</{self.open_tags.pop()}>")
+        return "".join(self.output)
+
+
+def _is_safe_url(url):
+    try:
+        return urlsplit(url.strip()).scheme.lower() in SAFE_URL_SCHEMES
+    except ValueError:
+        return False
+
+
+def sanitize_html(html):
+    """Strip everything outside the tag and attribute allowlists."""
+    sanitizer = _Sanitizer()
+    sanitizer.feed(html)
+    return sanitizer.result()
+
+
+def strip_code_fences(text):
+    """Remove a ``` fence (with or without a language) wrapped around the text."""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rstrip()
+        if text.endswith("```"):
+            text = text[:-3]
+    return text
+
+
+_local = threading.local()
+
+
+def _get_converter():
+    # Markdown instances are not thread-safe, so each thread reuses its own
+    if not hasattr(_local, "converter"):
+        _local.converter = markdown.Markdown()
+    return _local.converter
+
+
+def markdown_to_html(text):
+    """Convert markdown to sanitised HTML, without caching."""
+    converter = _get_converter()
+    try:
+        return sanitize_html(converter.convert(strip_code_fences(text)))
+    finally:
+        converter.reset()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LRUCache(settings.MARKDOWN_RENDER_CACHE_ENTRIES)
+    return _cache
+
+
+def render_markdown(text):
+    """
+    Render generated markdown into the HTML returned to the frontend.
+
+    Args:
+        text (str): Markdown, optionally wrapped in a ``` code fence
+
+    Returns:
+        str: Sanitised HTML, cached by a hash of the input
+    """
+    if not text:
+        return ""
+
+    key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    html = _get_cache().get(key)
+    with _cache_lock:
+        _stats["hits" if html is not None else "misses"] += 1
+    if html is not None:
+        return html
+
+    html = markdown_to_html(text)
+    _get_cache().set(key, html, settings.MARKDOWN_RENDER_CACHE_TTL)
+    return html
+
+
+def get_stats():
+    with _cache_lock:
+        stats = dict(_stats)
+    stats["entries"] = len(_get_cache())
+    return stats
+
+
+def clear():
+    _get_cache().clear()
+    with _cache_lock:
+        _stats.update(hits=0, misses=0)
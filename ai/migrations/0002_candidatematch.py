@@ -0,0 +1,33 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai', '0001_initial'),
+        ('applications', '0006_rename_resume_text_application_extracted_resume'),
+        ('jobs', '0013_alter_joblisting_job_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_version', models.CharField(max_length=64)),
+                ('match_score', models.FloatField(blank=True, null=True)),
+                ('lexical_score', models.FloatField(blank=True, null=True)),
+                ('match_reasons', models.JSONField(blank=True, default=list)),
+                ('gaps', models.JSONField(blank=True, default=list)),
+                ('scored_at', models.DateTimeField(auto_now=True)),
+                ('application', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='candidate_match', to='applications.application')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='candidate_matches', to='jobs.joblisting')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['job', 'job_version', '-match_score'], name='ai_match_job_score_idx')],
+            },
+        ),
+    ]
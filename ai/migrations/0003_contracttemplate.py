@@ -0,0 +1,28 @@
+# Generated by Django 5.1.5 on 2026-10-18 14:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai', '0002_candidatematch'),
+        ('jobs', '0014_joblisting_moderation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContractTemplate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(max_length=64)),
+                ('markdown', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='contract_templates', to='jobs.joblisting')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('job', 'version'), name='ai_contract_template_version_uniq')],
+            },
+        ),
+    ]
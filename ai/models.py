@@ -0,0 +1,111 @@
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+
+class ContractTask(models.Model):
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    application = models.ForeignKey(
+        "applications.Application",
+        on_delete=models.CASCADE,
+        related_name="contract_tasks",
+    )
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="contract_tasks",
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="queued")
+    stage = models.CharField(max_length=50, default="queued")
+    progress = models.PositiveSmallIntegerField(default=0)
+    start_date = models.DateField()
+    end_date = models.DateField(null=True, blank=True)
+    terms = models.TextField(blank=True, default="")
+    contract_url = models.CharField(max_length=255, blank=True, default="")
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="ai_contract_status_idx")
+        ]
+
+    def __str__(self):
+        return f"Contract task {self.id} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in ("completed", "failed")
+
+
+class CandidateMatch(models.Model):
+    """
+    Stored recommender result for one application.
+
+    `job_version` is a hash of the job text the score was computed against;
+    when the job changes, stored matches no longer apply and are re-scored.
+    Only applications the model scored are stored; `lexical_score` is the
+    raw BM25 score, scaled against the other stored matches when read.
+    """
+
+    application = models.OneToOneField(
+        "applications.Application",
+        on_delete=models.CASCADE,
+        related_name="candidate_match",
+    )
+    job = models.ForeignKey(
+        "jobs.JobListing", on_delete=models.CASCADE, related_name="candidate_matches"
+    )
+    job_version = models.CharField(max_length=64)
+    match_score = models.FloatField(null=True, blank=True)
+    lexical_score = models.FloatField(null=True, blank=True)
+    match_reasons = models.JSONField(default=list, blank=True)
+    gaps = models.JSONField(default=list, blank=True)
+    scored_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["job", "job_version", "-match_score"],
+                name="ai_match_job_score_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"Match for application {self.application_id}: {self.match_score}"
+
+
+class ContractTemplate(models.Model):
+    """
+    Contract body generated once per job and terms.
+
+    `version` is a hash of the job and employer fields the body depends on.
+    Employee-specific details are left as {{PLACEHOLDERS}} in `markdown` and
+    filled in locally for each hire.
+    """
+
+    job = models.ForeignKey(
+        "jobs.JobListing", on_delete=models.CASCADE, related_name="contract_templates"
+    )
+    version = models.CharField(max_length=64)
+    markdown = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["job", "version"], name="ai_contract_template_version_uniq"
+            )
+        ]
+
+    def __str__(self):
+        return f"Contract template for job {self.job_id} ({self.version[:8]})"
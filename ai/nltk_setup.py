@@ -1,21 +1,67 @@
-import nltk
-
-
-def download_nltk_data():
-    """Download necessary NLTK data."""
-    try:
-        nltk.data.find("tokenizers/punkt")
-    except LookupError:
-        nltk.download("punkt")
-    try:
-        nltk.data.find("corpora/stopwords")
-    except LookupError:
-        nltk.download("stopwords")
-    try:
-        nltk.data.find("tokenizers/punkt_tab")
-    except LookupError:
-        nltk.download("punkt_tab")
-
-
-if __name__ == "__main__":
-    download_nltk_data()
+import os
+import threading
+
+from django.conf import settings
+
+# Resource name -> path nltk.data.find() looks up.
+NLTK_RESOURCES = {
+    "punkt": "tokenizers/punkt",
+    "stopwords": "corpora/stopwords",
+    "punkt_tab": "tokenizers/punkt_tab",
+}
+
+_resolved = set()
+_lock = threading.Lock()
+
+
+def _data_path():
+    """Put the vendored data directory first on NLTK's search path."""
+    import nltk
+
+    data_dir = str(settings.NLTK_DATA_DIR)
+    if data_dir not in nltk.data.path:
+        nltk.data.path.insert(0, data_dir)
+    return nltk
+
+
+def ensure_nltk_resources(*names):
+    """
+    Make sure NLTK resources are available before first use.
+
+    Lookups happen once per process. Missing resources are only downloaded
+    when NLTK_ALLOW_DOWNLOAD is set; otherwise a LookupError points at
+    `manage.py bundle_nltk_data`.
+    """
+    missing = [name for name in names if name not in _resolved]
+    if not missing:
+        return
+
+    with _lock:
+        nltk = _data_path()
+        for name in missing:
+            if name in _resolved:
+                continue
+            try:
+                nltk.data.find(NLTK_RESOURCES[name])
+            except LookupError:
+                if not settings.NLTK_ALLOW_DOWNLOAD:
+                    raise LookupError(
+                        f"NLTK resource '{name}' not found. Run "
+                        "`python manage.py bundle_nltk_data` to vendor it into "
+                        f"{settings.NLTK_DATA_DIR}."
+                    )
+                nltk.download(
+                    name, download_dir=str(settings.NLTK_DATA_DIR), quiet=True
+                )
+            _resolved.add(name)
+
+
+def download_nltk_data(download_dir=None):
+    """Download every resource the app uses into the vendored data directory."""
+    nltk = _data_path()
+    download_dir = str(download_dir or settings.NLTK_DATA_DIR)
+    os.makedirs(download_dir, exist_ok=True)
+    return {
+        name: nltk.download(name, download_dir=download_dir, quiet=True)
+        for name in NLTK_RESOURCES
+    }
@@ -0,0 +1,217 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.db.models import Max
+
+from ai.candidate_recommender import recommend_best_candidate
+from ai.embeddings import semantic_application_ids
+from ai.lexical_ranker import prerank_applications
+from ai.models import CandidateMatch
+from applications.models import Application
+
+
+def job_version_hash(job):
+    """Hash the parts of a job that recommendation scores depend on."""
+    payload = json.dumps(
+        [
+            job.title,
+            job.description,
+            job.responsibilities,
+            job.required_qualifications,
+            job.preferred_qualifications,
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _application_payload(application):
+    return {
+        "id": application.id,
+        "candidate": application.candidate_id,
+        "candidate_name": application.candidate.name,
+        "candidate_username": application.candidate.username,
+        "job_title": application.job.title,
+        "status": application.application_status,
+        "resume": application.resume,
+        "extracted_resume": application.extracted_resume,
+        "resume_sections": application.resume_sections,
+    }
+
+
+def _score_applications(job, applications, stored_ids, version, batched):
+    """
+    Pre-rank the whole pool, score the top candidates that have no stored
+    match yet and persist one CandidateMatch for each of them. Candidates
+    outside the top are not stored, so they are ranked again as the pool
+    changes.
+
+    The top is the best BM25 matches plus the applicants whose resumes are
+    nearest the job in the resume embedding index, which catches resumes
+    that describe the same skills in different words.
+    """
+    payloads = [_application_payload(application) for application in applications]
+    kept = prerank_applications(payloads, job, settings.RECOMMENDER_PRERANK_TOP_N)
+    semantic_added = 0
+    if settings.EMBEDDING_INDEX_ENABLED and payloads:
+        by_id = {app["id"]: app for app in payloads}
+        kept_ids = {app["id"] for app in kept}
+        for application_id in semantic_application_ids(
+            job, list(by_id), settings.RECOMMENDER_SEMANTIC_TOP_N
+        ):
+            if application_id not in kept_ids:
+                kept.append(by_id[application_id])
+                semantic_added += 1
+    to_score = [app for app in kept if app["id"] not in stored_ids]
+
+    result = {"recommendations": [], "metadata": {}}
+    if to_score:
+        # Ask for every candidate so each one gets a stored score.
+        result = recommend_best_candidate(
+            to_score,
+            job.description,
+            job.preferred_qualifications,
+            job.required_qualifications,
+            job.responsibilities,
+            limit=len(to_score),
+            minimum_score=0,
+            batched=batched,
+        )
+
+    scored = {
+        str(r.get("application_id")): r for r in result.get("recommendations", [])
+    }
+    # When a batch failed we can't tell which candidates it dropped, so only
+    # store what the model actually returned and retry the rest next time.
+    complete = "error_details" not in result.get("metadata", {})
+
+    matches = []
+    for app in to_score:
+        recommendation = scored.get(str(app["id"]))
+        if recommendation is None and not complete:
+            continue
+        matches.append(
+            CandidateMatch(
+                application_id=app["id"],
+                job=job,
+                job_version=version,
+                match_score=recommendation["match_score"] if recommendation else 0,
+                lexical_score=app["bm25_score"],
+                match_reasons=(
+                    recommendation.get("match_reasons", []) if recommendation else []
+                ),
+                gaps=recommendation.get("gaps", []) if recommendation else [],
+            )
+        )
+
+    CandidateMatch.objects.bulk_create(
+        matches,
+        update_conflicts=True,
+        unique_fields=["application"],
+        update_fields=[
+            "job",
+            "job_version",
+            "match_score",
+            "lexical_score",
+            "match_reasons",
+            "gaps",
+            "scored_at",
+        ],
+    )
+
+    metadata = result.get("metadata", {})
+    metadata["prerank"] = {
+        "candidates_received": len(payloads),
+        "candidates_kept": len(kept),
+        "candidates_added_semantically": semantic_added,
+        "candidates_sent_to_model": len(to_score),
+    }
+    metadata["newly_scored"] = len(matches)
+    return metadata
+
+
+def recommend_for_job(
+    job, application_ids, limit=5, minimum_score=70, refresh=False, batched=None
+):
+    """
+    Return recommendations for a job. The pool is pre-ranked on every call
+    and only top candidates without a stored match for the current job
+    version are sent to the model (all of them when `refresh` is set or the
+    job text has changed).
+
+    Returns:
+        dict: Recommendations and metadata in the recommender's format
+    """
+    started = time.perf_counter()
+    version = job_version_hash(job)
+
+    applications = Application.objects.filter(
+        job=job, id__in=application_ids
+    ).select_related("candidate", "job")
+    stored_ids = set()
+    if not refresh:
+        stored_ids = set(
+            CandidateMatch.objects.filter(
+                application__in=applications,
+                job_version=version,
+                match_score__isnull=False,
+            ).values_list("application_id", flat=True)
+        )
+
+    run_metadata = _score_applications(
+        job, list(applications), stored_ids, version, batched
+    )
+
+    stored = CandidateMatch.objects.filter(
+        application__in=applications,
+        job_version=version,
+        match_score__isnull=False,
+    )
+    # lexical_score is stored as raw BM25 and scaled to the best stored
+    # match when read, so scores from different runs stay comparable
+    best_lexical = stored.aggregate(best=Max("lexical_score"))["best"] or 0
+    matches = (
+        stored.filter(match_score__gte=minimum_score)
+        .select_related("application__candidate")
+        .order_by("-match_score")[:limit]
+    )
+
+    recommendations = []
+    for rank, match in enumerate(matches, start=1):
+        application = match.application
+        recommendations.append(
+            {
+                "rank": rank,
+                "candidate_id": application.candidate_id,
+                "application_id": application.id,
+                "candidate_name": application.candidate.name,
+                "candidate_username": application.candidate.username,
+                "application_status": application.application_status,
+                "match_score": match.match_score,
+                "lexical_score": (
+                    round(match.lexical_score / best_lexical * 100, 1)
+                    if match.lexical_score is not None and best_lexical > 0
+                    else match.lexical_score
+                ),
+                "match_reasons": match.match_reasons,
+                "gaps": match.gaps,
+                "scored_at": match.scored_at,
+            }
+        )
+
+    metadata = {
+        "total_candidates_evaluated": len(applications),
+        "newly_scored": run_metadata.get("newly_scored", 0),
+        "reused_scores": len(stored_ids),
+        "job_version": version,
+        "job_description_summary": run_metadata.get("job_description_summary", ""),
+        "processing_time_ms": round((time.perf_counter() - started) * 1000),
+    }
+    for key in ("prerank", "batches", "resume_tokens_saved", "error_details"):
+        if key in run_metadata:
+            metadata[key] = run_metadata[key]
+
+    return {"recommendations": recommendations, "metadata": metadata}
@@ -0,0 +1,223 @@
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+
+from django.conf import settings
+
+# Local stand-in for the model tokenizer: words, numbers and individual
+# punctuation marks. Close enough to BPE counts for budgeting prompts.
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+SECTION_ALIASES = {
+    "summary": [
+        "summary",
+        "profile",
+        "professional summary",
+        "about me",
+        "objective",
+        "career objective",
+    ],
+    "skills": [
+        "skills",
+        "technical skills",
+        "core skills",
+        "key skills",
+        "core competencies",
+        "technologies",
+        "tools",
+    ],
+    "experience": [
+        "experience",
+        "work experience",
+        "professional experience",
+        "employment",
+        "employment history",
+        "work history",
+    ],
+    "education": [
+        "education",
+        "academic background",
+        "qualifications",
+        "academic qualifications",
+    ],
+    "projects": ["projects", "personal projects", "key projects"],
+    "certifications": ["certifications", "certificates", "licenses", "courses"],
+    "languages": ["languages"],
+    "awards": ["awards", "achievements", "honors", "honours"],
+    "interests": ["interests", "hobbies"],
+    "references": ["references"],
+}
+SECTION_HEADINGS = {
+    alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases
+}
+
+# Sections dropped first when a resume is over budget (first = dropped first).
+TRIM_ORDER = [
+    "references",
+    "interests",
+    "awards",
+    "languages",
+    "other",
+    "projects",
+    "certifications",
+    "summary",
+    "education",
+    "experience",
+    "skills",
+]
+
+PAGE_NUMBER_PATTERN = re.compile(r"^(page\s*)?\d+(\s*(of|/)\s*\d+)?$", re.IGNORECASE)
+BOILERPLATE_PATTERN = re.compile(
+    r"^(curriculum vitae|resume|r[ée]sum[ée]|references available upon request\.?)$",
+    re.IGNORECASE,
+)
+
+_stats = defaultdict(lambda: {"calls": 0, "original_tokens": 0, "compact_tokens": 0})
+_stats_lock = threading.Lock()
+
+
+def count_tokens(text):
+    """Count prompt tokens locally (see TOKEN_PATTERN)."""
+    return len(TOKEN_PATTERN.findall(text or ""))
+
+
+def clean_text(text):
+    """
+    Normalise PDF-extraction noise: odd unicode spaces, words hyphenated
+    across line breaks, runs of whitespace and page-number lines.
+    """
+    text = unicodedata.normalize("NFKC", text or "")
+    text = text.replace("\u00ad", "")
+    # "develop-\nment" -> "development"
+    text = re.sub(r"(\w)-\n(\w)", r"\1\2", text)
+
+    lines = []
+    for line in text.splitlines():
+        line = re.sub(r"[ \t\f\v]+", " ", line).strip(" •·▪-*|")
+        line = line.strip()
+        if (
+            not line
+            or PAGE_NUMBER_PATTERN.match(line)
+            or BOILERPLATE_PATTERN.match(line)
+        ):
+            continue
+        lines.append(line)
+    return lines
+
+
+def _heading(line):
+    """Return the section a heading line starts, or None."""
+    if len(line) > 40:
+        return None
+    key = re.sub(r"[^a-z ]", "", line.lower()).strip()
+    return SECTION_HEADINGS.get(key)
+
+
+def split_sections(lines):
+    """
+    Group cleaned lines under the section headings they follow. Lines that
+    repeat anywhere in the resume (page headers, footers, copy-paste) are
+    kept only once.
+
+    Returns:
+        list: (section name, lines) pairs in document order
+    """
+    sections = [["other", []]]
+    seen = set()
+    for line in lines:
+        section = _heading(line)
+        if section:
+            sections.append([section, []])
+            continue
+        key = line.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        sections[-1][1].append(line)
+    return [(name, body) for name, body in sections if body]
+
+
+def _trim_to_budget(sections, budget):
+    """Drop trailing lines from the least important sections until it fits."""
+    line_tokens = [[count_tokens(line) for line in body] for _, body in sections]
+    # Each section heading costs a couple of tokens too
+    total = sum(sum(tokens) + 2 for tokens in line_tokens)
+    priority = {name: index for index, name in enumerate(TRIM_ORDER)}
+    order = sorted(range(len(sections)), key=lambda i: priority.get(sections[i][0], 0))
+
+    for index in order:
+        body = sections[index][1]
+        tokens = line_tokens[index]
+        while total > budget and body:
+            body.pop()
+            total -= tokens.pop()
+        if not body:
+            total -= 2
+        if total <= budget:
+            break
+    return [(name, body) for name, body in sections if body]
+
+
+def compact_resume(text, token_budget=None, source="default", sections=None):
+    """
+    Clean, deduplicate and section a resume, then trim it to a token budget.
+
+    Args:
+        text (str): Raw extracted resume text
+        token_budget (int): Maximum tokens to keep, defaults to
+            RESUME_TOKEN_BUDGET
+        source (str): Caller name the savings are recorded under
+        sections (list): (section name, lines) pairs already split from
+            `text` at upload; the text is only split again without them
+
+    Returns:
+        dict: "text", "sections" (name -> text), "original_tokens",
+            "compact_tokens" and "tokens_saved"
+    """
+    budget = token_budget or settings.RESUME_TOKEN_BUDGET
+    original_tokens = count_tokens(text)
+
+    if sections is None:
+        sections = split_sections(clean_text(text))
+    else:
+        # Trimming pops lines; leave the caller's lists alone
+        sections = [(name, list(lines)) for name, lines in sections]
+    sections = _trim_to_budget(sections, budget)
+
+    parts = []
+    section_text = {}
+    for name, body in sections:
+        body_text = "\n".join(body)
+        section_text[name] = (
+            section_text[name] + "\n" + body_text if name in section_text else body_text
+        )
+        parts.append(body_text if name == "other" else f"{name.title()}:\n{body_text}")
+    compact = "\n\n".join(parts)
+    compact_tokens = count_tokens(compact)
+
+    with _stats_lock:
+        stats = _stats[source]
+        stats["calls"] += 1
+        stats["original_tokens"] += original_tokens
+        stats["compact_tokens"] += compact_tokens
+
+    return {
+        "text": compact,
+        "sections": section_text,
+        "original_tokens": original_tokens,
+        "compact_tokens": compact_tokens,
+        "tokens_saved": max(original_tokens - compact_tokens, 0),
+    }
+
+
+def get_stats():
+    """Cumulative token savings per caller since process start."""
+    with _stats_lock:
+        return {
+            source: {
+                **stats,
+                "tokens_saved": stats["original_tokens"] - stats["compact_tokens"],
+            }
+            for source, stats in _stats.items()
+        }
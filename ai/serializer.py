@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from .models import ContractTask
 
 
 class GenerateContractSerializer(serializers.Serializer):
@@ -10,6 +11,25 @@ class GenerateContractSerializer(serializers.Serializer):
     )
 
 
+class ContractTaskSerializer(serializers.ModelSerializer):
+    task_id = serializers.UUIDField(source="id", read_only=True)
+
+    class Meta:
+        model = ContractTask
+        fields = [
+            "task_id",
+            "application",
+            "status",
+            "stage",
+            "progress",
+            "contract_url",
+            "error",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
 class GenerateJobListing(serializers.Serializer):
     job_title = serializers.CharField(max_length=255, required=False, allow_blank=True)
     company = serializers.CharField(max_length=255, required=False, allow_blank=True)
@@ -42,3 +62,5 @@ class GenerateBlogSerializer(serializers.Serializer):
 class BestCandidateSerializer(serializers.Serializer):
     applications = serializers.ListField()
     job_id = serializers.IntegerField()
+    batched = serializers.BooleanField(required=False, allow_null=True, default=None)
+    refresh = serializers.BooleanField(required=False, default=False)
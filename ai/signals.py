@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ai.embeddings import get_index, index_application, index_job
+from applications.models import Application
+from jobs.models import JobListing
+
+
+# Index writes happen after commit so a rolled-back save never leaves a
+# vector behind.
+
+JOB_TEXT_FIELDS = {
+    "title",
+    "company",
+    "location",
+    "description",
+    "responsibilities",
+    "required_qualifications",
+    "preferred_qualifications",
+}
+
+
+@receiver(post_save, sender=JobListing)
+def update_job_embedding(sender, instance, update_fields=None, **kwargs):
+    # Saves that only touch counters or status don't change the embedding
+    if update_fields and not JOB_TEXT_FIELDS.intersection(update_fields):
+        return
+    if settings.EMBEDDING_INDEX_ENABLED:
+        transaction.on_commit(lambda: index_job(instance))
+
+
+@receiver(post_delete, sender=JobListing)
+def remove_job_embedding(sender, instance, **kwargs):
+    if settings.EMBEDDING_INDEX_ENABLED:
+        job_id = instance.id
+        transaction.on_commit(lambda: get_index("jobs").remove(job_id))
+
+
+@receiver(post_save, sender=Application)
+def update_resume_embedding(sender, instance, update_fields=None, **kwargs):
+    if update_fields and "extracted_resume" not in update_fields:
+        return
+    if settings.EMBEDDING_INDEX_ENABLED:
+        transaction.on_commit(lambda: index_application(instance))
+
+
+@receiver(post_delete, sender=Application)
+def remove_resume_embedding(sender, instance, **kwargs):
+    if settings.EMBEDDING_INDEX_ENABLED:
+        application_id = instance.id
+        transaction.on_commit(lambda: get_index("resumes").remove(application_id))
@@ -0,0 +1,48 @@
+import json
+
+from django.http import StreamingHttpResponse
+
+
+def wants_stream(request):
+    """Return True if the client asked for a server-sent-event response."""
+    value = request.query_params.get("stream") or request.data.get("stream")
+    return str(value).lower() in ("1", "true", "yes")
+
+
+def sse_event(event, data):
+    """Format a single server-sent event with a JSON encoded payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def sse_response(tokens, finalize):
+    """
+    Build a streaming SSE response.
+
+    Every text delta from `tokens` is forwarded as a `token` event while it
+    arrives. Once the stream is exhausted, `finalize` is called with the full
+    text and its return value is sent as the closing `done` event. Failures
+    are reported as an `error` event, since the status line is already sent.
+
+    Args:
+        tokens (iterable): Iterable of text deltas
+        finalize (callable): Turns the full text into the closing payload
+
+    Returns:
+        StreamingHttpResponse: A text/event-stream response
+    """
+
+    def event_stream():
+        parts = []
+        try:
+            for token in tokens:
+                parts.append(token)
+                yield sse_event("token", {"content": token})
+            yield sse_event("done", finalize("".join(parts)))
+        except Exception as e:
+            yield sse_event("error", {"error": str(e)})
+
+    response = StreamingHttpResponse(event_stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx from buffering the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,330 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ai.contract_generator import generate_contract
+from ai.job_filter import job_filtering
+from ai.models import ContractTask
+from core.tasks import run_in_background
+from emails.email import send_contract_email
+from jobs.models import JobListing
+
+
+def build_contract_data(application, employer, start_date, end_date=None, terms=""):
+    """Collect everything the contract generator needs from an application."""
+    job = application.job
+    employee = application.candidate
+
+    contract_data = {
+        "employer_name": employer.name,
+        "employer_address": job.location,
+        "employee_name": employee.name,
+        "employee_address": (
+            employee.address
+            if hasattr(employee, "address") and employee.address
+            else "Address to be provided"
+        ),
+        "company_name": job.company,
+        "job_title": job.title,
+        "start_date": start_date.strftime("%B %d, %Y"),
+        "salary": job.salary,
+        "responsibilities": (
+            ", ".join(job.responsibilities)
+            if isinstance(job.responsibilities, list)
+            else str(job.responsibilities)
+        ),
+        "benefits": (
+            ", ".join(job.benefits)
+            if isinstance(job.benefits, list)
+            else str(job.benefits)
+        ),
+        "terms": terms,
+    }
+
+    # Add end date if provided
+    if end_date:
+        contract_data["end_date"] = end_date.strftime("%B %d, %Y")
+
+    return contract_data
+
+
+def enqueue_contract_task(application, employer, start_date, end_date=None, terms=""):
+    """
+    Create a queued contract task and hand it to the background pool.
+
+    If CONTRACT_TASKS_RUN_INLINE is disabled the task is left queued for the
+    `run_contract_worker` management command to pick up.
+    """
+    task = ContractTask.objects.create(
+        application=application,
+        requested_by=employer,
+        start_date=start_date,
+        end_date=end_date,
+        terms=terms,
+    )
+    if settings.CONTRACT_TASKS_RUN_INLINE:
+        run_in_background(run_contract_task, task.id)
+        # With no worker running, this is where tasks abandoned by a dead
+        # process get picked up again
+        for task_id in requeue_stale_contract_tasks():
+            run_in_background(run_contract_task, task_id)
+    return task
+
+
+def stale_contract_tasks():
+    """
+    Running tasks whose progress hasn't moved for CONTRACT_TASK_STALE_AFTER
+    seconds; the process running them most likely died.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.CONTRACT_TASK_STALE_AFTER)
+    return Q(status="running", updated_at__lt=cutoff)
+
+
+def claim_contract_task(task_id):
+    """Atomically move a task from queued to running. Returns False if taken."""
+    return (
+        ContractTask.objects.filter(id=task_id, status="queued").update(
+            status="running", stage="starting", progress=5, updated_at=timezone.now()
+        )
+        == 1
+    )
+
+
+def requeue_stale_contract_tasks():
+    """
+    Put stale running tasks back in the queue. Returns the ids of the tasks
+    this call requeued.
+    """
+    requeued = []
+    stale_ids = ContractTask.objects.filter(stale_contract_tasks()).values_list(
+        "id", flat=True
+    )
+    for task_id in list(stale_ids):
+        # Conditional, so concurrent sweeps requeue each task only once
+        if ContractTask.objects.filter(stale_contract_tasks(), id=task_id).update(
+            status="queued", stage="queued", progress=0, updated_at=timezone.now()
+        ):
+            requeued.append(task_id)
+    return requeued
+
+
+def claim_next_contract_task():
+    """
+    Claim the oldest queued (or stale running) task, skipping rows other
+    workers have locked.
+    """
+    with transaction.atomic():
+        task = (
+            ContractTask.objects.select_for_update(skip_locked=True)
+            .filter(Q(status="queued") | stale_contract_tasks())
+            .order_by("created_at")
+            .first()
+        )
+        if task is None:
+            return None
+        task.status = "running"
+        task.stage = "starting"
+        task.progress = 5
+        task.save(update_fields=["status", "stage", "progress", "updated_at"])
+    return task.id
+
+
+def _set_progress(task, stage, progress):
+    task.stage = stage
+    task.progress = progress
+    task.save(update_fields=["stage", "progress", "updated_at"])
+
+
+def run_contract_task(task_id, claimed=False):
+    """
+    Run the contract pipeline for a task: generate the document, upload it,
+    store the URL on the application and email the candidate.
+    """
+    if not claimed and not claim_contract_task(task_id):
+        return
+
+    task = ContractTask.objects.select_related(
+        "application__job", "application__candidate", "requested_by"
+    ).get(id=task_id)
+    application = task.application
+
+    try:
+        _set_progress(task, "generating", 20)
+        contract_data = build_contract_data(
+            application, task.requested_by, task.start_date, task.end_date, task.terms
+        )
+        contract_url = generate_contract(
+            contract_data,
+            on_progress=lambda stage, progress: _set_progress(task, stage, progress),
+            job=application.job,
+        )
+
+        _set_progress(task, "saving", 80)
+        application.contract = contract_url
+        application.save(update_fields=["contract"])
+
+        _set_progress(task, "emailing", 90)
+        send_contract_email(
+            application.candidate.email,
+            contract_url,
+            application.job.company,
+            application.job.title,
+        )
+
+        task.status = "completed"
+        task.stage = "completed"
+        task.progress = 100
+        task.contract_url = contract_url
+        task.save(
+            update_fields=["status", "stage", "progress", "contract_url", "updated_at"]
+        )
+    except Exception as e:
+        task.status = "failed"
+        task.error = str(e)
+        task.save(update_fields=["status", "error", "updated_at"])
+        raise
+
+
+# job_filtering dict keys mapped to the JobListing fields they correct.
+MODERATED_JOB_FIELDS = {
+    "title": "title",
+    "location": "location",
+    "company": "company",
+    "experience": "experience_required",
+    "experience_level": "experience_level",
+    "salary": "salary",
+    "job_type": "job_type",
+    "job_location_type": "job_location_type",
+    "description": "description",
+    "responsibilities": "responsibilities",
+    "required_qualifications": "required_qualifications",
+    "preferred_qualifications": "preferred_qualifications",
+    "benefits": "benefits",
+}
+
+
+def job_listing_dict(job):
+    """Build the dict job_filtering expects from a saved listing."""
+    job_dict = {
+        key: getattr(job, field) for key, field in MODERATED_JOB_FIELDS.items()
+    }
+    job_dict["job_status"] = job.job_status
+    return job_dict
+
+
+def _moderation_cutoff():
+    return timezone.now() - timedelta(seconds=settings.JOB_MODERATION_STALE_AFTER)
+
+
+def stale_job_moderations():
+    """Listings claimed by a moderation run that never finished."""
+    return Q(moderation_status="in_review") & (
+        Q(moderation_started_at__lt=_moderation_cutoff())
+        | Q(moderation_started_at__isnull=True)
+    )
+
+
+def enqueue_job_moderation(job):
+    """
+    Hand a pending listing to the background pool. If
+    JOB_MODERATION_RUN_INLINE is disabled it waits for `run_moderation_worker`.
+    """
+    if settings.JOB_MODERATION_RUN_INLINE:
+        run_in_background(run_job_moderation, job.id)
+        # With no worker running, this is where listings whose moderation
+        # failed or died with its process get picked up again
+        for job_id in requeue_stale_job_moderations():
+            if job_id != job.id:
+                run_in_background(run_job_moderation, job_id)
+
+
+def requeue_stale_job_moderations():
+    """
+    Move stale in_review listings back to pending_review. Returns the ids of
+    those and of listings left pending for longer than
+    JOB_MODERATION_STALE_AFTER.
+    """
+    JobListing.objects.filter(stale_job_moderations()).update(
+        moderation_status="pending_review", moderation_started_at=None
+    )
+    return list(
+        JobListing.objects.filter(
+            moderation_status="pending_review", created_at__lt=_moderation_cutoff()
+        ).values_list("id", flat=True)
+    )
+
+
+def resubmit_job_moderation(job):
+    """
+    Send an edited listing back through moderation in the background, in
+    either moderation mode, so the edit never waits on the model. It is
+    hidden until approved again.
+    """
+    JobListing.objects.filter(id=job.id).update(
+        moderation_status="pending_review", moderation_started_at=None
+    )
+    job.moderation_status = "pending_review"
+    job.moderation_started_at = None
+    enqueue_job_moderation(job)
+
+
+def claim_job_moderation(job_id):
+    """Atomically move a listing from pending_review to in_review."""
+    return (
+        JobListing.objects.filter(id=job_id, moderation_status="pending_review").update(
+            moderation_status="in_review", moderation_started_at=timezone.now()
+        )
+        == 1
+    )
+
+
+def claim_next_job_moderation():
+    """
+    Claim the oldest pending (or stale in_review) listing, skipping rows
+    other workers have locked.
+    """
+    with transaction.atomic():
+        job = (
+            JobListing.objects.select_for_update(skip_locked=True)
+            .filter(Q(moderation_status="pending_review") | stale_job_moderations())
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+        job.moderation_status = "in_review"
+        job.moderation_started_at = timezone.now()
+        job.save(update_fields=["moderation_status", "moderation_started_at"])
+    return job.id
+
+
+def run_job_moderation(job_id, claimed=False):
+    """
+    Run job_filtering on a published listing, apply its corrections in place
+    and make the listing visible.
+    """
+    if not claimed and not claim_job_moderation(job_id):
+        return
+
+    job = JobListing.objects.get(id=job_id)
+    try:
+        filter_result = job_filtering(job_listing_dict(job))
+    except Exception:
+        # Put it back in the queue so a worker retries it
+        JobListing.objects.filter(id=job_id).update(moderation_status="pending_review")
+        raise
+
+    update_fields = ["moderation_status", "policy_violations"]
+    if not filter_result.get("approved", True):
+        for key, value in filter_result.get("modified_job", {}).items():
+            field = MODERATED_JOB_FIELDS.get(key)
+            if field:
+                setattr(job, field, value)
+                update_fields.append(field)
+
+    job.policy_violations = filter_result.get("policy_violations", [])
+    job.moderation_status = "approved"
+    job.save(update_fields=update_fields)
@@ -0,0 +1,331 @@
+import atexit
+import json
+import os
+import socket
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.conf import settings
+
+# Histogram bucket upper bounds; values above the last bound go to an
+# overflow bucket.
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 20000, 30000, 60000)
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+RETRY_BUCKETS = (0, 1, 2, 3, 5)
+
+HISTOGRAMS = {
+    "latency_ms": LATENCY_BUCKETS_MS,
+    "queue_wait_ms": LATENCY_BUCKETS_MS,
+    "first_token_ms": LATENCY_BUCKETS_MS,
+    "prompt_tokens": TOKEN_BUCKETS,
+    "completion_tokens": TOKEN_BUCKETS,
+    "retries": RETRY_BUCKETS,
+}
+
+# "hit": served from the response cache, "miss": cacheable but called the
+# model, "off": caching disabled for the call (or streamed).
+CACHE_STATES = ("hit", "miss", "off")
+
+
+class Histogram:
+    """Fixed-bucket histogram that can be serialised and merged."""
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given rank (max for overflow)."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                if index < len(self.bounds):
+                    return min(self.bounds[index], self.max)
+                return self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            "bounds": list(self.bounds),
+            "counts": list(self.counts),
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data["bounds"])
+        histogram.counts = list(data["counts"])
+        histogram.count = data["count"]
+        histogram.sum = data["sum"]
+        histogram.max = data["max"]
+        return histogram
+
+    def merge(self, other):
+        if other.bounds != self.bounds:
+            raise ValueError("Cannot merge histograms with different buckets")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+
+class CallStats:
+    """Telemetry for one (generator, model) pair."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.streamed = 0
+        self.cache = {state: 0 for state in CACHE_STATES}
+        self.histograms = {
+            name: Histogram(bounds) for name, bounds in HISTOGRAMS.items()
+        }
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "streamed": self.streamed,
+            "cache": dict(self.cache),
+            "histograms": {
+                name: histogram.to_dict() for name, histogram in self.histograms.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.calls = data["calls"]
+        stats.errors = data["errors"]
+        stats.streamed = data["streamed"]
+        stats.cache.update(data["cache"])
+        for name, histogram in data["histograms"].items():
+            stats.histograms[name] = Histogram.from_dict(histogram)
+        return stats
+
+    def merge(self, other):
+        self.calls += other.calls
+        self.errors += other.errors
+        self.streamed += other.streamed
+        for state, count in other.cache.items():
+            self.cache[state] = self.cache.get(state, 0) + count
+        for name, histogram in other.histograms.items():
+            if name in self.histograms:
+                self.histograms[name].merge(histogram)
+            else:
+                self.histograms[name] = histogram
+
+
+_stats = defaultdict(dict)  # generator -> model -> CallStats
+_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_last_flush = 0.0
+
+
+def record_call(
+    generator,
+    model,
+    latency_ms,
+    cache_state,
+    prompt_tokens=None,
+    completion_tokens=None,
+    retries=0,
+    queue_wait_ms=None,
+    first_token_ms=None,
+    error=False,
+    streamed=False,
+):
+    """
+    Record one model call. Token counts are left out of the histograms when
+    the response had no usage (cache hits, streams without usage).
+    """
+    if not settings.LLM_TELEMETRY_ENABLED:
+        return
+
+    with _lock:
+        stats = _stats[generator or "unknown"].get(model)
+        if stats is None:
+            stats = _stats[generator or "unknown"][model] = CallStats()
+        stats.calls += 1
+        stats.errors += int(error)
+        stats.streamed += int(streamed)
+        stats.cache[cache_state] += 1
+
+        histograms = stats.histograms
+        histograms["latency_ms"].observe(latency_ms)
+        histograms["retries"].observe(retries)
+        if queue_wait_ms is not None:
+            histograms["queue_wait_ms"].observe(queue_wait_ms)
+        if first_token_ms is not None:
+            histograms["first_token_ms"].observe(first_token_ms)
+        if prompt_tokens is not None:
+            histograms["prompt_tokens"].observe(prompt_tokens)
+        if completion_tokens is not None:
+            histograms["completion_tokens"].observe(completion_tokens)
+
+    _maybe_flush()
+
+
+def record_completion(generator, model, completion, **kwargs):
+    """record_call with token counts taken from `completion.usage`."""
+    usage = getattr(completion, "usage", None)
+    record_call(
+        generator,
+        model,
+        prompt_tokens=getattr(usage, "prompt_tokens", None),
+        completion_tokens=getattr(usage, "completion_tokens", None),
+        **kwargs,
+    )
+
+
+def snapshot():
+    """Raw telemetry of this process, serialisable to JSON."""
+    with _lock:
+        return {
+            generator: {model: stats.to_dict() for model, stats in models.items()}
+            for generator, models in _stats.items()
+        }
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+def _snapshot_path():
+    name = f"{socket.gethostname()}-{os.getpid()}.json"
+    return os.path.join(settings.LLM_TELEMETRY_DIR, name)
+
+
+def flush():
+    """Write this process's snapshot to LLM_TELEMETRY_DIR, if configured."""
+    global _last_flush
+    if not settings.LLM_TELEMETRY_DIR:
+        return
+    with _flush_lock:
+        _last_flush = time.monotonic()
+        os.makedirs(settings.LLM_TELEMETRY_DIR, exist_ok=True)
+        path = _snapshot_path()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"written_at": time.time(), "generators": snapshot()}, f)
+        os.replace(tmp_path, path)
+
+
+def _flush_at_exit():
+    if not _stats:
+        return
+    try:
+        flush()
+    except OSError:
+        pass
+
+
+atexit.register(_flush_at_exit)
+
+
+def _maybe_flush():
+    if (
+        settings.LLM_TELEMETRY_DIR
+        and time.monotonic() - _last_flush >= settings.LLM_TELEMETRY_FLUSH_INTERVAL
+    ):
+        try:
+            flush()
+        except OSError as e:
+            print(f"Telemetry flush error: {str(e)}")
+
+
+def load_snapshots():
+    """
+    Snapshots to aggregate: every worker's file in LLM_TELEMETRY_DIR written
+    within LLM_TELEMETRY_MAX_AGE seconds, or just this process when no
+    directory is configured.
+    """
+    if not settings.LLM_TELEMETRY_DIR:
+        return [snapshot()]
+
+    # Make sure this process's latest numbers are included
+    if _stats:
+        flush()
+    snapshots = []
+    oldest = time.time() - settings.LLM_TELEMETRY_MAX_AGE
+    for name in os.listdir(settings.LLM_TELEMETRY_DIR):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(settings.LLM_TELEMETRY_DIR, name)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if data.get("written_at", 0) >= oldest:
+            snapshots.append(data["generators"])
+    return snapshots
+
+
+def _summarise(stats):
+    histograms = {}
+    for name, histogram in stats.histograms.items():
+        if not histogram.count:
+            continue
+        histograms[name] = {
+            "count": histogram.count,
+            "total": round(histogram.sum, 1),
+            "mean": round(histogram.sum / histogram.count, 1),
+            "p50": round(histogram.percentile(0.5), 1),
+            "p95": round(histogram.percentile(0.95), 1),
+            "p99": round(histogram.percentile(0.99), 1),
+            "max": round(histogram.max, 1),
+        }
+
+    cacheable = stats.cache["hit"] + stats.cache["miss"]
+    return {
+        "calls": stats.calls,
+        "errors": stats.errors,
+        "streamed": stats.streamed,
+        "cache": dict(stats.cache),
+        "cache_hit_rate": (
+            round(stats.cache["hit"] / cacheable, 3) if cacheable else None
+        ),
+        **histograms,
+    }
+
+
+def get_metrics(snapshots=None):
+    """
+    Aggregate snapshots into per-generator, per-model summaries with call
+    and error counts, cache hit rate and p50/p95/p99 of each histogram.
+    """
+    if snapshots is None:
+        snapshots = load_snapshots()
+
+    merged = defaultdict(dict)
+    for data in snapshots:
+        for generator, models in data.items():
+            for model, stats in models.items():
+                stats = CallStats.from_dict(stats)
+                if model in merged[generator]:
+                    merged[generator][model].merge(stats)
+                else:
+                    merged[generator][model] = stats
+
+    return {
+        generator: {model: _summarise(stats) for model, stats in models.items()}
+        for generator, models in sorted(merged.items())
+    }
@@ -5,6 +5,8 @@ from .views import (
     GenerateBlogView,
     BestCandidateRecommenderView,
     GenerateContractView,
+    ContractTaskStatusView,
+    LLMMetricsView,
     )
 
 urlpatterns = [
@@ -20,10 +22,16 @@ urlpatterns = [
     ),
     path("generate-blog-post/", GenerateBlogView.as_view(), name="generate-blog-post"),
     path('generate-contract/', GenerateContractView.as_view(), name='generate-contract'),
+    path(
+        "contract-tasks/<uuid:task_id>/",
+        ContractTaskStatusView.as_view(),
+        name="contract-task-status",
+    ),
 
     path(
         "recommend-candidate/",
         BestCandidateRecommenderView.as_view(),
         name="recommend-candidate",
     ),
+    path("metrics/", LLMMetricsView.as_view(), name="llm-metrics"),
 ]
@@ -6,25 +6,30 @@ from .serializer import (
     GenerateBlogSerializer,
     BestCandidateSerializer,
     GenerateContractSerializer,
+    ContractTaskSerializer,
 )
-from .JobList_generator import generate_job_listing
+from .JobList_generator import generate_job_listing, stream_job_listing
 from .bio_generator import generate_candidate_bio
-from .blog_post_generator import generate_blog_post
-from rest_framework.permissions import IsAuthenticated
+from .blog_post_generator import generate_blog_post, stream_blog_post
+from .streaming import wants_stream, sse_response
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from core.permissions import IsEmployer, IsCandidate
-import markdown
-from bs4 import BeautifulSoup
-from .candidate_recommender import recommend_best_candidate
+from .markdown_render import render_markdown
+from . import job_prescreen, llm_cache, markdown_render, resume_compactor, telemetry
+from .recommendation_store import recommend_for_job
 from jobs.models import JobListing
 from applications.models import Application
 from users.models import User, CandidateProfile, EmployerProfile
 from django.http import HttpResponse
-from .contract_generator import generate_contract
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from .models import ContractTask
+from .tasks import enqueue_contract_task
 import os
-from core.b2_storage import BackblazeB2Storage
-from emails.email import send_contract_email
 from django.utils import timezone
 from datetime import timedelta
+import json
+import time
 
 
 class GenerateJobPostingView(APIView):
@@ -42,6 +47,19 @@ class GenerateJobPostingView(APIView):
                 "salary_range", "Not specified"
             )
 
+            if wants_stream(request):
+                tokens = stream_job_listing(
+                    description,
+                    job_title,
+                    company,
+                    location,
+                    experience_required,
+                    salary_range,
+                )
+                return sse_response(
+                    tokens, lambda text: {"job_listing": json.loads(text)}
+                )
+
             job_listing = generate_job_listing(
                 description,
                 job_title,
@@ -68,15 +86,7 @@ class GenerateCandidateBioView(APIView):
 
         try:
             bio = generate_candidate_bio(user)
-
-            # Remove Markdown code block markers (```markdown ... ```)
-            if bio.startswith("```markdown"):
-                bio = bio.strip("```markdown").strip("```")
-
-            # Convert Markdown to HTML
-            formatted_bio = markdown.markdown(bio)
-            soup = BeautifulSoup(formatted_bio, "html.parser")
-            formatted_bio = soup.prettify(formatter="html").replace("\n", " ")
+            formatted_bio = render_markdown(bio)
 
             return Response({"bio": formatted_bio}, status=status.HTTP_200_OK)
         except ValueError as e:
@@ -106,16 +116,14 @@ class GenerateBlogView(APIView):
             keywords = serializer.validated_data.get("blog_keywords", "")
             blog_length = serializer.validated_data.get("blog_length", "600 words")
 
-            blog = generate_blog_post(title, description, keywords, blog_length)
-
-            # Remove Markdown code block markers (```markdown ... ```)
-            if blog.startswith("```markdown"):
-                blog = blog.strip("```markdown").strip("```")
+            if wants_stream(request):
+                tokens = stream_blog_post(title, description, keywords, blog_length)
+                return sse_response(
+                    tokens, lambda text: {"blog": render_markdown(text)}
+                )
 
-            # Convert Markdown to HTML
-            formatted_blog = markdown.markdown(blog)
-            soup = BeautifulSoup(formatted_blog, "html.parser")
-            formatted_blog = soup.prettify(formatter="html").replace("\n", " ")
+            blog = generate_blog_post(title, description, keywords, blog_length)
+            formatted_blog = render_markdown(blog)
 
             return Response({"blog": formatted_blog}, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -132,26 +140,19 @@ class BestCandidateRecommenderView(APIView):
 
             try:
                 job = JobListing.objects.get(id=job_id)
-                description = job.description
-                responsibilities = job.responsibilities
-                required_qualifications = job.required_qualifications
-                preferred_qualifications = job.preferred_qualifications
-
-                # Ensure each application has extracted_resume data
-                for app in applications:
-                    if "id" in app and not app.get("extracted_resume"):
-                        try:
-                            application = Application.objects.get(id=app["id"])
-                            app["extracted_resume"] = application.extracted_resume
-                        except Application.DoesNotExist:
-                            pass
-
-                result = recommend_best_candidate(
-                    applications,
-                    description,
-                    preferred_qualifications,
-                    required_qualifications,
-                    responsibilities,
+                # Accept either application objects or bare application ids
+                application_ids = [
+                    app.get("id") if isinstance(app, dict) else app
+                    for app in applications
+                ]
+
+                # Stored scores are reused; only new applications (or all of
+                # them, if the job text changed) are sent to the model.
+                result = recommend_for_job(
+                    job,
+                    application_ids,
+                    refresh=serializer.validated_data.get("refresh", False),
+                    batched=serializer.validated_data.get("batched"),
                 )
 
                 return Response({"result": result}, status=status.HTTP_200_OK)
@@ -176,84 +177,83 @@ class GenerateContractView(APIView):
             terms = serializer.validated_data.get("terms", "")
 
             try:
-                # Get all necessary data
-                application = Application.objects.get(id=app_id)
-                job = JobListing.objects.get(id=application.job.id)
-                employee = User.objects.get(id=application.candidate.id)
-                employer = request.user
-
-                # Prepare data for contract generation
-                contract_data = {
-                    "employer_name": employer.name,
-                    "employer_address": job.location,
-                    "employee_name": employee.name,
-                    "employee_address": (
-                        employee.address
-                        if hasattr(employee, "address") and employee.address
-                        else "Address to be provided"
-                    ),
-                    "company_name": job.company,
-                    "job_title": job.title,
-                    "start_date": start_date.strftime("%B %d, %Y"),
-                    "salary": job.salary,
-                    "responsibilities": (
-                        ", ".join(job.responsibilities)
-                        if isinstance(job.responsibilities, list)
-                        else str(job.responsibilities)
-                    ),
-                    "benefits": (
-                        ", ".join(job.benefits)
-                        if isinstance(job.benefits, list)
-                        else str(job.benefits)
-                    ),
-                    "terms": terms,
-                }
+                application = Application.objects.select_related(
+                    "job", "candidate"
+                ).get(id=app_id)
+            except Application.DoesNotExist:
+                return Response(
+                    {"error": "Application not found"}, status=status.HTTP_404_NOT_FOUND
+                )
 
-                # Add end date if provided
-                if end_date:
-                    contract_data["end_date"] = end_date.strftime("%B %d, %Y")
+            # Generation runs in the background; the client polls the task.
+            task = enqueue_contract_task(
+                application, request.user, start_date, end_date, terms
+            )
+
+            return Response(
+                {
+                    "status": task.status,
+                    "message": f"Contract generation started for {application.candidate.email}",
+                    "task_id": str(task.id),
+                    "status_url": reverse(
+                        "contract-task-status", kwargs={"task_id": task.id}
+                    ),
+                    "candidate_name": application.candidate.name,
+                    "job_title": application.job.title,
+                    "company": application.job.company,
+                },
+                status=status.HTTP_202_ACCEPTED,
+            )
 
-                # Generate the contract and get the B2 URL directly
-                contract_url = generate_contract(contract_data)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-                # Update application with contract URL
-                application.contract = contract_url
-                application.save()
 
-                # Send email to candidate
-                send_contract_email(
-                    employee.email, contract_url, job.company, job.title
-                )
+class ContractTaskStatusView(APIView):
+    permission_classes = [IsAuthenticated, IsEmployer]
 
-                # Return success response with contract information
-                return Response(
-                    {
-                        "status": "success",
-                        "message": f"Contract generated and sent to {employee.email}",
-                        "contract_url": contract_url,
-                        "candidate_name": employee.name,
-                        "job_title": job.title,
-                        "company": job.company,
-                    },
-                    status=status.HTTP_200_OK,
-                )
+    # Upper bound for long-polling so a request never pins a worker for long.
+    MAX_WAIT_SECONDS = 25
+    POLL_INTERVAL_SECONDS = 0.5
 
-            except Application.DoesNotExist:
-                return Response(
-                    {"error": "Application not found"}, status=status.HTTP_404_NOT_FOUND
-                )
-            except JobListing.DoesNotExist:
-                return Response(
-                    {"error": "Job listing not found"}, status=status.HTTP_404_NOT_FOUND
-                )
-            except User.DoesNotExist:
-                return Response(
-                    {"error": "User not found"}, status=status.HTTP_404_NOT_FOUND
-                )
-            except Exception as e:
-                return Response(
-                    {"error": f"Failed to generate contract: {str(e)}"},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                )
+    def get(self, request, task_id, *args, **kwargs):
+        task = get_object_or_404(
+            ContractTask, id=task_id, requested_by=request.user
+        )
 
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        # ?wait=<seconds> long-polls until the task finishes or its stage changes
+        try:
+            wait = min(float(request.query_params.get("wait", 0)), self.MAX_WAIT_SECONDS)
+        except ValueError:
+            wait = 0
+
+        deadline = time.monotonic() + wait
+        initial_stage = task.stage
+        while (
+            not task.is_finished
+            and task.stage == initial_stage
+            and time.monotonic() < deadline
+        ):
+            time.sleep(self.POLL_INTERVAL_SECONDS)
+            task.refresh_from_db()
+
+        return Response(
+            ContractTaskSerializer(task).data, status=status.HTTP_200_OK
+        )
+
+
+class LLMMetricsView(APIView):
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        # Only the LLM telemetry is aggregated across workers; the other
+        # counters are for the process serving this request.
+        return Response(
+            {
+                "llm": telemetry.get_metrics(),
+                "llm_cache": llm_cache.get_stats(),
+                "job_prescreen": job_prescreen.get_stats(),
+                "resume_compactor": resume_compactor.get_stats(),
+                "markdown_render": markdown_render.get_stats(),
+            },
+            status=status.HTTP_200_OK,
+        )
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.5 on 2026-10-18 21:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def remove_duplicate_applications(apps, schema_editor):
+    """
+    Keep one application per (job, candidate) so the unique constraint
+    applies: the one with a contract if any, otherwise the earliest.
+    """
+    Application = apps.get_model('applications', 'Application')
+    duplicates = (
+        Application.objects.values('job_id', 'candidate_id')
+        .annotate(count=models.Count('id'))
+        .filter(count__gt=1)
+    )
+    for row in duplicates:
+        applications = sorted(
+            Application.objects.filter(
+                job_id=row['job_id'], candidate_id=row['candidate_id']
+            ),
+            key=lambda application: (application.contract == '', application.id),
+        )
+        Application.objects.filter(
+            id__in=[application.id for application in applications[1:]]
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0006_rename_resume_text_application_extracted_resume'),
+        # Rows that reference applications must be in the migration state so
+        # the duplicate cleanup can cascade to them
+        ('ai', '0003_contracttemplate'),
+        ('jobs', '0016_job_search_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_applications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='application',
+            constraint=models.UniqueConstraint(fields=('job', 'candidate'), name='applications_job_candidate_uniq'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-18 22:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0007_application_unique_job_candidate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='resume_sections',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+    ]
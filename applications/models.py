@@ -21,8 +21,17 @@ class Application(models.Model):
     )
     resume = models.CharField(max_length=100)
     extracted_resume = models.CharField(blank=True, default="")
+    # Sections split from the resume at upload, as [name, lines] pairs
+    resume_sections = models.JSONField(default=list, blank=True, editable=False)
     contract = models.CharField(max_length=255, blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["job", "candidate"], name="applications_job_candidate_uniq"
+            )
+        ]
+
     def __str__(self):
         return f"Application of {self.candidate.username} for {self.job.title}"
@@ -10,14 +10,15 @@ from .serializer import (
     UpdateApplicationStatusSerializer,
 )
 from rest_framework.views import APIView
-from core.pagination import CustomPageNumberPagination
+from core.pagination import CursorPaginationMixin, CustomPageNumberPagination
 from rest_framework.response import Response
 from rest_framework import status
 from .models import Application
 from .serializer import UpdateApplicationStatusSerializer
 from rest_framework.permissions import IsAuthenticated
 from core.utils import extract_text_from_pdf, download_pdf_from_url
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from users.resume_parsing import stored_sections
 
 
 class ApplyJobView(generics.CreateAPIView):
@@ -28,8 +29,19 @@ class ApplyJobView(generics.CreateAPIView):
         # Extract resume text before saving
         resume = serializer.validated_data.get("resume")
         extracted_text = ""
-
-        if resume:
+        sections = []
+
+        # Reuse the text extracted when the resume was uploaded; None when it
+        # couldn't be extracted, so the file is tried directly below
+        entry = None
+        profile = getattr(self.request.user, "candidate_profile", None)
+        if resume and profile:
+            entry = profile.parsed_resume(resume)
+
+        if entry is not None:
+            extracted_text = entry["text"]
+            sections = stored_sections(entry) or []
+        elif resume:
             # If resume is a URL, download it first
             if resume.startswith("http"):
                 pdf_file = download_pdf_from_url(resume)
@@ -43,7 +55,11 @@ class ApplyJobView(generics.CreateAPIView):
                     extracted_text = f"Error extracting text: {str(e)}"
 
         # Save the application with extracted text
-        serializer.save(candidate=self.request.user, extracted_resume=extracted_text)
+        serializer.save(
+            candidate=self.request.user,
+            extracted_resume=extracted_text,
+            resume_sections=sections,
+        )
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -60,6 +76,15 @@ class ApplyJobView(generics.CreateAPIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
+            # Listings still under moderation don't take applications
+            if job.moderation_status != "approved":
+                return Response(
+                    {
+                        "message": "Job is not accepting applications",
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
             # Check if user already applied for this job
             if Application.objects.filter(job=job, candidate=candidate).exists():
                 return Response(
@@ -69,7 +94,17 @@ class ApplyJobView(generics.CreateAPIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            self.perform_create(serializer)
+            try:
+                with transaction.atomic():
+                    self.perform_create(serializer)
+            except IntegrityError:
+                # A concurrent request created it first (unique job/candidate)
+                return Response(
+                    {
+                        "message": "You have already applied for this job",
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
             job.applicants += 1
             job.save()
             return Response(
@@ -89,7 +124,7 @@ class ApplyJobView(generics.CreateAPIView):
             )
 
 
-class JobApplicationsListView(generics.ListAPIView):
+class JobApplicationsListView(CursorPaginationMixin, generics.ListAPIView):
     serializer_class = ApplicationSerializer
     permission_classes = [IsAuthenticated, IsJobEmployer]
 
@@ -139,7 +174,7 @@ class UpdateApplicationStatusView(APIView):
         return Response(response_data, status=status.HTTP_200_OK)
 
 
-class AppliedJobsListView(generics.ListAPIView):
+class AppliedJobsListView(CursorPaginationMixin, generics.ListAPIView):
     serializer_class = AppliedJobSerializer  # Updated to use AppliedJobSerializer
     permission_classes = [IsAuthenticated, IsCandidate]
     pagination_class = CustomPageNumberPagination
@@ -5,10 +5,10 @@ from rest_framework.permissions import IsAuthenticated
 from core.permissions import IsEmployerAndOwner, IsEmployer
 from .models import Blog
 from .serializers import BlogSerializer, BlogCreateSerializer
-from core.pagination import CustomPageNumberPagination
+from core.pagination import CursorPaginationMixin, CustomPageNumberPagination
 
 
-class BlogListView(generics.ListAPIView):
+class BlogListView(CursorPaginationMixin, generics.ListAPIView):
     """View to list all published blogs"""
 
     serializer_class = BlogSerializer
@@ -2,6 +2,7 @@ from b2sdk.v2 import InMemoryAccountInfo, B2Api
 from django.conf import settings
 from django.core.files.storage import Storage
 import os
+from functools import lru_cache
 
 
 class BackblazeB2Storage(Storage):
@@ -59,3 +60,12 @@ class BackblazeB2Storage(Storage):
         download_url = "https://f005.backblazeb2.com/file"
         name = name.replace(" ", "+")  # Replace spaces with "+"
         return f"{download_url}/{self.bucket_name}/{name.replace('\\','/')}"
+
+
+@lru_cache(maxsize=None)
+def get_b2_storage():
+    """
+    Shared storage instance. Creating one authorizes against the B2 API,
+    so callers reuse this instead of constructing their own per upload.
+    """
+    return BackblazeB2Storage()
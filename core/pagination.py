@@ -1,7 +1,248 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections
+from django.db.models import F, OrderBy, Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 class CustomPageNumberPagination(PageNumberPagination):
     page_size = 10  # Number of blogs per page
     page_size_query_param = 'limit'  # Optional: Allow dynamic page sizes
     max_page_size = 100
     page_query_param = 'page'  # Ensure it accepts 'page' parameter
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Keyset pagination over the queryset's own ordering plus `id` as a
+    tie-breaker, e.g. (created_at, id) for feeds or (rank, id) for ranked
+    search. Pages are fetched with a WHERE on the last seen key instead of
+    OFFSET, and no COUNT(*) is run unless `count=approx` is requested.
+    """
+
+    page_size = 10
+    page_size_query_param = "limit"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    # Used when the queryset isn't ordered
+    ordering = "-created_at"
+
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+
+        self.key = self.get_ordering_key(queryset)
+        self.approximate_count = None
+        if request.query_params.get(self.count_query_param) == "approx":
+            self.approximate_count = self.get_approximate_count(queryset)
+
+        cursor = self.decode_cursor(request, queryset.model)
+        reverse = bool(cursor and cursor["reverse"])
+        key = self.reverse_key(self.key) if reverse else self.key
+
+        queryset = queryset.order_by(*self.order_by(key))
+        if cursor:
+            queryset = queryset.filter(self.after(key, cursor["value"], cursor["id"]))
+
+        results = list(queryset[: page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = results
+        return results
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering_key(self, queryset):
+        """
+        The first ordering term as (name, descending, nulls_first, nullable).
+        Nullable keys get an explicit NULLS FIRST/LAST so the cursor filter
+        and the ORDER BY agree on where NULLs go.
+        """
+        order_by = queryset.query.order_by or queryset.model._meta.ordering
+        term = order_by[0] if order_by else self.ordering
+
+        if isinstance(term, str):
+            name, descending = term.lstrip("-"), term.startswith("-")
+            nulls_first = None
+        elif isinstance(term, OrderBy) and isinstance(term.expression, F):
+            name, descending = term.expression.name, term.descending
+            nulls_first = term.nulls_first or (False if term.nulls_last else None)
+        else:
+            raise ValidationError("This ordering does not support cursor pagination")
+
+        if "__" in name or name == "?":
+            raise ValidationError("This ordering does not support cursor pagination")
+        name = "id" if name == "pk" else name
+
+        try:
+            nullable = queryset.model._meta.get_field(name).null
+        except FieldDoesNotExist:
+            # Annotation, e.g. the search rank
+            nullable = True
+        if nullable and nulls_first is None:
+            # PostgreSQL's default: NULLs sort as the largest value
+            nulls_first = descending
+        return name, descending, nulls_first, nullable
+
+    def reverse_key(self, key):
+        name, descending, nulls_first, nullable = key
+        if nulls_first is not None:
+            nulls_first = not nulls_first
+        return name, not descending, nulls_first, nullable
+
+    def order_by(self, key):
+        name, descending, nulls_first, nullable = key
+        field = F(name)
+        nulls = {}
+        if nullable:
+            nulls = {"nulls_first": True} if nulls_first else {"nulls_last": True}
+        ordering = [field.desc(**nulls) if descending else field.asc(**nulls)]
+        if name != "id":
+            ordering.append(F("id").desc() if descending else F("id").asc())
+        return ordering
+
+    def after(self, key, value, pk):
+        """Rows that come after (value, pk) in the given key ordering."""
+        name, descending, nulls_first, nullable = key
+        beyond = "lt" if descending else "gt"
+        if name == "id":
+            return Q(**{f"id__{beyond}": pk})
+
+        if value is None:
+            condition = Q(**{f"{name}__isnull": True, f"id__{beyond}": pk})
+            if nulls_first:
+                condition |= Q(**{f"{name}__isnull": False})
+            return condition
+
+        condition = Q(**{f"{name}__{beyond}": value}) | Q(
+            **{name: value, f"id__{beyond}": pk}
+        )
+        if nullable and not nulls_first:
+            condition |= Q(**{f"{name}__isnull": True})
+        return condition
+
+    def get_approximate_count(self, queryset):
+        """
+        The planner's row estimate for the filtered queryset, which is
+        accurate for large tables at a fraction of the cost of COUNT(*).
+        """
+        if connections[queryset.db].vendor != "postgresql":
+            return queryset.count()
+        plan = json.loads(queryset.order_by().explain(format="json"))
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def encode_cursor(self, obj, reverse):
+        name = self.key[0]
+        value = getattr(obj, name)
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            value = str(value)
+        payload = {
+            "o": self.signature(),
+            "v": value,
+            "id": obj.pk,
+            "r": int(reverse),
+        }
+        cursor = base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8"))
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, cursor.decode("ascii")
+        )
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            if payload["o"] != self.signature():
+                raise ValueError("Cursor is for a different ordering")
+            value = payload["v"]
+            if value is not None:
+                try:
+                    value = model._meta.get_field(self.key[0]).to_python(value)
+                except FieldDoesNotExist:
+                    pass
+            return {
+                "value": value,
+                "id": int(payload["id"]),
+                "reverse": bool(payload["r"]),
+            }
+        except (
+            TypeError,
+            ValueError,
+            KeyError,
+            UnicodeError,
+            DjangoValidationError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+    def signature(self):
+        name, descending, nulls_first, _ = self.key
+        return f"{'-' if descending else ''}{name}:{nulls_first}"
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        response = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+        if self.approximate_count is not None:
+            response["approximate_count"] = self.approximate_count
+        return Response(response)
+
+
+class CursorPaginationMixin:
+    """
+    Lets a list view serve keyset pages with `?pagination=cursor`, keeping
+    its regular pagination (or none) otherwise.
+    """
+
+    cursor_pagination_class = KeysetCursorPagination
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if self.request.query_params.get("pagination") == "cursor":
+                self._paginator = self.cursor_pagination_class()
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 INSTALLED_APPS += [
@@ -93,6 +94,14 @@ WSGI_APPLICATION = "core.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Ranked job search keeps jobs scoring above JOB_SEARCH_MIN_RANK. Without a
+# full-text match that takes a title or company trigram similarity above a
+# third of it, so ranked search requests set pg_trgm.similarity_threshold to
+# that for their own transaction (jobs.utils.job_search_scope) instead of
+# pg_trgm's default of 0.3, which would drop matches the ranking keeps.
+JOB_SEARCH_MIN_RANK = 0.1
+JOB_SEARCH_TRIGRAM_THRESHOLD = JOB_SEARCH_MIN_RANK / 3
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -194,9 +203,135 @@ EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 OPENAI_API_KEY = os.environ.get("OpenAI_API_KEY")
 # Changed variable names to uppercase
 OPENAI_TOKEN = os.environ.get("GITHUB_TOKEN")
-OPENAI_ENDPOINT = "https://models.inference.ai.azure.com"
+# Point OPENAI_ENDPOINT at `manage.py run_llm_standin` for offline benchmarks.
+OPENAI_ENDPOINT = os.environ.get(
+    "OPENAI_ENDPOINT", "https://models.inference.ai.azure.com"
+)
 OPENAI_MODEL = "gpt-4o"
 
+# Shared LLM gateway (ai/llm_gateway.py)
+OPENAI_TIMEOUT = float(os.environ.get("OPENAI_TIMEOUT", 120))
+OPENAI_CONNECT_TIMEOUT = float(os.environ.get("OPENAI_CONNECT_TIMEOUT", 10))
+OPENAI_MAX_RETRIES = int(os.environ.get("OPENAI_MAX_RETRIES", 2))
+OPENAI_RETRY_BASE_DELAY = 0.5
+OPENAI_RETRY_MAX_DELAY = 8.0
+OPENAI_MAX_CONNECTIONS = int(os.environ.get("OPENAI_MAX_CONNECTIONS", 20))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = 10
+OPENAI_KEEPALIVE_EXPIRY = 60.0
+OPENAI_MAX_CONCURRENCY = int(os.environ.get("OPENAI_MAX_CONCURRENCY", 8))
+OPENAI_QUEUE_TIMEOUT = 30.0
+# Ask for token usage on streamed responses (stream_options.include_usage).
+OPENAI_STREAM_USAGE = True
+
+# LLM record/replay (ai/llm_replay.py). "record" saves every live response
+# to LLM_REPLAY_DIR, "replay" serves responses from there without calling the
+# endpoint (unrecorded requests fail). "off" disables both.
+LLM_REPLAY_MODE = os.environ.get("LLM_REPLAY_MODE", "off").lower()
+LLM_REPLAY_DIR = os.environ.get("LLM_REPLAY_DIR") or os.path.join(
+    BASE_DIR, "llm_recordings"
+)
+
+# Per-generator LLM call telemetry (ai/telemetry.py). Histograms are kept in
+# each process; set LLM_TELEMETRY_DIR to a directory shared by the workers so
+# the metrics endpoint and `manage.py llm_metrics` aggregate all of them.
+LLM_TELEMETRY_ENABLED = True
+LLM_TELEMETRY_DIR = os.environ.get("LLM_TELEMETRY_DIR") or None
+LLM_TELEMETRY_FLUSH_INTERVAL = 10
+LLM_TELEMETRY_MAX_AGE = 24 * 60 * 60
+
+# LLM response cache (ai/llm_cache.py). TTLs are in seconds, 0 disables
+# caching for a generator. Set LLM_CACHE_SHARED_ALIAS to a CACHES alias to
+# share responses between worker processes.
+LLM_CACHE_ENABLED = True
+LLM_CACHE_MAX_ENTRIES = 512
+LLM_CACHE_SHARED_ALIAS = os.environ.get("LLM_CACHE_SHARED_ALIAS") or None
+LLM_CACHE_DEFAULT_TTL = 0
+LLM_CACHE_TTLS = {
+    "job_listing": 60 * 60,
+    "job_filter": 24 * 60 * 60,
+    "bio_filter": 24 * 60 * 60,
+    "candidate_recommender": 60 * 60,
+    "candidate_bio": 0,
+    "blog_post": 0,
+    "contract": 0,
+}
+
+# Rendered markdown cache (ai/markdown_render.py), keyed by a hash of the
+# generated text.
+MARKDOWN_RENDER_CACHE_ENTRIES = 256
+MARKDOWN_RENDER_CACHE_TTL = 60 * 60
+
+# Local rules pre-screen for job postings (ai/job_prescreen.py). Clean
+# postings skip the job_filter model call.
+JOB_PRESCREEN_ENABLED = True
+
+# "sync" runs job_filtering before a listing is saved. "async" saves it as
+# pending_review right away and moderates it in the background (or with
+# `manage.py run_moderation_worker` when JOB_MODERATION_RUN_INLINE is False).
+JOB_MODERATION_MODE = os.environ.get("JOB_MODERATION_MODE", "sync")
+JOB_MODERATION_RUN_INLINE = (
+    os.environ.get("JOB_MODERATION_RUN_INLINE", "True").lower() == "true"
+)
+# Seconds before a listing left in_review (or pending_review in inline
+# mode) by a failed or crashed moderation run is moderated again.
+JOB_MODERATION_STALE_AFTER = int(os.environ.get("JOB_MODERATION_STALE_AFTER", 300))
+
+# Currency of the salary filters and sorts when the request doesn't pass
+# `salary_currency`; listings whose salary names no currency count as this one.
+DEFAULT_SALARY_CURRENCY = os.environ.get("DEFAULT_SALARY_CURRENCY", "USD").upper()
+
+# Candidate recommender batching (ai/candidate_recommender.py)
+RECOMMENDER_BATCH_TOKEN_BUDGET = 12000
+RECOMMENDER_MAX_PARALLEL_BATCHES = 4
+# Per-resume prompt budget after compaction (ai/resume_compactor.py)
+RESUME_TOKEN_BUDGET = 1500
+# Applicants kept by the local BM25 pre-ranking (ai/lexical_ranker.py)
+RECOMMENDER_PRERANK_TOP_N = 25
+# Applicants nearest the job in the resume embedding index, kept as well
+RECOMMENDER_SEMANTIC_TOP_N = 10
+
+# NLTK data is read from a vendored directory (`manage.py bundle_nltk_data`).
+# Runtime downloads are only allowed when NLTK_ALLOW_DOWNLOAD is true.
+NLTK_DATA_DIR = os.environ.get("NLTK_DATA_DIR", os.path.join(BASE_DIR, "nltk_data"))
+NLTK_ALLOW_DOWNLOAD = (
+    os.environ.get("NLTK_ALLOW_DOWNLOAD", str(DEBUG)).lower() == "true"
+)
+# Maximum seconds to import core.wsgi and the URLconf (`manage.py check_boot_time`)
+BOOT_TIME_BUDGET = float(os.environ.get("BOOT_TIME_BUDGET", 5.0))
+
+# Document text extraction (core/text_extraction.py). Backends are tried in
+# order; optional ones (pymupdf, pdfminer) are skipped unless installed.
+# TEXT_EXTRACTION_WORKERS = 0 extracts inline instead of in a process pool.
+TEXT_EXTRACTION_WORKERS = int(os.environ.get("TEXT_EXTRACTION_WORKERS", 2))
+TEXT_EXTRACTION_MAX_PAGES = 20
+TEXT_EXTRACTION_TIMEOUT = 15.0
+TEXT_EXTRACTION_BACKENDS = {
+    "pdf": ["pymupdf", "pdfminer", "pypdf2"],
+    "docx": ["python-docx"],
+    "text": ["plain"],
+}
+
+# Local embedding index (ai/embeddings.py) used by `?semantic=1` job search.
+# Rebuild with `manage.py rebuild_embedding_index` after changing EMBEDDING_DIM.
+EMBEDDING_INDEX_ENABLED = True
+EMBEDDING_INDEX_DIR = os.environ.get(
+    "EMBEDDING_INDEX_DIR", os.path.join(BASE_DIR, "embedding_index")
+)
+EMBEDDING_DIM = 512
+EMBEDDING_SEARCH_TOP_K = 200
+EMBEDDING_MIN_SCORE = 0.05
+
+# Background tasks (core/tasks.py). When CONTRACT_TASKS_RUN_INLINE is False,
+# contract tasks are only processed by `manage.py run_contract_worker`.
+BACKGROUND_TASK_WORKERS = int(os.environ.get("BACKGROUND_TASK_WORKERS", 4))
+CONTRACT_TASKS_RUN_INLINE = (
+    os.environ.get("CONTRACT_TASKS_RUN_INLINE", "True").lower() == "true"
+)
+# Seconds a running contract task may go without progress before it is
+# considered abandoned and run again, by `run_contract_worker` or, inline,
+# when the next contract task is queued.
+CONTRACT_TASK_STALE_AFTER = int(os.environ.get("CONTRACT_TASK_STALE_AFTER", 600))
+
 # cloudinary for images
 cloudinary.config(
     cloud_name=os.environ.get("CLOUD_NAME"),
@@ -211,5 +346,11 @@ B2_APP_KEY = os.environ.get("B2_APP_KEY")
 B2_BUCKET_NAME = os.environ.get("B2_BUCKET_NAME")
 RESUME_FILE_STORAGE = "core.backblaze_b2_storage.BackblazeB2Storage"
 
+# Contracts are uploaded to B2 from memory. Set CONTRACT_LOCAL_COPY=True to
+# also keep a copy in MEDIA_ROOT/contracts; ignored unless DEBUG is on.
+CONTRACT_LOCAL_COPY = (
+    DEBUG and os.environ.get("CONTRACT_LOCAL_COPY", "False").lower() == "true"
+)
+
 # Front end url
 FRONT_END_URL = "localhost:3000"
@@ -0,0 +1,44 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.BACKGROUND_TASK_WORKERS,
+                    thread_name_prefix="background-task",
+                )
+    return _executor
+
+
+def _run(func, args, kwargs):
+    close_old_connections()
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s failed", func.__name__)
+    finally:
+        # Worker threads own their DB connections; don't leak them.
+        close_old_connections()
+
+
+def run_in_background(func, *args, **kwargs):
+    """
+    Run `func` on the in-process background pool once the current
+    transaction commits, so the task always sees the rows it depends on.
+    """
+    transaction.on_commit(
+        lambda: _get_executor().submit(_run, func, args, kwargs)
+    )
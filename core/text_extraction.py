@@ -0,0 +1,214 @@
+import io
+import multiprocessing
+import signal
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+
+class TextExtractionError(Exception):
+    pass
+
+
+class UnsupportedFormat(TextExtractionError):
+    pass
+
+
+class ExtractionTimeout(TextExtractionError):
+    pass
+
+
+# format -> {backend name: function(content, max_pages) -> text}
+BACKENDS = {}
+
+
+def register_backend(file_format, name):
+    """Register an extraction function for a format under a backend name."""
+
+    def decorator(func):
+        BACKENDS.setdefault(file_format, {})[name] = func
+        return func
+
+    return decorator
+
+
+@register_backend("pdf", "pypdf2")
+def _pypdf2(content, max_pages):
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(io.BytesIO(content))
+    pages = []
+    for page in reader.pages[:max_pages]:
+        text = page.extract_text()
+        if text:
+            pages.append(text)
+    return "\n".join(pages)
+
+
+@register_backend("docx", "python-docx")
+def _python_docx(content, max_pages):
+    import docx
+
+    document = docx.Document(io.BytesIO(content))
+    return "\n".join(paragraph.text for paragraph in document.paragraphs)
+
+
+@register_backend("text", "plain")
+def _plain(content, max_pages):
+    return content.decode("utf-8")
+
+
+# Optional faster backends, used when installed and listed in
+# TEXT_EXTRACTION_BACKENDS.
+try:
+    import fitz  # PyMuPDF
+
+    @register_backend("pdf", "pymupdf")
+    def _pymupdf(content, max_pages):
+        with fitz.open(stream=content, filetype="pdf") as document:
+            last_page = min(max_pages, len(document))
+            return "\n".join(page.get_text() for page in document.pages(0, last_page))
+
+except ImportError:
+    pass
+
+try:
+    from pdfminer.high_level import extract_text as pdfminer_extract_text
+
+    @register_backend("pdf", "pdfminer")
+    def _pdfminer(content, max_pages):
+        return pdfminer_extract_text(io.BytesIO(content), maxpages=max_pages)
+
+except ImportError:
+    pass
+
+
+def sniff_format(content):
+    """Detect the document format from its leading bytes, not its name."""
+    head = content[:1024]
+    if head.lstrip()[:5] == b"%PDF-":
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(io.BytesIO(content)) as archive:
+                if "word/document.xml" in archive.namelist():
+                    return "docx"
+        except zipfile.BadZipFile:
+            return None
+        return None
+    if b"\x00" not in head:
+        try:
+            content.decode("utf-8")
+            return "text"
+        except UnicodeDecodeError:
+            return None
+    return None
+
+
+def choose_backend(file_format):
+    """First configured backend that is installed for the format."""
+    available = BACKENDS.get(file_format, {})
+    for name in settings.TEXT_EXTRACTION_BACKENDS.get(file_format, []):
+        if name in available:
+            return name
+    if available:
+        return next(iter(available))
+    raise UnsupportedFormat(f"Unsupported file format: {file_format}")
+
+
+def _on_alarm(signum, frame):
+    raise ExtractionTimeout("Text extraction timed out")
+
+
+def _run_backend(file_format, backend, content, max_pages, timeout):
+    """
+    Runs inside a pool process, where an alarm enforces the time limit.
+    Signals only work on the main thread, so inline runs from request
+    threads rely on the page limit alone.
+    """
+    use_alarm = threading.current_thread() is threading.main_thread()
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return BACKENDS[file_format][backend](content, max_pages)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn: children must not inherit the server's threads or
+                # database connections
+                _pool = ProcessPoolExecutor(
+                    max_workers=settings.TEXT_EXTRACTION_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def extract_text(content, max_pages=None, timeout=None, backend=None):
+    """
+    Extract text from a document.
+
+    The format is sniffed from the content. Extraction runs in a bounded
+    process pool (or inline when TEXT_EXTRACTION_WORKERS is 0) with a page
+    limit and a time limit per document.
+
+    Args:
+        content (bytes or file-like): The document
+        max_pages (int): Pages to read, defaults to TEXT_EXTRACTION_MAX_PAGES
+        timeout (float): Seconds allowed, defaults to TEXT_EXTRACTION_TIMEOUT
+        backend (str): Force a backend instead of the configured one
+
+    Returns:
+        str: The extracted text
+
+    Raises:
+        UnsupportedFormat, ExtractionTimeout or TextExtractionError
+    """
+    if hasattr(content, "read"):
+        content = content.read()
+    max_pages = max_pages or settings.TEXT_EXTRACTION_MAX_PAGES
+    timeout = timeout or settings.TEXT_EXTRACTION_TIMEOUT
+
+    file_format = sniff_format(content)
+    if file_format is None:
+        raise UnsupportedFormat("Unsupported file format")
+    backend = backend or choose_backend(file_format)
+
+    args = (file_format, backend, content, max_pages, timeout)
+    try:
+        if not settings.TEXT_EXTRACTION_WORKERS:
+            return _run_backend(*args)
+        future = _get_pool().submit(_run_backend, *args)
+        # Small grace period over the in-process alarm for pickling/IPC
+        return future.result(timeout=timeout + 5)
+    except TextExtractionError:
+        raise
+    except TimeoutError:
+        raise ExtractionTimeout("Text extraction timed out")
+    except BrokenProcessPool as e:
+        _reset_pool()
+        raise TextExtractionError(f"Extraction worker died: {str(e)}")
+    except Exception as e:
+        raise TextExtractionError(f"{backend} failed: {str(e)}")
@@ -1,20 +1,12 @@
-import PyPDF2
 import io
 import requests
+from core.text_extraction import extract_text
 
 
 def extract_text_from_pdf(pdf_file):
-    text = ""
     try:
-        # If pdf_file is already bytes or file-like object
-        pdf_reader = PyPDF2.PdfReader(
-            io.BytesIO(pdf_file) if isinstance(pdf_file, bytes) else pdf_file
-        )
-        # Extract text from each page
-        for page_num in range(len(pdf_reader.pages)):
-            page = pdf_reader.pages[page_num]
-            text += page.extract_text() + "\n"
-        return text
+        # pdf_file may be bytes or a file-like object
+        return extract_text(pdf_file)
     except Exception as e:
         # Handle exceptions gracefully
         return f"Error extracting text from PDF: {str(e)}"
@@ -28,3 +20,14 @@ def download_pdf_from_url(url):
         return io.BytesIO(response.content)
     except Exception as e:
         return f"Error downloading PDF: {str(e)}"
+
+
+def extract_resume_text(content, filename=None):
+    """
+    Extract text from resume bytes. The format is detected from the
+    content, `filename` is only kept for callers that still pass it.
+    """
+    try:
+        return extract_text(content)
+    except Exception as e:
+        return f"Error extracting text: {str(e)}"
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.5 on 2026-10-18 21:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emails', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emailotp',
+            index=models.Index(fields=['user', 'otp', 'verified', 'expires_at'], name='emails_otp_lookup_idx'),
+        ),
+    ]
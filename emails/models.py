@@ -12,6 +12,14 @@ class EmailOTP(models.Model):
     expires_at = models.DateTimeField()
     verified = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "otp", "verified", "expires_at"],
+                name="emails_otp_lookup_idx",
+            )
+        ]
+
     def save(self, *args, **kwargs):
         if not self.id:
             self.expires_at = timezone.now() + timedelta(minutes=10)
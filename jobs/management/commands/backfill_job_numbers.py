@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.models import JobListing
+
+
+class Command(BaseCommand):
+    help = (
+        "Parse the salary and experience text of existing job listings into "
+        "their numeric columns."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows updated per statement, to keep each transaction short.",
+        )
+
+    def handle(self, *args, **options):
+        queryset = (
+            JobListing.objects.only("id", "salary", "experience_required")
+            .order_by("id")
+        )
+        fields = JobListing.SALARY_FIELDS + JobListing.EXPERIENCE_FIELDS
+
+        started = time.perf_counter()
+        updated = 0
+        batch = []
+        for job in queryset.iterator(chunk_size=options["batch_size"]):
+            job.parse_requirements()
+            batch.append(job)
+            if len(batch) >= options["batch_size"]:
+                JobListing.objects.bulk_update(batch, fields)
+                updated += len(batch)
+                batch = []
+        if batch:
+            JobListing.objects.bulk_update(batch, fields)
+            updated += len(batch)
+
+        self.stdout.write(
+            f"Updated {updated} job listings in {time.perf_counter() - started:.2f}s"
+        )
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+
+from jobs.models import JobListing
+from jobs.utils import job_search_vector
+
+
+class Command(BaseCommand):
+    help = "Populate the stored search vector of existing job listings."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows updated per statement, to keep each transaction short.",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute every row instead of only rows without a vector.",
+        )
+
+    def handle(self, *args, **options):
+        queryset = JobListing.objects.all()
+        if not options["all"]:
+            queryset = queryset.filter(search_vector__isnull=True)
+
+        started = time.perf_counter()
+        last_id = queryset.aggregate(last_id=Max("id"))["last_id"] or 0
+        updated = 0
+        # Walk the primary key in ranges so each UPDATE stays small
+        for start in range(0, last_id, options["batch_size"]):
+            updated += queryset.filter(
+                id__gt=start, id__lte=start + options["batch_size"]
+            ).update(search_vector=job_search_vector())
+
+        self.stdout.write(
+            f"Updated {updated} job listings in {time.perf_counter() - started:.2f}s"
+        )
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.5 on 2026-10-18 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0013_alter_joblisting_job_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblisting',
+            name='moderation_status',
+            field=models.CharField(choices=[('pending_review', 'Pending Review'), ('in_review', 'In Review'), ('approved', 'Approved')], default='approved', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='policy_violations',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(fields=['moderation_status', 'created_at'], name='jobs_moderation_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.1.5 on 2026-10-18 21:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Same weighting as the SearchVector expression in jobs.utils.job_search_vector.
+# Existing rows are filled by `manage.py backfill_search_vectors`.
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION jobs_joblisting_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector(COALESCE(NEW.title, '')), 'A') ||
+        setweight(to_tsvector(COALESCE(NEW.company, '')), 'B') ||
+        setweight(to_tsvector(COALESCE(NEW.location, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER jobs_joblisting_search_vector_trigger
+BEFORE INSERT OR UPDATE OF title, company, location, search_vector
+ON jobs_joblisting
+FOR EACH ROW EXECUTE FUNCTION jobs_joblisting_search_vector_update();
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS jobs_joblisting_search_vector_trigger ON jobs_joblisting;
+DROP FUNCTION IF EXISTS jobs_joblisting_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0014_joblisting_moderation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblisting',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='jobs_search_vector_idx'),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+    ]
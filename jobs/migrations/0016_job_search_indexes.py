@@ -0,0 +1,61 @@
+# Generated by Django 5.1.5 on 2026-10-18 21:40
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+def remove_duplicate_saved_jobs(apps, schema_editor):
+    """Keep the first save of each (user, job) so the unique constraint applies."""
+    SavedJob = apps.get_model('jobs', 'SavedJob')
+    duplicates = (
+        SavedJob.objects.values('user_id', 'job_id')
+        .annotate(first_id=models.Min('id'), count=models.Count('id'))
+        .filter(count__gt=1)
+    )
+    for row in duplicates:
+        SavedJob.objects.filter(user_id=row['user_id'], job_id=row['job_id']).exclude(
+            id=row['first_id']
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    # Indexes on jobs_joblisting are built concurrently so listings stay
+    # writable while they build
+    atomic = False
+
+    dependencies = [
+        ('jobs', '0015_joblisting_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='joblisting',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('title'), name='gin_trgm_ops'), name='jobs_title_upper_trgm_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='joblisting',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('company'), name='gin_trgm_ops'), name='jobs_company_upper_trgm_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='joblisting',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='jobs_title_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='joblisting',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['company'], name='jobs_company_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='joblisting',
+            index=models.Index(condition=models.Q(('moderation_status', 'approved'), models.Q(('job_status', 'draft'), _negated=True)), fields=['-created_at'], name='jobs_listed_recent_idx'),
+        ),
+        migrations.RunPython(remove_duplicate_saved_jobs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='savedjob',
+            constraint=models.UniqueConstraint(fields=('user', 'job'), name='jobs_savedjob_user_job_uniq'),
+        ),
+    ]
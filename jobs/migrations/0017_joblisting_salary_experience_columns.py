@@ -0,0 +1,60 @@
+# Generated by Django 5.1.5 on 2026-10-18 22:15
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Nullable columns are added without a table rewrite and the indexes are
+    # built concurrently; run `manage.py backfill_job_numbers` afterwards
+    atomic = False
+
+    dependencies = [
+        ('jobs', '0016_job_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblisting',
+            name='experience_max_years',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='experience_min_years',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='salary_currency',
+            field=models.CharField(blank=True, editable=False, max_length=3, null=True),
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='salary_max',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='salary_min',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='salary_period',
+            field=models.CharField(blank=True, editable=False, max_length=10, null=True),
+        ),
+        AddIndexConcurrently(
+            model_name='joblisting',
+            index=models.Index(fields=['salary_min'], name='jobs_salary_min_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='joblisting',
+            index=models.Index(fields=['salary_max'], name='jobs_salary_max_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='joblisting',
+            index=models.Index(fields=['experience_min_years'], name='jobs_experience_min_idx'),
+        ),
+    ]
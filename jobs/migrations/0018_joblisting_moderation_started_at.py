@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0017_joblisting_salary_experience_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblisting',
+            name='moderation_started_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -1,13 +1,26 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Upper
 from django.conf import settings
 import json
 
+from jobs.parsers import parse_experience, parse_salary
+
 
 class SavedJob(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     job = models.ForeignKey('JobListing', on_delete=models.CASCADE)
     saved_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "job"], name="jobs_savedjob_user_job_uniq"
+            )
+        ]
+
 
 class JobListing(models.Model):
     JOB_LOCATION_TYPE_CHOICES = [
@@ -23,6 +36,12 @@ class JobListing(models.Model):
 
     JOB_STATUS_CHOICES = [("open", "Open"), ("closed", "Closed"), ("draft", "Draft")]
 
+    MODERATION_STATUS_CHOICES = [
+        ("pending_review", "Pending Review"),
+        ("in_review", "In Review"),
+        ("approved", "Approved"),
+    ]
+
     EXPERIENCE_LEVEL_CHOICES = [
         ("entry", "Entry Level"),
         ("mid", "Mid Level"),
@@ -42,6 +61,26 @@ class JobListing(models.Model):
         null=True,
     )
     salary = models.CharField(max_length=100, blank=True, null=True)
+    # Parsed from `salary` and `experience_required` on save, for numeric
+    # sorting and range filters. Amounts are annualised from salary_period.
+    salary_min = models.DecimalField(
+        max_digits=12, decimal_places=2, blank=True, null=True, editable=False
+    )
+    salary_max = models.DecimalField(
+        max_digits=12, decimal_places=2, blank=True, null=True, editable=False
+    )
+    salary_currency = models.CharField(
+        max_length=3, blank=True, null=True, editable=False
+    )
+    salary_period = models.CharField(
+        max_length=10, blank=True, null=True, editable=False
+    )
+    experience_min_years = models.PositiveSmallIntegerField(
+        blank=True, null=True, editable=False
+    )
+    experience_max_years = models.PositiveSmallIntegerField(
+        blank=True, null=True, editable=False
+    )
     company = models.CharField(max_length=255, blank=True, null=True)
     job_location_type = models.CharField(
         max_length=10, choices=JOB_LOCATION_TYPE_CHOICES, default="onsite"
@@ -58,4 +97,79 @@ class JobListing(models.Model):
     preferred_qualifications = models.JSONField(default=list, blank=True)
     benefits = models.JSONField(default=list, blank=True)
     applicants = models.IntegerField(default=0)
+    moderation_status = models.CharField(
+        max_length=20, choices=MODERATION_STATUS_CHOICES, default="approved"
+    )
+    policy_violations = models.JSONField(default=list, blank=True)
+    # When a moderator claimed the listing; a listing stuck in_review past
+    # JOB_MODERATION_STALE_AFTER is claimed again
+    moderation_started_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # Weighted title/company/location vector, maintained by a database
+    # trigger (jobs/migrations/0015_joblisting_search_vector.py)
+    search_vector = SearchVectorField(null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["moderation_status", "created_at"],
+                name="jobs_moderation_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="jobs_search_vector_idx"),
+            # icontains filters compile to UPPER(col) LIKE UPPER('%...%')
+            GinIndex(
+                OpClass(Upper("title"), name="gin_trgm_ops"),
+                name="jobs_title_upper_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("company"), name="gin_trgm_ops"),
+                name="jobs_company_upper_trgm_idx",
+            ),
+            # trigram_similar (%) in the ranked search
+            GinIndex(
+                fields=["title"], opclasses=["gin_trgm_ops"], name="jobs_title_trgm_idx"
+            ),
+            GinIndex(
+                fields=["company"],
+                opclasses=["gin_trgm_ops"],
+                name="jobs_company_trgm_idx",
+            ),
+            # Newest-first listing of published, approved jobs
+            models.Index(
+                fields=["-created_at"],
+                condition=Q(moderation_status="approved") & ~Q(job_status="draft"),
+                name="jobs_listed_recent_idx",
+            ),
+            # Salary and experience range filters and sorting
+            models.Index(fields=["salary_min"], name="jobs_salary_min_idx"),
+            models.Index(fields=["salary_max"], name="jobs_salary_max_idx"),
+            models.Index(
+                fields=["experience_min_years"], name="jobs_experience_min_idx"
+            ),
+        ]
+
+    SALARY_FIELDS = ["salary_min", "salary_max", "salary_currency", "salary_period"]
+    EXPERIENCE_FIELDS = ["experience_min_years", "experience_max_years"]
+
+    def parse_requirements(self):
+        """
+        Fill the numeric salary and experience columns from the free-text
+        fields. Returns the names of the fields that were set.
+        """
+        for field, value in parse_salary(self.salary).items():
+            setattr(self, field, value)
+        self.experience_min_years, self.experience_max_years = parse_experience(
+            self.experience_required
+        )
+        return self.SALARY_FIELDS + self.EXPERIENCE_FIELDS
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            self.parse_requirements()
+        else:
+            update_fields = set(update_fields)
+            if update_fields & {"salary", "experience_required"}:
+                update_fields.update(self.parse_requirements())
+                kwargs["update_fields"] = update_fields
+        super().save(*args, **kwargs)
@@ -0,0 +1,225 @@
+import re
+from decimal import Decimal, InvalidOperation
+
+YEARS_PATTERN = re.compile(
+    r"(\d{1,2})\s*(?:\+|plus)?\s*(?:(?:-|to|–)\s*(\d{1,2}))?\s*\+?\s*(?:years?|yrs?)",
+    re.IGNORECASE,
+)
+NO_EXPERIENCE_PATTERN = re.compile(
+    r"\b(?:no (?:prior )?experience|fresh(?:er| graduates?)?)\b", re.IGNORECASE
+)
+
+# Amounts like "80,000", "1.5k", "120K", "1.2M" or "1.5 lakh", not followed
+# by "%"
+AMOUNT_PATTERN = re.compile(
+    r"(?<![\w.])(\d+(?:,\d{3})*(?:\.\d+)?)\s*(k|m|lakhs?|lacs?|crores?|cr)?(?![\w%])",
+    re.IGNORECASE,
+)
+MULTIPLIERS = {
+    "k": 1000,
+    "m": 1000000,
+    "lakh": 100000,
+    "lac": 100000,
+    "crore": 10000000,
+    "cr": 10000000,
+}
+MAX_AMOUNT = Decimal("1e10")
+
+CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "₹": "INR"}
+CURRENCY_CODES = {
+    "USD",
+    "EUR",
+    "GBP",
+    "PKR",
+    "INR",
+    "AED",
+    "SAR",
+    "CAD",
+    "AUD",
+}
+CURRENCY_PATTERN = re.compile(
+    r"\b(" + "|".join(sorted(CURRENCY_CODES)) + r"|rs\.?)(?!\w)", re.IGNORECASE
+)
+
+# A currency marker right before an amount, e.g. "$2024" or "PKR 2024"
+CURRENCY_PREFIX = re.compile(
+    r"(?:[$€£₹]|\b(?:" + "|".join(sorted(CURRENCY_CODES)) + r"|rs\.?))\s*$",
+    re.IGNORECASE,
+)
+YEAR_PATTERN = re.compile(r"(?:19|20)\d{2}")
+
+# What may sit between the two bounds of a range: "80-100k", "80 to 100k",
+# "$80 – $100k" or "PKR 80 to PKR 100k"
+RANGE_SEPARATOR = re.compile(
+    r"\s*(?:-|–|to)\s*(?:[$€£₹]|(?:"
+    + "|".join(sorted(CURRENCY_CODES))
+    + r"|rs\.?)\s*)?",
+    re.IGNORECASE,
+)
+
+PERIOD_PATTERNS = [
+    ("hour", re.compile(r"\b(?:per hour|hourly|/\s*h(?:ou)?r|an hour)\b", re.IGNORECASE)),
+    ("day", re.compile(r"\b(?:per day|daily|/\s*day|a day)\b", re.IGNORECASE)),
+    ("week", re.compile(r"\b(?:per week|weekly|/\s*w(?:ee)?k|a week)\b", re.IGNORECASE)),
+    (
+        "month",
+        re.compile(r"\b(?:per month|monthly|/\s*mo(?:nth)?|a month)\b", re.IGNORECASE),
+    ),
+    (
+        "year",
+        re.compile(
+            r"\b(?:per (?:year|annum)|yearly|annual(?:ly)?|/\s*y(?:ea)?r|a year|p\.?a\.?)(?!\w)",
+            re.IGNORECASE,
+        ),
+    ),
+]
+
+# Pay periods per year, for comparing salaries listed per hour, month, ...
+PERIODS_PER_YEAR = {"hour": 2080, "day": 260, "week": 52, "month": 12, "year": 1}
+
+
+def parse_years(text):
+    """
+    Pull the required years of experience out of free text like "3-5 years"
+    or "10+ yrs". Returns (min_years, max_years) or None.
+    """
+    match = YEARS_PATTERN.search(text or "")
+    if not match:
+        return None
+    low = int(match.group(1))
+    high = int(match.group(2)) if match.group(2) else None
+    return low, high
+
+
+def parse_experience(text):
+    """
+    Parse an experience requirement into (min_years, max_years). Either
+    value may be None; "5+ years" and "5 years" have no maximum.
+    """
+    years = parse_years(text)
+    if years is not None:
+        low, high = years
+        if high is not None and high < low:
+            low, high = high, low
+        return low, high
+    if NO_EXPERIENCE_PATTERN.search(text or ""):
+        return 0, 0
+    return None, None
+
+
+def _parse_amount(number, suffix):
+    try:
+        value = Decimal(number.replace(",", ""))
+    except InvalidOperation:
+        return None
+    value *= MULTIPLIERS.get((suffix or "").lower().rstrip("s"), 1)
+    # Larger than the salary columns hold; not a salary
+    return value if value < MAX_AMOUNT else None
+
+
+def _is_range(text, first, second):
+    return RANGE_SEPARATOR.fullmatch(text, first.end(), second.start()) is not None
+
+
+def _salary_amounts(text):
+    """
+    (match, amount) pairs for the amounts in a salary text. A bare year such
+    as the one in "2024 budget: 50k" is skipped unless it has a currency
+    marker or is one end of a range ("2000-3000 per month").
+    """
+    amounts = []
+    for match in AMOUNT_PATTERN.finditer(text):
+        amount = _parse_amount(match.group(1), match.group(2))
+        if amount is not None:
+            amounts.append((match, amount))
+
+    def is_salary(index):
+        match = amounts[index][0]
+        if match.group(2) or not YEAR_PATTERN.fullmatch(match.group(1)):
+            return True
+        if CURRENCY_PREFIX.search(text, 0, match.start()):
+            return True
+        previous = amounts[index - 1][0] if index > 0 else None
+        following = amounts[index + 1][0] if index + 1 < len(amounts) else None
+        return bool(
+            (previous and _is_range(text, previous, match))
+            or (following and _is_range(text, match, following))
+        )
+
+    return [amounts[index] for index in range(len(amounts)) if is_salary(index)]
+
+
+def parse_salary(text):
+    """
+    Parse a free-text salary such as "$80k - $100k per year", "PKR 150,000
+    monthly" or "25/hr" into numbers.
+
+    Amounts are annualised from the listed period (hourly x 2080, monthly x
+    12, ...) so salaries listed per hour, month and year sort and filter
+    together. Salaries without a period are taken as yearly.
+
+    Args:
+        text (str): The salary as entered on the listing
+
+    Returns:
+        dict: salary_min, salary_max (yearly), salary_currency and the
+            listed salary_period, each None when it can't be determined.
+            Open-ended salaries ("80k+", "from 80k") have no maximum and
+            "up to 100k" has no minimum.
+    """
+    result = {
+        "salary_min": None,
+        "salary_max": None,
+        "salary_currency": None,
+        "salary_period": None,
+    }
+    text = (text or "").strip()
+    if not text:
+        return result
+
+    matches = _salary_amounts(text)[:2]
+
+    if len(matches) == 2:
+        (first, low), (second, high) = matches
+        # "80-100k": the suffix on the upper bound applies to both, but only
+        # when the numbers form a range ("2024 budget: 50k" doesn't)
+        if _is_range(text, first, second) and not first.group(2) and second.group(2):
+            low = _parse_amount(first.group(1), second.group(2)) or low
+        if high < low:
+            low, high = high, low
+        result["salary_min"], result["salary_max"] = low, high
+    elif len(matches) == 1:
+        match, amount = matches[0]
+        lowered = text.lower()
+        if re.search(r"\bup to\b|\bmax(?:imum)?\b", lowered):
+            result["salary_max"] = amount
+        elif re.match(r"\s*\+(?!\s*\d)", text[match.end() :]) or re.search(
+            r"\b(?:from|starting|min(?:imum)?)\b", lowered
+        ):
+            result["salary_min"] = amount
+        else:
+            result["salary_min"] = result["salary_max"] = amount
+
+    for symbol, code in CURRENCY_SYMBOLS.items():
+        if symbol in text:
+            result["salary_currency"] = code
+            break
+    else:
+        match = CURRENCY_PATTERN.search(text)
+        if match:
+            code = match.group(1).upper().rstrip(".")
+            result["salary_currency"] = "PKR" if code == "RS" else code
+
+    for period, pattern in PERIOD_PATTERNS:
+        if pattern.search(text):
+            result["salary_period"] = period
+            break
+
+    per_year = PERIODS_PER_YEAR.get(result["salary_period"], 1)
+    for field in ("salary_min", "salary_max"):
+        if result[field] is not None:
+            annual = result[field] * per_year
+            # Too large for the salary columns once annualised; not a salary
+            result[field] = annual if annual < MAX_AMOUNT else None
+
+    return result
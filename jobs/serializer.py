@@ -55,12 +55,20 @@ class JobListingSerializer(serializers.ModelSerializer):
             "experience_required",
             "experience_level",
             "salary",
+            "salary_min",
+            "salary_max",
+            "salary_currency",
+            "salary_period",
+            "experience_min_years",
+            "experience_max_years",
             "job_type",
             "job_location_type",
             "job_status",
             "created_at",
             "employer",
             "applicants",
+            "moderation_status",
+            "policy_violations",
             "has_applied",
             "is_saved",
         ]
@@ -69,12 +77,14 @@ class JobListingSerializer(serializers.ModelSerializer):
             "created_at",
             "employer",
             "applicants",
+            "moderation_status",
+            "policy_violations",
             "has_applied",
             "is_saved",
         ]
 
     def get_has_applied(self, obj):
-        # First try to get from annotation
+        # First try to get from annotation (annotate_job_listing_flags)
         if hasattr(obj, "user_has_applied"):
             return obj.user_has_applied
 
@@ -85,6 +95,9 @@ class JobListingSerializer(serializers.ModelSerializer):
         return False
 
     def get_is_saved(self, obj):
+        if hasattr(obj, "user_has_saved"):
+            return obj.user_has_saved
+
         request = self.context.get("request")
         if request and request.user.is_authenticated:
             return SavedJob.objects.filter(user=request.user, job=obj).exists()
@@ -92,7 +105,8 @@ class JobListingSerializer(serializers.ModelSerializer):
 
     def get_employer(self, obj):
         try:
-            employer_profile = EmployerProfile.objects.get(user=obj.employer)
+            # Cached on the job when the queryset used select_related
+            employer_profile = obj.employer.employer_profile
             return {
                 "name": employer_profile.user.name,
                 "username": employer_profile.user.username,
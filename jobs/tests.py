@@ -1,3 +1,539 @@
-from django.test import TestCase
+import tempfile
+from datetime import timedelta
+from unittest import skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast, Length
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from ai import embeddings
+from applications.models import Application
+from core.pagination import KeysetCursorPagination
+from emails.models import EmailOTP
+from jobs.models import JobListing, SavedJob
+from jobs.parsers import parse_experience, parse_salary
+from jobs.utils import apply_job_filters, job_search_scope
+from users.models import EmployerProfile
+
+
+@skipUnless(connection.vendor == "postgresql", "EXPLAIN plans are PostgreSQL specific")
+class HotQueryIndexTests(TestCase):
+    """
+    The hot query patterns must be able to use their indexes. Test tables
+    are tiny, so sequential scans are disabled for each test to make the
+    planner show whether an index applies at all.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.employer = User.objects.create_user(
+            username="employer", email="employer@example.com", password="x", role="employer"
+        )
+        cls.candidate = User.objects.create_user(
+            username="candidate",
+            email="candidate@example.com",
+            password="x",
+            role="candidate",
+        )
+        cls.job = JobListing.objects.create(
+            employer=cls.employer,
+            title="Senior Backend Engineer",
+            company="Acme",
+            location="Remote",
+            experience_required="5 years",
+        )
+        Application.objects.create(job=cls.job, candidate=cls.candidate, resume="cv")
+        SavedJob.objects.create(user=cls.candidate, job=cls.job)
+        EmailOTP.objects.create(user=cls.candidate, otp="123456")
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def assertUsesIndex(self, queryset, *index_names):
+        plan = queryset.explain()
+        self.assertTrue(
+            any(name in plan for name in index_names),
+            f"Expected one of {index_names} in plan:\n{plan}",
+        )
+
+    def test_title_icontains_uses_trigram_index(self):
+        self.assertUsesIndex(
+            JobListing.objects.filter(title__icontains="engineer"),
+            "jobs_title_upper_trgm_idx",
+        )
+
+    def test_company_icontains_uses_trigram_index(self):
+        self.assertUsesIndex(
+            JobListing.objects.filter(company__icontains="acme"),
+            "jobs_company_upper_trgm_idx",
+        )
+
+    def test_trigram_similar_uses_trigram_index(self):
+        self.assertUsesIndex(
+            JobListing.objects.filter(title__trigram_similar="engineer"),
+            "jobs_title_trgm_idx",
+        )
+
+    def test_full_text_search_uses_search_vector_index(self):
+        self.assertUsesIndex(
+            JobListing.objects.filter(search_vector=SearchQuery("engineer")),
+            "jobs_search_vector_idx",
+        )
+
+    def test_listing_uses_partial_index(self):
+        self.assertUsesIndex(
+            JobListing.objects.exclude(job_status="draft")
+            .filter(moderation_status="approved")
+            .order_by("-created_at")[:10],
+            "jobs_listed_recent_idx",
+        )
+
+    def test_application_lookup_uses_unique_index(self):
+        self.assertUsesIndex(
+            Application.objects.filter(job=self.job, candidate=self.candidate),
+            "applications_job_candidate_uniq",
+        )
+
+    def test_saved_job_lookup_uses_unique_index(self):
+        self.assertUsesIndex(
+            SavedJob.objects.filter(user=self.candidate, job=self.job),
+            "jobs_savedjob_user_job_uniq",
+        )
+
+    def test_otp_lookup_uses_composite_index(self):
+        self.assertUsesIndex(
+            EmailOTP.objects.filter(
+                user=self.candidate,
+                otp="123456",
+                verified=False,
+                expires_at__gt=timezone.now() - timedelta(minutes=1),
+            ),
+            "emails_otp_lookup_idx",
+        )
+
+
+class JobListingSerializerQueryTests(TestCase):
+    """
+    Listing pages must serialize employer cards and the applied/saved flags
+    from the listing query, so the number of queries doesn't grow with the
+    number of jobs on the page.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.employer = User.objects.create_user(
+            username="employer", email="employer@example.com", password="x", role="employer"
+        )
+        EmployerProfile.objects.create(
+            user=cls.employer, company_name="Acme", industry="Software"
+        )
+        cls.candidate = User.objects.create_user(
+            username="candidate",
+            email="candidate@example.com",
+            password="x",
+            role="candidate",
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.candidate)
+
+    def create_jobs(self, count):
+        for i in range(count):
+            job = JobListing.objects.create(
+                employer=self.employer,
+                title=f"Engineer {i}",
+                company="Acme",
+                location="Remote",
+                experience_required="2 years",
+            )
+            if i % 2:
+                Application.objects.create(job=job, candidate=self.candidate, resume="cv")
+                SavedJob.objects.create(user=self.candidate, job=job)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.data
+
+    def assertConstantQueries(self, url):
+        self.create_jobs(2)
+        small_page, _ = self.count_queries(url)
+        self.create_jobs(8)
+        large_page, data = self.count_queries(url)
+        self.assertEqual(small_page, large_page)
+        return large_page, data
+
+    def test_fetch_ten_jobs(self):
+        query_count, data = self.assertConstantQueries(reverse("fetch-ten-jobs"))
+        # Page count and the page itself
+        self.assertEqual(query_count, 2)
+        jobs = data["results"]
+        self.assertEqual(len(jobs), 10)
+        self.assertEqual(jobs[0]["employer"]["company_name"], "Acme")
+        self.assertEqual(
+            sum(job["has_applied"] for job in jobs),
+            Application.objects.filter(candidate=self.candidate).count(),
+        )
+        self.assertEqual(
+            sum(job["is_saved"] for job in jobs),
+            SavedJob.objects.filter(user=self.candidate).count(),
+        )
+
+    def test_employer_job_listings(self):
+        query_count, _ = self.assertConstantQueries(
+            reverse("employer-jobs", args=[self.employer.username])
+        )
+        # Employer lookup, page count and the page
+        self.assertEqual(query_count, 3)
+
+    def test_saved_jobs(self):
+        query_count, data = self.assertConstantQueries(reverse("get_saved_jobs"))
+        self.assertEqual(query_count, 2)
+        self.assertTrue(all(job["is_saved"] for job in data["results"]))
+
+    def test_all_job_listings(self):
+        query_count, data = self.assertConstantQueries(reverse("get-all-jobs"))
+        self.assertEqual(query_count, 1)
+        self.assertEqual(len(data), 10)
+
+
+class SemanticSearchTests(TestCase):
+    """Semantic search takes its top k among the jobs the filters allow."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(
+            EMBEDDING_INDEX_DIR=directory.name, EMBEDDING_SEARCH_TOP_K=1
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        embeddings._indexes.clear()
+        self.addCleanup(embeddings._indexes.clear)
+
+        employer = get_user_model().objects.create_user(
+            username="employer", email="employer@example.com", password="x", role="employer"
+        )
+        self.nearest = JobListing.objects.create(
+            employer=employer,
+            title="Python Django Backend Engineer",
+            location="Karachi",
+            experience_required="3 years",
+        )
+        self.other = JobListing.objects.create(
+            employer=employer,
+            title="Django Developer",
+            location="Lahore",
+            experience_required="3 years",
+        )
+        embeddings.get_index("jobs").rebuild(
+            (job.id, embeddings.embed_text(embeddings.job_text(job)))
+            for job in (self.nearest, self.other)
+        )
+
+    def search(self, query_string):
+        return list(
+            apply_job_filters(JobListing.objects.all(), QueryDict(query_string))
+        )
+
+    def test_nearest_job_is_ranked_first(self):
+        jobs = self.search("semantic=1&search=python django backend engineer")
+        self.assertEqual(jobs, [self.nearest])
+
+    def test_filtered_out_nearest_job_does_not_hide_matches(self):
+        jobs = self.search(
+            "semantic=1&search=python django backend engineer&location=lahore"
+        )
+        self.assertEqual(jobs, [self.other])
+
+
+class ParseSalaryTests(SimpleTestCase):
+    def assertParses(self, text, salary_min, salary_max, currency=None, period=None):
+        result = parse_salary(text)
+        self.assertEqual(
+            (
+                result["salary_min"],
+                result["salary_max"],
+                result["salary_currency"],
+                result["salary_period"],
+            ),
+            (salary_min, salary_max, currency, period),
+        )
+
+    def test_range_with_currency_and_period(self):
+        self.assertParses("$80k - $100k per year", 80000, 100000, "USD", "year")
+
+    def test_plain_amount(self):
+        self.assertParses("PKR 150,000 monthly", 1800000, 1800000, "PKR", "month")
+
+    def test_amounts_are_annualised(self):
+        self.assertParses("25/hr", 52000, 52000, period="hour")
+        self.assertParses("$500 a week", 26000, 26000, "USD", "week")
+        self.assertParses("2000-3000 per month", 24000, 36000, period="month")
+
+    def test_upper_bound_suffix_applies_to_range(self):
+        self.assertParses("80-100k", 80000, 100000)
+        self.assertParses("80 to 100k", 80000, 100000)
+        self.assertParses("PKR 80 – PKR 100k", 80000, 100000, "PKR")
+
+    def test_bare_year_is_not_a_salary(self):
+        self.assertParses("2024 budget: 50k", 50000, 50000)
+        self.assertParses("80k (2024 review)", 80000, 80000)
+        self.assertParses("$2024", 2024, 2024, "USD")
+
+    def test_lakh_and_crore(self):
+        self.assertParses("Rs 1.5 lakh per year", 150000, 150000, "PKR", "year")
+        self.assertParses("₹10 - 15 lakhs p.a.", 1000000, 1500000, "INR", "year")
+        self.assertParses("1 crore", 10000000, 10000000)
+
+    def test_open_ended(self):
+        self.assertParses("80k+", 80000, None)
+        self.assertParses("from 80k", 80000, None)
+        self.assertParses("up to 100k", None, 100000)
+
+    def test_percentages_and_empty_text(self):
+        self.assertParses("10% bonus", None, None)
+        self.assertParses("", None, None)
+        self.assertParses(None, None, None)
+
+
+class ParseExperienceTests(SimpleTestCase):
+    def test_range(self):
+        self.assertEqual(parse_experience("3-5 years"), (3, 5))
+        self.assertEqual(parse_experience("2 to 4 yrs"), (2, 4))
+
+    def test_reversed_range(self):
+        self.assertEqual(parse_experience("5-3 years"), (3, 5))
+
+    def test_minimum_only(self):
+        self.assertEqual(parse_experience("5+ years"), (5, None))
+        self.assertEqual(parse_experience("5 years"), (5, None))
+
+    def test_no_experience(self):
+        self.assertEqual(parse_experience("Fresher"), (0, 0))
+        self.assertEqual(parse_experience("No prior experience"), (0, 0))
+
+    def test_unparseable(self):
+        self.assertEqual(parse_experience("Senior"), (None, None))
+        self.assertEqual(parse_experience(None), (None, None))
+
+
+class SalaryFilterTests(TestCase):
+    """Salary filters match jobs whose parsed salary range overlaps them."""
+
+    @classmethod
+    def setUpTestData(cls):
+        employer = get_user_model().objects.create_user(
+            username="employer", email="employer@example.com", password="x", role="employer"
+        )
+        cls.jobs = {
+            salary: JobListing.objects.create(
+                employer=employer,
+                title=salary,
+                location="Remote",
+                experience_required="2 years",
+                salary=salary,
+            )
+            for salary in (
+                "50k-70k",
+                "90k-120k",
+                "up to 100k",
+                "150k+",
+                "Negotiable",
+                "$40/hr",
+                "€5,000 a month",
+                "PKR 150,000 monthly",
+            )
+        }
+
+    def search(self, query_string):
+        jobs = apply_job_filters(JobListing.objects.all(), QueryDict(query_string))
+        return {job.title for job in jobs}
+
+    def test_salary_max_includes_jobs_with_only_a_maximum(self):
+        self.assertEqual(self.search("salary_max=80000"), {"50k-70k", "up to 100k"})
+
+    def test_salary_min_includes_open_ended_jobs(self):
+        self.assertEqual(self.search("salary_min=110000"), {"90k-120k", "150k+"})
+
+    def test_hourly_salary_is_compared_annualised(self):
+        # $40/hr is 83,200 a year
+        self.assertIn("$40/hr", self.search("salary_min=50000"))
+        self.assertNotIn("$40/hr", self.search("salary_max=80000"))
+
+    def test_other_currencies_need_salary_currency(self):
+        self.assertNotIn("PKR 150,000 monthly", self.search("salary_min=100000"))
+        self.assertEqual(
+            self.search("salary_min=100000&salary_currency=pkr"),
+            {"PKR 150,000 monthly"},
+        )
+        self.assertEqual(
+            self.search("salary_min=50000&salary_currency=EUR"), {"€5,000 a month"}
+        )
+
+    def test_salary_sort(self):
+        titles = [
+            job.title
+            for job in apply_job_filters(
+                JobListing.objects.all(), QueryDict("sort_by=salary_low_to_high")
+            )
+        ]
+        self.assertEqual(titles[:4], ["50k-70k", "$40/hr", "90k-120k", "150k+"])
+        # No minimum, or another currency
+        self.assertEqual(
+            set(titles[4:]),
+            {"up to 100k", "Negotiable", "€5,000 a month", "PKR 150,000 monthly"},
+        )
+
+    def test_salary_range(self):
+        self.assertEqual(
+            self.search("salary_min=60000&salary_max=95000"),
+            {"50k-70k", "90k-120k", "up to 100k", "$40/hr"},
+        )
+
+
+class KeysetCursorPaginationTests(TestCase):
+    """
+    Walking the cursor links forwards and back must visit every job exactly
+    once, in the same order, whatever ties or NULLs the ordering key has.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        employer = User.objects.create_user(
+            username="employer", email="employer@example.com", password="x", role="employer"
+        )
+        cls.candidate = User.objects.create_user(
+            username="candidate",
+            email="candidate@example.com",
+            password="x",
+            role="candidate",
+        )
+        salaries = ["60k", "Negotiable", "80k", "60k", None, "100k", "80k"]
+        cls.jobs = [
+            JobListing.objects.create(
+                employer=employer,
+                title=f"Engineer {i}",
+                location="Remote",
+                experience_required="2 years",
+                salary=salary,
+            )
+            for i, salary in enumerate(salaries)
+        ]
+        # Every job shares its created_at with another
+        now = timezone.now()
+        for i, job in enumerate(cls.jobs):
+            JobListing.objects.filter(id=job.id).update(
+                created_at=now - timedelta(minutes=i // 2)
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.candidate)
+
+    def walk(self, **params):
+        """Follow the next links, then the previous links back to the start."""
+        response = self.client.get(
+            reverse("fetch-ten-jobs"), {"pagination": "cursor", "limit": 2, **params}
+        )
+        pages = [response.data]
+        while pages[-1]["next"]:
+            pages.append(self.client.get(pages[-1]["next"]).data)
+        backwards = [pages[-1]]
+        while backwards[-1]["previous"]:
+            backwards.append(self.client.get(backwards[-1]["previous"]).data)
+
+        forward_ids = [[job["id"] for job in page["results"]] for page in pages]
+        backward_ids = [[job["id"] for job in page["results"]] for page in backwards]
+        self.assertEqual(backward_ids, forward_ids[::-1])
+        return [job_id for page in forward_ids for job_id in page]
+
+    def test_tied_created_at(self):
+        jobs = JobListing.objects.order_by("-created_at", "-id")
+        expected = list(jobs.values_list("id", flat=True))
+        self.assertEqual(self.walk(), expected)
+
+    def test_null_salary_sorts(self):
+        for sort_by, field in (
+            ("salary_low_to_high", F("salary_min").asc(nulls_last=True)),
+            ("salary_high_to_low", F("salary_min").desc(nulls_last=True)),
+        ):
+            with self.subTest(sort_by=sort_by):
+                expected = list(
+                    JobListing.objects.order_by(
+                        field, "id" if sort_by == "salary_low_to_high" else "-id"
+                    ).values_list("id", flat=True)
+                )
+                self.assertEqual(self.walk(sort_by=sort_by), expected)
+
+    def test_ranked_ordering(self):
+        # A ranked search orders by a nullable annotation with ties, like the
+        # search rank
+        queryset = JobListing.objects.annotate(
+            rank=Cast(Length("salary"), FloatField())
+        ).order_by("-rank")
+        expected = list(
+            queryset.order_by(F("rank").desc(nulls_first=True), "-id").values_list(
+                "id", flat=True
+            )
+        )
+
+        factory = APIRequestFactory()
+        url = "/jobs/?limit=2"
+        seen = []
+        while url:
+            paginator = KeysetCursorPagination()
+            page = paginator.paginate_queryset(queryset, Request(factory.get(url)))
+            seen.extend(job.id for job in page)
+            url = paginator.get_next_link()
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor(self):
+        # Garbage, and a cursor issued for a different ordering
+        for cursor in ("not-a-cursor", "eyJvIjogIngifQ=="):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(
+                    reverse("fetch-ten-jobs"),
+                    {"pagination": "cursor", "cursor": cursor},
+                )
+                self.assertEqual(response.status_code, 404)
+
+
+@skipUnless(connection.vendor == "postgresql", "pg_trgm settings are PostgreSQL specific")
+class JobSearchScopeTests(TestCase):
+    """Only ranked searches lower the trigram threshold, and only for themselves."""
+
+    def threshold(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT current_setting('pg_trgm.similarity_threshold', true)")
+            return cursor.fetchone()[0]
+
+    def test_ranked_search_sets_threshold(self):
+        self.assertNotEqual(self.threshold(), str(settings.JOB_SEARCH_TRIGRAM_THRESHOLD))
+        with job_search_scope(QueryDict("search=backend engineer")):
+            self.assertAlmostEqual(
+                float(self.threshold()), settings.JOB_SEARCH_TRIGRAM_THRESHOLD, places=5
+            )
+
+    def test_other_requests_keep_the_default(self):
+        for query_string in ("", "search=ai", "search=backend engineer&semantic=1"):
+            with self.subTest(query_string=query_string):
+                before = self.threshold()
+                with job_search_scope(QueryDict(query_string)):
+                    self.assertEqual(self.threshold(), before)
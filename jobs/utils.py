@@ -1,4 +1,4 @@
-from django.db.models import Q, F, Value, FloatField
+from django.db.models import Q, F, Value, FloatField, Case, When
 from django.contrib.postgres.search import (
     SearchVector,
     SearchQuery,
@@ -6,9 +6,136 @@ from django.contrib.postgres.search import (
     TrigramSimilarity,
 )
 from applications.models import Application
+from jobs.models import SavedJob
 from django.db.models import Exists, OuterRef
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+from django.conf import settings
+from django.db import connection, transaction
 from django.utils import timezone
+from ai.embeddings import semantic_job_ids
+
+
+def job_search_vector():
+    """
+    Weighted full-text vector of a job. The stored `search_vector` column is
+    kept equal to this by a database trigger; the backfill command uses it
+    for existing rows.
+    """
+    return (
+        SearchVector("title", weight="A")
+        + SearchVector("company", weight="B")
+        + SearchVector("location", weight="C")
+    )
+
+
+def _number_param(query_params, param, cast=Decimal):
+    """Numeric query parameter, or None when missing or not a number."""
+    value = (query_params.get(param) or "").strip().replace(",", "")
+    if not value:
+        return None
+    try:
+        number = cast(value)
+    except (InvalidOperation, ValueError):
+        return None
+    if cast is Decimal and not number.is_finite():
+        return None
+    return number if number >= 0 else None
+
+
+def salary_currency_filter(query_params):
+    """
+    Jobs paid in the requested `salary_currency` (DEFAULT_SALARY_CURRENCY
+    when missing). Salaries naming no currency count as the default one.
+    """
+    currency = (
+        (query_params.get("salary_currency") or "").strip().upper()
+        or settings.DEFAULT_SALARY_CURRENCY
+    )
+    condition = Q(salary_currency=currency)
+    if currency == settings.DEFAULT_SALARY_CURRENCY:
+        condition |= Q(salary_currency__isnull=True)
+    return condition
+
+
+def is_semantic_search(query_params):
+    return query_params.get("semantic") in ("1", "true", "True")
+
+
+def is_ranked_search(query_params):
+    """Whether apply_job_filters ranks the results with the PostgreSQL search."""
+    search_query = (query_params.get("search") or "").strip()
+    return len(search_query) > 2 and not is_semantic_search(query_params)
+
+
+@contextmanager
+def job_search_scope(query_params):
+    """
+    Run a ranked job search with pg_trgm.similarity_threshold lowered to
+    JOB_SEARCH_TRIGRAM_THRESHOLD, so its trigram prefilter keeps every job
+    the rank cutoff keeps. The setting is local to the transaction opened
+    here; other queries keep pg_trgm's default.
+    """
+    if not is_ranked_search(query_params) or connection.vendor != "postgresql":
+        yield
+        return
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('pg_trgm.similarity_threshold', %s, true)",
+                [str(settings.JOB_SEARCH_TRIGRAM_THRESHOLD)],
+            )
+        yield
+
+
+def annotate_job_listing_flags(queryset, user=None):
+    """
+    Load everything JobListingSerializer needs in the listing query itself:
+    the employer and their profile, and whether the user has applied to or
+    saved each job.
+
+    Args:
+        queryset (QuerySet): Job listings to serialize
+        user (User): The requesting user, or None
+
+    Returns:
+        QuerySet: The queryset with `user_has_applied` and `user_has_saved`
+    """
+    queryset = queryset.select_related("employer", "employer__employer_profile")
+    if user is None or user.is_anonymous:
+        return queryset.annotate(
+            user_has_applied=Value(False), user_has_saved=Value(False)
+        )
+    return queryset.annotate(
+        user_has_applied=Exists(
+            Application.objects.filter(job=OuterRef("pk"), candidate=user)
+        ),
+        user_has_saved=Exists(SavedJob.objects.filter(job=OuterRef("pk"), user=user)),
+    )
+
+
+def apply_semantic_search(queryset, search_query):
+    """
+    Rank jobs by embedding similarity to the search query.
+    Returns the queryset restricted to the nearest jobs, best match first.
+    """
+    # Take the top k among the jobs the other filters allow, not across the
+    # whole index
+    job_ids = semantic_job_ids(
+        search_query, candidate_ids=queryset.values_list("id", flat=True)
+    )
+    if not job_ids:
+        return queryset.none()
+
+    # Keep the index's ranking order in SQL
+    rank = Case(
+        *[
+            When(id=job_id, then=Value(position))
+            for position, job_id in enumerate(job_ids)
+        ]
+    )
+    return queryset.filter(id__in=job_ids).annotate(rank=rank).order_by("rank")
 
 
 def apply_job_filters(queryset, query_params, user=None):
@@ -16,12 +143,11 @@ def apply_job_filters(queryset, query_params, user=None):
     Apply filters and search to job listings queryset.
     Returns filtered queryset with optimized search.
     """
-    # Annotate with application status if user is provided
-    if user and not user.is_anonymous:
-        user_application = Application.objects.filter(
-            job=OuterRef("pk"), candidate=user
-        )
-        queryset = queryset.annotate(user_has_applied=Exists(user_application))
+    # The stored vector is only used inside SQL; don't load it
+    queryset = queryset.defer("search_vector")
+
+    # Employer cards and the user's applied/saved flags, in the same query
+    queryset = annotate_job_listing_flags(queryset, user)
 
     # Define valid filters with field mapping
     valid_filters = {
@@ -45,6 +171,33 @@ def apply_job_filters(queryset, query_params, user=None):
             filters &= Q(**{db_field: value.strip()})
             has_filters = True
 
+    # Apply numeric range filters on the parsed salary/experience columns.
+    # Salaries are annualised and only compared within one currency. A job
+    # matches a salary range when the ranges overlap; open-ended salaries
+    # ("80k+") have no maximum and "up to 100k" has no minimum.
+    salary_min = _number_param(query_params, "salary_min")
+    if salary_min is not None:
+        filters &= Q(salary_max__gte=salary_min) | Q(
+            salary_max__isnull=True, salary_min__isnull=False
+        )
+        has_filters = True
+    salary_max = _number_param(query_params, "salary_max")
+    if salary_max is not None:
+        filters &= Q(salary_min__lte=salary_max) | Q(
+            salary_min__isnull=True, salary_max__isnull=False
+        )
+        has_filters = True
+    if salary_min is not None or salary_max is not None:
+        filters &= salary_currency_filter(query_params)
+    min_years = _number_param(query_params, "min_years", int)
+    if min_years is not None:
+        filters &= Q(experience_min_years__gte=min_years)
+        has_filters = True
+    max_years = _number_param(query_params, "max_years", int)
+    if max_years is not None:
+        filters &= Q(experience_min_years__lte=max_years)
+        has_filters = True
+
     # Apply time-based filters
     time_filter = query_params.get("time_published", None)
     if time_filter:
@@ -70,21 +223,36 @@ def apply_job_filters(queryset, query_params, user=None):
     if search_query:
         search_query = search_query.strip()
 
+        # Semantic search (?semantic=1) uses the local embedding index
+        if is_semantic_search(query_params):
+            if has_filters:
+                queryset = queryset.filter(filters)
+            return apply_semantic_search(queryset, search_query)
+
         # Apply advanced PostgreSQL search capabilities
         if len(search_query) > 2:  # Only apply for meaningful queries
+            query = SearchQuery(search_query)
+
+            # Narrow to candidate rows with indexed operators first: the
+            # stored vector (GIN) and trigram matches on title/company, so
+            # ranking doesn't scan the whole table. Evaluated inside
+            # job_search_scope, the trigram threshold keeps every row the
+            # rank filter below would keep
+            queryset = queryset.filter(
+                Q(search_vector=query)
+                | Q(title__trigram_similar=search_query)
+                | Q(company__trigram_similar=search_query)
+            )
+
             # Use both vector-based search and trigram similarity
             queryset = queryset.annotate(
-                # Vector search with weights for different fields
-                search_vector=SearchVector("title", weight="A")
-                + SearchVector("company", weight="B")
-                + SearchVector("location", weight="C"),
                 # Trigram similarity for fuzzy matching on title
                 title_similarity=TrigramSimilarity("title", search_query),
                 # Trigram similarity for company
                 company_similarity=TrigramSimilarity("company", search_query),
             )
 
-            search_rank = SearchRank("search_vector", SearchQuery(search_query))
+            search_rank = SearchRank(F("search_vector"), query)
 
             # Combine both approaches with a weighted score
             queryset = (
@@ -93,7 +261,7 @@ def apply_job_filters(queryset, query_params, user=None):
                     + F("title_similarity") * Value(2.0, output_field=FloatField())
                     + F("company_similarity") * Value(1.0, output_field=FloatField())
                 )
-                .filter(rank__gt=0.1)
+                .filter(rank__gt=settings.JOB_SEARCH_MIN_RANK)
                 .order_by("-rank")
             )
 
@@ -120,12 +288,18 @@ def apply_job_filters(queryset, query_params, user=None):
     # Apply sorting based on query parameters
     sort_by = query_params.get("sort_by", None)
     if sort_by:
-        if sort_by == "salary_low_to_high":
-            # Order by salary ascending (nulls last)
-            queryset = queryset.order_by(F("salary").asc(nulls_last=True))
-        elif sort_by == "salary_high_to_low":
-            # Order by salary descending (nulls last)
-            queryset = queryset.order_by(F("salary").desc(nulls_last=True))
+        if sort_by in ("salary_low_to_high", "salary_high_to_low"):
+            # Order by annualised salary; salaries in other currencies sort
+            # last with the unparsed ones
+            queryset = queryset.annotate(
+                salary_sort=Case(
+                    When(salary_currency_filter(query_params), then=F("salary_min"))
+                )
+            )
+            if sort_by == "salary_low_to_high":
+                queryset = queryset.order_by(F("salary_sort").asc(nulls_last=True))
+            else:
+                queryset = queryset.order_by(F("salary_sort").desc(nulls_last=True))
         elif sort_by == "latest":
             queryset = queryset.order_by("-created_at")
         elif sort_by == "oldest":
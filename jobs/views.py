@@ -7,9 +7,16 @@ from core.permissions import IsEmployer, IsEmployerAndOwner
 from .models import JobListing, SavedJob
 from users.models import User
 from ai.job_filter import job_filtering
+from ai.tasks import (
+    MODERATED_JOB_FIELDS,
+    enqueue_job_moderation,
+    resubmit_job_moderation,
+)
+from django.conf import settings
 from django.db import transaction
-from core.pagination import CustomPageNumberPagination
-from .utils import apply_job_filters
+from django.db.models import Q
+from core.pagination import CursorPaginationMixin, CustomPageNumberPagination
+from .utils import annotate_job_listing_flags, apply_job_filters, job_search_scope
 from django.shortcuts import get_object_or_404
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -32,6 +39,9 @@ class PublishJobListingView(APIView):
             "location": serializer.validated_data.get("location", ""),
             "company": serializer.validated_data.get("company", ""),
             "experience": serializer.validated_data.get("experience", ""),
+            "experience_level": serializer.validated_data.get(
+                "experience_level", "entry"
+            ),
             "salary": serializer.validated_data.get("salary", ""),
             "job_type": serializer.validated_data.get("job_type", "full time"),
             "job_location_type": serializer.validated_data.get(
@@ -49,6 +59,26 @@ class PublishJobListingView(APIView):
             "benefits": serializer.validated_data.get("benefits", []),
         }
 
+        # In async mode the listing is saved right away and moderated in the
+        # background; it stays hidden until moderation approves it.
+        if settings.JOB_MODERATION_MODE == "async":
+            with transaction.atomic():
+                job_listing = self.create_listing(
+                    request.user, job_dict, moderation_status="pending_review"
+                )
+                enqueue_job_moderation(job_listing)
+
+            return Response(
+                {
+                    "message": "Job listing submitted and is pending review.",
+                    "job_listing": JobListingSerializer(job_listing).data,
+                    "policy_violations": [],
+                    "approved": None,
+                    "moderation_status": job_listing.moderation_status,
+                },
+                status=status.HTTP_201_CREATED,
+            )
+
         # Filter job post before saving to database
         filter_result = job_filtering(job_dict)
         approved = filter_result.get("approved", True)
@@ -61,21 +91,10 @@ class PublishJobListingView(APIView):
 
         # Create job listing with final data (original or modified by AI)
         with transaction.atomic():
-            job_listing = JobListing.objects.create(
-                employer=request.user,
-                title=job_dict["title"],
-                location=job_dict["location"],
-                company=job_dict["company"],
-                experience_required=job_dict["experience"],
-                salary=job_dict["salary"],
-                job_type=job_dict["job_type"],
-                job_location_type=job_dict["job_location_type"],
-                job_status=job_dict["job_status"],
-                description=job_dict["description"],
-                responsibilities=job_dict["responsibilities"],
-                required_qualifications=job_dict["required_qualifications"],
-                preferred_qualifications=job_dict["preferred_qualifications"],
-                benefits=job_dict["benefits"],
+            job_listing = self.create_listing(
+                request.user,
+                job_dict,
+                policy_violations=filter_result.get("policy_violations", []),
             )
 
         job_serializer = JobListingSerializer(job_listing)
@@ -86,10 +105,31 @@ class PublishJobListingView(APIView):
                 "job_listing": job_serializer.data,
                 "policy_violations": filter_result.get("policy_violations", []),
                 "approved": approved,
+                "moderation_status": job_listing.moderation_status,
             },
             status=status.HTTP_201_CREATED,
         )
 
+    def create_listing(self, employer, job_dict, **extra):
+        return JobListing.objects.create(
+            employer=employer,
+            title=job_dict["title"],
+            location=job_dict["location"],
+            company=job_dict["company"],
+            experience_required=job_dict["experience"],
+            experience_level=job_dict["experience_level"],
+            salary=job_dict["salary"],
+            job_type=job_dict["job_type"],
+            job_location_type=job_dict["job_location_type"],
+            job_status=job_dict["job_status"],
+            description=job_dict["description"],
+            responsibilities=job_dict["responsibilities"],
+            required_qualifications=job_dict["required_qualifications"],
+            preferred_qualifications=job_dict["preferred_qualifications"],
+            benefits=job_dict["benefits"],
+            **extra,
+        )
+
 
 class MyJobListingView(generics.RetrieveUpdateDestroyAPIView):
     queryset = JobListing.objects.all()
@@ -101,7 +141,18 @@ class MyJobListingView(generics.RetrieveUpdateDestroyAPIView):
         instance = self.get_object()
         serializer = self.get_serializer(instance, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
+        # Edits to moderated content are moderated again before the listing
+        # shows up in search
+        moderated_changes = [
+            field
+            for field in MODERATED_JOB_FIELDS.values()
+            if field in serializer.validated_data
+            and serializer.validated_data[field] != getattr(instance, field)
+        ]
         self.perform_update(serializer)
+        if moderated_changes:
+            resubmit_job_moderation(instance)
+            serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
 
@@ -110,30 +161,46 @@ class JobListingListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return JobListing.objects.exclude(job_status="draft")
+        return annotate_job_listing_flags(
+            JobListing.objects.exclude(job_status="draft").filter(
+                moderation_status="approved"
+            ),
+            self.request.user,
+        )
 
 
-class FetchTenJobsView(generics.ListAPIView):
+class FetchTenJobsView(CursorPaginationMixin, generics.ListAPIView):
     serializer_class = JobListingSerializer
     pagination_class = CustomPageNumberPagination
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         user = self.request.user
-        queryset = JobListing.objects.exclude(job_status="draft").order_by(
-            "-created_at"
+        queryset = (
+            JobListing.objects.exclude(job_status="draft")
+            .filter(moderation_status="approved")
+            .order_by("-created_at")
         )
 
         # Use the utility function for filtering
         return apply_job_filters(queryset, self.request.query_params, user)
 
+    def list(self, request, *args, **kwargs):
+        with job_search_scope(request.query_params):
+            return super().list(request, *args, **kwargs)
+
 
 class jobListingView(generics.RetrieveAPIView):
-    queryset = JobListing.objects.all()
     serializer_class = JobListingSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = "id"
 
+    def get_queryset(self):
+        # Listings under moderation are only visible to their employer
+        return JobListing.objects.filter(
+            Q(moderation_status="approved") | Q(employer=self.request.user)
+        )
+
 
 class EmployerJobListingsView(generics.ListAPIView):
     serializer_class = JobListingSerializer
@@ -148,6 +215,9 @@ class EmployerJobListingsView(generics.ListAPIView):
             queryset = JobListing.objects.filter(employer=employer).order_by(
                 "-created_at"
             )
+            # Employers see their own listings while they are under review
+            if employer != user:
+                queryset = queryset.filter(moderation_status="approved")
 
             # Use the utility function for filtering
             return apply_job_filters(queryset, self.request.query_params, user)
@@ -155,6 +225,10 @@ class EmployerJobListingsView(generics.ListAPIView):
         except User.DoesNotExist:
             return JobListing.objects.none()
 
+    def list(self, request, *args, **kwargs):
+        with job_search_scope(request.query_params):
+            return super().list(request, *args, **kwargs)
+
 
 class SaveJobView(APIView):
     permission_classes = [IsAuthenticated]
@@ -188,8 +262,11 @@ class SavedJobsListView(generics.ListAPIView):
         saved_jobs = SavedJob.objects.filter(user=self.request.user).order_by(
             "-saved_at"
         )
-        return JobListing.objects.filter(id__in=saved_jobs.values("job_id")).order_by(
-            "-created_at"
+        return annotate_job_listing_flags(
+            JobListing.objects.filter(id__in=saved_jobs.values("job_id")).order_by(
+                "-created_at"
+            ),
+            self.request.user,
         )
 
 
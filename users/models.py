@@ -1,8 +1,16 @@
 from django.contrib.auth.models import AbstractUser
 from cloudinary.models import CloudinaryField
 from django.db import models
-from core.b2_storage import BackblazeB2Storage
+from core.b2_storage import get_b2_storage
+from core.utils import download_pdf_from_url
 from django.utils import timezone
+from .resume_parsing import (
+    content_hash,
+    find_parsed_resume,
+    is_parsed,
+    parse_resume_content,
+    stored_sections,
+)
 
 
 class User(AbstractUser):
@@ -54,8 +62,11 @@ class CandidateProfile(models.Model):
         return f"Candidate Profile: {self.user.username}"
 
     def add_resume(self, resume_file, resume_name):
+        # Read once: the same bytes are parsed and uploaded
+        content = resume_file.read()
+        resume_file.seek(0)
 
-        storage = BackblazeB2Storage()
+        storage = get_b2_storage()
         resume_path = storage._save(resume_name, resume_file)
 
         resume_data = {
@@ -63,9 +74,60 @@ class CandidateProfile(models.Model):
             "resume": storage.url(resume_path),
             "created_at": timezone.now().isoformat(),
         }
+        resume_data.update(self._parse_resume(content, resume_name))
         self.resumes[resume_name] = resume_data
         self.save()
 
+    def _parse_resume(self, content, resume_name):
+        """
+        Extract text and sections from resume content. Content that was
+        already parsed for another entry is reused instead of parsed again.
+        A failed parse stores no text, so the resume is parsed again on its
+        next use.
+        """
+        digest = content_hash(content)
+        existing = find_parsed_resume(self.resumes, digest)
+        if existing and stored_sections(existing) is not None:
+            return {
+                "content_hash": digest,
+                "text": existing["text"],
+                "sections": existing["sections"],
+            }
+        try:
+            return parse_resume_content(content, resume_name)
+        except Exception as e:
+            return {"content_hash": digest, "parse_error": str(e)}
+
+    def latest_resume(self):
+        """The most recently uploaded resume entry, or None."""
+        if not self.resumes:
+            return None
+        return max(self.resumes.values(), key=lambda x: x["created_at"])
+
+    def parsed_resume(self, resume_url):
+        """
+        Return the stored entry for a resume URL with its extracted text, or
+        None if the text can't be extracted. Entries uploaded before
+        parse-on-upload, or whose parse failed, are parsed here and saved
+        once that succeeds, so later calls never download the file again.
+        """
+        entry = next(
+            (r for r in self.resumes.values() if r.get("resume") == resume_url), None
+        )
+        if entry is None or is_parsed(entry):
+            return entry
+
+        downloaded = download_pdf_from_url(resume_url)
+        if isinstance(downloaded, str):  # download error message
+            return None
+        parsed = self._parse_resume(downloaded.getvalue(), entry["name"])
+        if "text" not in parsed:
+            return None
+        entry.pop("parse_error", None)
+        entry.update(parsed)
+        self.save(update_fields=["resumes"])
+        return entry
+
     def delete_resume(self, resume_name):
         if resume_name in self.resumes:
             del self.resumes[resume_name]
@@ -0,0 +1,49 @@
+import hashlib
+
+from ai.resume_compactor import clean_text, split_sections
+from core.utils import extract_resume_text
+
+
+def content_hash(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+def parse_resume_content(content, filename):
+    """
+    Extract the text and sections of an uploaded resume.
+
+    Args:
+        content (bytes): The raw resume file
+        filename (str): Original file name, used to pick the parser
+
+    Returns:
+        dict: "content_hash", "text" and "sections", the cleaned resume
+            lines grouped as [section name, lines] pairs in document order
+    """
+    text = extract_resume_text(content, filename)
+    if text.startswith("Error extracting text"):
+        raise ValueError(text)
+    sections = [[name, lines] for name, lines in split_sections(clean_text(text))]
+    return {"content_hash": content_hash(content), "text": text, "sections": sections}
+
+
+def stored_sections(entry):
+    """
+    The sections parsed at upload, or None for entries stored before they
+    were kept (or kept in an older format).
+    """
+    sections = entry.get("sections")
+    return sections if isinstance(sections, list) else None
+
+
+def is_parsed(entry):
+    """Whether a stored resume entry holds successfully extracted text."""
+    return "text" in entry and not entry.get("parse_error")
+
+
+def find_parsed_resume(resumes, digest):
+    """Return a stored resume entry already parsed from identical content."""
+    for entry in resumes.values():
+        if entry.get("content_hash") == digest and is_parsed(entry):
+            return entry
+    return None
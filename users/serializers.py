@@ -5,6 +5,10 @@ from django.contrib.auth import authenticate
 from ai.bio_filter import filter_bio
 
 
+# Resume entry keys written by CandidateProfile.add_resume
+RESUME_PARSE_FIELDS = ("text", "sections", "content_hash", "parse_error")
+
+
 class SignupSerializer(serializers.ModelSerializer):
     # Fields for basic user registration
     id = serializers.IntegerField(read_only=True)
@@ -128,6 +132,15 @@ class CandidateSerializer(serializers.ModelSerializer):
         data = super().to_representation(instance)
         data["certifications"] = instance.user.certifications
         data["education"] = instance.user.education
+        # Extracted resume text stays server-side
+        data["resumes"] = {
+            name: {
+                key: value
+                for key, value in entry.items()
+                if key not in RESUME_PARSE_FIELDS
+            }
+            for name, entry in (instance.resumes or {}).items()
+        }
         return data
 
     def update(self, instance, validated_data):
@@ -153,7 +166,18 @@ class CandidateSerializer(serializers.ModelSerializer):
 
         instance.skills = validated_data.get("skills", instance.skills)
         instance.bio = validated_data.get("bio", instance.bio)
-        instance.resumes = validated_data.get("resumes", instance.resumes)
+        resumes = validated_data.get("resumes", instance.resumes)
+        # Parse results are server-side only: keep the stored ones for
+        # resumes the client sends back and ignore any the client supplies
+        for name, entry in resumes.items():
+            if not isinstance(entry, dict):
+                continue
+            stored = instance.resumes.get(name) or {}
+            for key in RESUME_PARSE_FIELDS:
+                entry.pop(key, None)
+                if key in stored:
+                    entry[key] = stored[key]
+        instance.resumes = resumes
         instance.experience = validated_data.get("experience", instance.experience)
         instance.interests = validated_data.get("interests", instance.interests)
         instance.save()
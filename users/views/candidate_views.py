@@ -13,8 +13,7 @@ from ..serializers import (
 from datetime import date
 import json
 from ai.bio_filter import filter_bio
-import markdown
-from bs4 import BeautifulSoup
+from ai.markdown_render import render_markdown
 
 
 class CandidateMeView(generics.RetrieveUpdateDestroyAPIView):
@@ -332,15 +331,7 @@ class UpdateBioView(APIView):
         candidate_profile = request.user.candidate_profile
 
         filtered_bio = filter_bio(bio)
-
-        # Remove Markdown code block markers (```markdown ... ```)
-        if filtered_bio.startswith("```markdown"):
-            filtered_bio = filtered_bio.strip("```markdown").strip("```")
-
-        # Convert Markdown to HTML
-        formatted_bio = markdown.markdown(filtered_bio)
-        soup = BeautifulSoup(formatted_bio, "html.parser")
-        formatted_bio = soup.prettify(formatter="html").replace("\n", " ")
+        formatted_bio = render_markdown(filtered_bio)
 
         candidate_profile.bio = formatted_bio
         candidate_profile.save()